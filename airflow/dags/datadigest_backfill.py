@@ -0,0 +1,58 @@
+import json
+import os
+from datetime import datetime, timedelta
+from airflow import DAG
+from airflow.sdk import Param, task
+
+PROJECT_DIR = '~/datadigest-analytics'
+ACTIVATE = f'cd {PROJECT_DIR} && source {PROJECT_DIR}/dbt_venv/bin/activate'
+BACKFILL = f'{ACTIVATE} && python scripts/transform/backfill.py'
+
+# Partitions built at once; DuckDB allows a single writer
+CONCURRENCY = 1 if os.getenv('DATADIGEST_WAREHOUSE', 'bigquery').lower() == 'duckdb' else 4
+
+default_args = {
+    'owner': 'datadigest',
+    'depends_on_past': False,
+    'start_date': datetime(2025, 9, 20),
+    'retries': 1,
+    'retry_delay': timedelta(minutes=5),
+}
+
+def range_args(params):
+    return f"--start {params['start']} --end {params['end']}"
+
+@task.bash
+def list_partitions(params=None):
+    return f"{BACKFILL} --step list {range_args(params)} --partition-days {params['partition_days']}"
+
+@task
+def parse_partitions(output):
+    return json.loads(output)
+
+@task.bash(max_active_tis_per_dag=CONCURRENCY)
+def backfill_partition(partition, params=None):
+    # Retries redo only this partition: its pre-hooks delete the days before rebuilding them
+    reload_raw = ' --reload-raw' if params['reload_raw'] else ''
+    return f"{BACKFILL} --step partition --start {partition[0]} --end {partition[1]}{reload_raw}"
+
+@task.bash
+def rebuild_marts(params=None):
+    return f"{BACKFILL} --step finalize {range_args(params)}"
+
+with DAG(
+    'datadigest_backfill',
+    default_args=default_args,
+    description='DataDigest: rebuild a date range partition by partition',
+    schedule=None,  # Trigger manually with the range to rebuild
+    catchup=False,
+    params={
+        'start': Param('2025-09-01', type='string', format='date', description='First day'),
+        'end': Param('2025-09-02', type='string', format='date', description='Day after the last one'),
+        'partition_days': Param(1, type='integer', minimum=1),
+        'reload_raw': Param(False, type='boolean', description='Replace raw rows from the newest raw files'),
+    },
+) as dag:
+
+    built = backfill_partition.expand(partition=parse_partitions(list_partitions()))
+    built >> rebuild_marts()
@@ -0,0 +1,83 @@
+import json
+from datetime import datetime, timedelta
+from airflow import DAG
+from airflow.exceptions import AirflowSkipException
+from airflow.providers.standard.operators.bash import BashOperator
+from airflow.sdk import Asset, task, task_group
+
+PROJECT_DIR = '~/datadigest-analytics'
+ACTIVATE = f'cd {PROJECT_DIR} && source {PROJECT_DIR}/dbt_venv/bin/activate'
+INGEST = f'{ACTIVATE} && python scripts/ingestion/ingest_source.py'
+
+# Updated whenever raw tables receive new rows; datadigest_pipeline (the transform DAG) is
+# scheduled on it. Loaders outside Airflow post the same event through the REST API
+# (scripts/ingestion/asset_events.py).
+RAW_ASSET = Asset('datadigest_raw')
+
+default_args = {
+    'owner': 'datadigest',
+    'depends_on_past': False,
+    'start_date': datetime(2025, 9, 20),
+    'retries': 1,
+    'retry_delay': timedelta(minutes=5),
+}
+
+@task.bash
+def list_sources():
+    # Raw tables from TABLE_CONFIGS in load_to_bigquery.py, read at run time
+    return f'{INGEST} list'
+
+@task
+def parse_sources(output):
+    return json.loads(output)
+
+@task_group(group_id='ingest')
+def ingest_source(table):
+    """collect -> validate -> load for one raw table; one mapped copy per table."""
+
+    @task.bash
+    def collect(table, dag_run=None):
+        # Skips sources already collected in this run (e.g. by a collector shared with another table)
+        return f'{INGEST} collect --table {table} --since {dag_run.start_date.timestamp():.0f}'
+
+    @task.bash
+    def validate(table):
+        return f'{INGEST} validate --table {table}'
+
+    @task.bash
+    def load(table):
+        # Skipped (exit 99) when the newest file is already loaded
+        return f'{INGEST} load --table {table}'
+
+    collect(table) >> validate(table)
+    return load(table)
+
+@task(outlets=[RAW_ASSET], trigger_rule='all_done')
+def publish_raw_loaded(loaded, outlet_events=None):
+    """One asset event per run, listing the tables that got new rows; none if nothing changed."""
+    tables = sorted(line.split()[-1] for line in loaded if line)
+    if not tables:
+        raise AirflowSkipException('No raw table received new data')
+
+    outlet_events[RAW_ASSET].extra = {'tables': tables, 'publisher': 'datadigest_ingestion'}
+    print(f"New data in {', '.join(tables)}")
+
+with DAG(
+    'datadigest_ingestion',
+    default_args=default_args,
+    description='DataDigest: collect -> validate -> load raw sources',
+    schedule='0 6 * * *',
+    catchup=False,
+) as dag:
+
+    # Scrape Medium first: every other source is derived from its articles
+    scrape_articles = BashOperator(
+        task_id='scrape_articles',
+        bash_command=INGEST + ' collect --table medium_articles --since {{ dag_run.start_date.timestamp() | int }}',
+    )
+
+    # Then collect, validate and load each raw table in parallel
+    loaded = ingest_source.expand(table=parse_sources(list_sources()))
+    scrape_articles >> loaded
+
+    publish_raw_loaded(loaded)
@@ -1,6 +1,23 @@
+import json
+import os
 from datetime import datetime, timedelta
 from airflow import DAG
 from airflow.providers.standard.operators.bash import BashOperator
+from airflow.sdk import Asset, TaskGroup
+
+PROJECT_DIR = '~/datadigest-analytics'
+ACTIVATE = f'cd {PROJECT_DIR} && source {PROJECT_DIR}/dbt_venv/bin/activate'
+
+# dbt target path shared by every task. Absolute, because dbt resolves a relative --target-path
+# against the project dir, which the task commands and scripts/transform/*.py don't all agree on.
+DBT_TARGET = os.path.expanduser(f'{PROJECT_DIR}/datadigest_transform/target')
+# Manifest persisted by scripts/transform/dbt_build.py; the model task graph is generated from it
+DBT_MANIFEST = os.path.join(DBT_TARGET, 'manifest.json')
+# Published by datadigest_ingestion and by loaders outside Airflow when raw tables get new rows
+RAW_ASSET = Asset('datadigest_raw')
+
+# Limits how many dbt models run at once (create with: airflow pools set dbt_models 4 "dbt models")
+DBT_POOL = 'dbt_models'
 
 default_args = {
     'owner': 'datadigest',
@@ -10,31 +27,107 @@ default_args = {
     'retry_delay': timedelta(minutes=5),
 }
 
+def load_dbt_models(manifest_file):
+    """{model name: [upstream model names]} from the dbt manifest, or None if there is none yet."""
+    if not os.path.exists(manifest_file):
+        return None
+
+    with open(manifest_file, 'r') as f:
+        manifest = json.load(f)
+
+    models = {
+        unique_id: node for unique_id, node in manifest['nodes'].items()
+        if node['resource_type'] == 'model' and node['config'].get('materialized') != 'ephemeral'
+    }
+    return {
+        node['name']: sorted(models[dep]['name'] for dep in node['depends_on']['nodes'] if dep in models)
+        for node in models.values()
+    }
+
+def model_tasks(name):
+    """Run one model, then its quality checks; each task has its own target path so parallel dbt runs don't collide."""
+    target_path = f'{DBT_TARGET}/nodes/{name}'
+
+    with TaskGroup(group_id=name) as group:
+        run = BashOperator(
+            task_id='run',
+            bash_command=(
+                f'{ACTIVATE} && rm -f {target_path}/run_results.json; '
+                f'(cd datadigest_transform && dbt run --select {name} --target-path {target_path}); status=$?; '
+                # Spans are recorded for failed runs too; the task still fails with dbt's exit code
+                f'python scripts/datadigest/telemetry.py dbt-results {target_path}/run_results.json; '
+                f'exit $status'
+            ),
+            pool=DBT_POOL,
+        )
+        test = BashOperator(
+            task_id='test',
+            bash_command=(
+                f'{ACTIVATE} && python scripts/transform/quality_checks.py --select {name} '
+                f'--manifest {target_path}/manifest.json '
+                f'--dbt-target-path {target_path}'
+            ),
+            pool=DBT_POOL,
+        )
+        run >> test
+
+    return group
+
 with DAG(
     'datadigest_pipeline',
     default_args=default_args,
-    description='DataDigest: Airbyte -> dbt -> Tests',
-    schedule='0 6 * * *',  # Changed from schedule_interval to schedule
+    description='DataDigest: new raw data -> dbt build -> Tests',
+    schedule=[RAW_ASSET],  # Runs when raw data lands instead of on a daily cron; idle days run nothing
     catchup=False,
+    max_active_runs=1,  # Events arriving during a run are handled together by the next one
+    params={'allow_over_budget': False},  # Trigger with True to run models over their scan budget
 ) as dag:
 
-    # Task 1: Run dbt transformations
-    run_dbt = BashOperator(
-        task_id='run_dbt_models',
-        bash_command='cd ~/datadigest-analytics/datadigest_transform && source ~/datadigest-analytics/dbt_venv/bin/activate && dbt run',
+    # Sources that failed to ingest only block dbt once they are actually stale
+    source_freshness = BashOperator(
+        task_id='check_source_freshness',
+        bash_command=f'{ACTIVATE} && cd datadigest_transform && dbt source freshness',
     )
 
-    # Task 2: Run dbt tests
-    test_dbt = BashOperator(
-        task_id='run_dbt_tests',
-        bash_command='cd ~/datadigest-analytics/datadigest_transform && source ~/datadigest-analytics/dbt_venv/bin/activate && dbt test',
+    # Task 0: Estimate bytes scanned per model and stop before anything runs if a budget is exceeded
+    cost_gate = BashOperator(
+        task_id='check_cost_budget',
+        bash_command=ACTIVATE + ' && python scripts/transform/cost_gate.py {{ "--allow-over-budget" if params.allow_over_budget else "" }}',
     )
+    source_freshness >> cost_gate
 
-    # Task 3: Generate docs
-    docs_dbt = BashOperator(
-        task_id='generate_docs',
-        bash_command='cd ~/datadigest-analytics/datadigest_transform && source ~/datadigest-analytics/dbt_venv/bin/activate && dbt docs generate',
-    )
+    dbt_models = load_dbt_models(DBT_MANIFEST)
+
+    if dbt_models:
+        # Task 1: One run + test task pair per model, wired like the model graph, so independent
+        # models run in parallel (up to the pool size) and a retry only redoes the failed model
+        with TaskGroup(group_id='dbt_models') as dbt_group:
+            groups = {name: model_tasks(name) for name in dbt_models}
+            for name, upstream in dbt_models.items():
+                for parent in upstream:
+                    groups[parent] >> groups[name]
+
+        # Task 2: Refresh the manifest (new models appear in the next DAG parse) and the docs if it changed
+        docs_dbt = BashOperator(
+            task_id='generate_docs',
+            bash_command=f'{ACTIVATE} && DATADIGEST_DBT_TARGET_PATH={DBT_TARGET} python scripts/transform/dbt_build.py --skip-build',
+        )
+
+        # Dependencies: cost gate -> models (in graph order) -> docs
+        cost_gate >> dbt_group >> docs_dbt
+
+    else:
+        # No manifest yet (first deploy): build everything in one task, which also writes the manifest
+        build_dbt = BashOperator(
+            task_id='build_dbt_models',
+            bash_command=f'{ACTIVATE} && DATADIGEST_DBT_TARGET_PATH={DBT_TARGET} python scripts/transform/dbt_build.py',
+        )
+
+        # Data quality checks (one aggregated query per model instead of one per dbt test)
+        test_dbt = BashOperator(
+            task_id='run_quality_checks',
+            bash_command=f'{ACTIVATE} && python scripts/transform/quality_checks.py',
+        )
 
-    # Dependencies: run -> test -> docs
-    run_dbt >> test_dbt >> docs_dbt
+        # Dependencies: cost gate -> build (+ docs) -> test
+        cost_gate >> build_dbt >> test_dbt
@@ -0,0 +1,28 @@
+{#- Join keys shared by every model that refers to an article -#}
+
+{% macro canonical_url(column) -%}
+    {#- Lowercase, drop query string/fragment (utm_*, ?source=rss...), unify scheme and www., strip trailing slashes -#}
+    REGEXP_REPLACE(
+        REGEXP_REPLACE(
+            REGEXP_REPLACE(LOWER(TRIM({{ column }})), '[?#].*$', ''),
+            '^https?://(www[.])?', 'https://'
+        ),
+        '/+$', ''
+    )
+{%- endmacro %}
+
+{% macro url_fingerprint(column) %}
+    {{ return(adapter.dispatch('url_fingerprint', 'datadigest_transform')(column)) }}
+{% endmacro %}
+
+{% macro default__url_fingerprint(column) -%}
+    CAST(hash({{ column }}) % 9223372036854775807 AS BIGINT)
+{%- endmacro %}
+
+{% macro bigquery__url_fingerprint(column) -%}
+    FARM_FINGERPRINT({{ column }})
+{%- endmacro %}
+
+{% macro article_key(column) -%}
+    {{ url_fingerprint(canonical_url(column)) }}
+{%- endmacro %}
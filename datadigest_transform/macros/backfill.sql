@@ -0,0 +1,38 @@
+{#- Date-range backfills (scripts/transform/backfill.py).
+    With --vars '{backfill_start: 2025-09-01, backfill_end: 2025-09-02}' the daily-partitioned
+    models rebuild only the days in [backfill_start, backfill_end): a pre-hook deletes those days
+    and the models read every source row of those days instead of the rows past the watermark. -#}
+
+{% macro backfill_active() %}
+    {{ return(var('backfill_start', none) is not none and var('backfill_end', none) is not none) }}
+{% endmacro %}
+
+{% macro backfill_predicate(date_expr, trailing_days=0) -%}
+    {#- trailing_days widens the end, for models whose rows summarize the days before them -#}
+    {{ date_expr }} >= CAST('{{ var("backfill_start") }}' AS DATE)
+    AND {{ date_expr }} < {{ date_add_days("CAST('" ~ var('backfill_end') ~ "' AS DATE)", trailing_days) }}
+{%- endmacro %}
+
+{% macro incremental_window(date_expr, column='_airbyte_extracted_at', watermark='extracted_at') %}
+    {#- Backfill window on date_expr when backfilling, else the usual extraction watermark -#}
+    {%- if backfill_active() and is_incremental() %}
+    WHERE {{ backfill_predicate(date_expr) }}
+    {%- else %}
+    {{ extracted_since_watermark(column, watermark) }}
+    {%- endif %}
+{% endmacro %}
+
+{% macro backfill_delete(date_expr, trailing_days=0) %}
+    {#- Pre-hook: drop the backfilled days so rows that no longer exist upstream go too -#}
+    {%- if backfill_active() and is_incremental() %}
+    DELETE FROM {{ this }} WHERE {{ backfill_predicate(date_expr, trailing_days) }}
+    {%- endif %}
+{% endmacro %}
+
+{% macro bigquery__make_temp_relation(base_relation, suffix='__dbt_tmp') %}
+    {#- Backfill partitions run in parallel; give each its own temp table -#}
+    {%- if backfill_active() %}
+        {%- set suffix = suffix ~ '_' ~ (var('backfill_start') | string | replace('-', '')) %}
+    {%- endif %}
+    {{ return(default__make_temp_relation(base_relation, suffix)) }}
+{% endmacro %}
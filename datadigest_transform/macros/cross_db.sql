@@ -0,0 +1,61 @@
+{#- Helpers for SQL that differs between BigQuery (prod) and DuckDB (local) -#}
+
+{% macro parse_iso_date(column) %}
+    {{ return(adapter.dispatch('parse_iso_date', 'datadigest_transform')(column)) }}
+{% endmacro %}
+
+{% macro default__parse_iso_date(column) -%}
+    CAST({{ column }} AS DATE)
+{%- endmacro %}
+
+{% macro bigquery__parse_iso_date(column) -%}
+    PARSE_DATE('%Y-%m-%d', {{ column }})
+{%- endmacro %}
+
+{% macro timestamp_sub_hours(column, hours) %}
+    {{ return(adapter.dispatch('timestamp_sub_hours', 'datadigest_transform')(column, hours)) }}
+{% endmacro %}
+
+{% macro default__timestamp_sub_hours(column, hours) -%}
+    {{ column }} - INTERVAL ({{ hours }}) HOUR
+{%- endmacro %}
+
+{% macro bigquery__timestamp_sub_hours(column, hours) -%}
+    TIMESTAMP_SUB({{ column }}, INTERVAL {{ hours }} HOUR)
+{%- endmacro %}
+
+{% macro unix_seconds_to_timestamp(column) %}
+    {{ return(adapter.dispatch('unix_seconds_to_timestamp', 'datadigest_transform')(column)) }}
+{% endmacro %}
+
+{% macro default__unix_seconds_to_timestamp(column) -%}
+    make_timestamp(CAST({{ column }} * 1000000 AS BIGINT))
+{%- endmacro %}
+
+{% macro bigquery__unix_seconds_to_timestamp(column) -%}
+    TIMESTAMP_SECONDS(CAST({{ column }} AS INT64))
+{%- endmacro %}
+
+{% macro date_sub_days(column, days) %}
+    {{ return(adapter.dispatch('date_sub_days', 'datadigest_transform')(column, days)) }}
+{% endmacro %}
+
+{% macro default__date_sub_days(column, days) -%}
+    CAST({{ column }} - INTERVAL ({{ days }}) DAY AS DATE)
+{%- endmacro %}
+
+{% macro bigquery__date_sub_days(column, days) -%}
+    DATE_SUB({{ column }}, INTERVAL {{ days }} DAY)
+{%- endmacro %}
+
+{% macro date_add_days(column, days) %}
+    {{ return(adapter.dispatch('date_add_days', 'datadigest_transform')(column, days)) }}
+{% endmacro %}
+
+{% macro default__date_add_days(column, days) -%}
+    CAST({{ column }} + INTERVAL ({{ days }}) DAY AS DATE)
+{%- endmacro %}
+
+{% macro bigquery__date_add_days(column, days) -%}
+    DATE_ADD({{ column }}, INTERVAL {{ days }} DAY)
+{%- endmacro %}
@@ -0,0 +1,16 @@
+{#- Cardinality from merged HyperLogLog registers (scripts/datadigest/hll.py writes them) -#}
+
+{% macro hll_estimate(rho_column='hll_rho', precision=var('hll_precision')) -%}
+    {#- Aggregate over one row per non-empty register of a merged sketch; mirrors HyperLogLog.estimate() -#}
+    {%- set m = 2 ** precision -%}
+    {%- set alpha = 0.7213 / (1 + 1.079 / m) -%}
+    {%- set zeros = '(' ~ m ~ ' - COUNT(*))' -%}
+    {%- set raw = '(' ~ alpha * m * m ~ ' / (SUM(POWER(2, -' ~ rho_column ~ ')) + ' ~ zeros ~ '))' -%}
+    CAST(ROUND(
+        CASE
+            WHEN {{ raw }} <= {{ 2.5 * m }} AND {{ zeros }} > 0
+                THEN {{ m }} * LN({{ m }} / NULLIF({{ zeros }}, 0))
+            ELSE {{ raw }}
+        END
+    ) AS {{ dbt.type_bigint() }})
+{%- endmacro %}
@@ -0,0 +1,12 @@
+{#- Watermark filter for incremental models -#}
+
+{% macro extracted_since_watermark(column='_airbyte_extracted_at', watermark='extracted_at') %}
+    {#- Rows extracted after the newest row already in this model, minus a lookback for late loads.
+        An empty model (first run without raw data, a 0-row sample) has no watermark and takes every row. -#}
+    {%- if is_incremental() %}
+    WHERE {{ column }} > COALESCE((
+        SELECT {{ timestamp_sub_hours('MAX(' ~ watermark ~ ')', var('staging_lookback_hours')) }}
+        FROM {{ this }}
+    ), CAST('1970-01-01 00:00:00' AS TIMESTAMP))
+    {%- endif %}
+{% endmacro %}
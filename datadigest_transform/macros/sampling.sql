@@ -0,0 +1,15 @@
+{#- Deterministic sampling for development builds.
+    Rows are kept by the hash of their canonical article URL, so tweets, Reddit posts and
+    web analytics are sampled together with the articles they link to. -#}
+
+{% macro sample_pct() %}
+    {#- Percentage of articles to keep: --vars '{sample_pct: 5}', 1 on the local_sample target, else everything -#}
+    {{ return(var('sample_pct', 1 if target.name == 'local_sample' else 100) | float) }}
+{% endmacro %}
+
+{% macro in_sample(url_column) -%}
+    {%- set pct = sample_pct() -%}
+    {%- if pct < 100 -%}
+    AND ABS(MOD({{ article_key(url_column) }}, 10000)) < {{ (pct * 100) | int }}
+    {%- endif -%}
+{%- endmacro %}
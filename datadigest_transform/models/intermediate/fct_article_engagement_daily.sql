@@ -0,0 +1,75 @@
+{{ config(
+    unique_key=['article_key', 'activity_date', 'platform'],
+    tags=['daily_partitions'],
+    pre_hook="{{ backfill_delete('activity_date') }}"
+) }}
+
+-- Daily engagement per article and platform, built in one pass over the staging models.
+-- Incremental runs recompute only the article-days that received new staging rows.
+WITH events AS (
+    SELECT
+        article_key,
+        COALESCE(CAST(created_at AS DATE), CAST(extracted_at AS DATE)) AS activity_date,
+        'twitter' AS platform,
+        1 AS mentions,
+        likes AS engagement,
+        0 AS sessions,
+        0 AS users,
+        0 AS pageviews,
+        extracted_at
+    FROM {{ ref('stg_twitter_mentions') }}
+
+    UNION ALL
+
+    SELECT
+        article_key,
+        COALESCE(CAST(created_at AS DATE), CAST(extracted_at AS DATE)) AS activity_date,
+        'reddit' AS platform,
+        1 AS mentions,
+        upvotes AS engagement,
+        0 AS sessions,
+        0 AS users,
+        0 AS pageviews,
+        extracted_at
+    FROM {{ ref('stg_reddit_submissions') }}
+
+    UNION ALL
+
+    SELECT
+        article_key,
+        date AS activity_date,
+        'web' AS platform,
+        0 AS mentions,
+        0 AS engagement,
+        sessions,
+        users,
+        pageviews,
+        extracted_at
+    FROM {{ ref('stg_web_analytics') }}
+    WHERE date IS NOT NULL
+){% if is_incremental() %},
+
+changed AS (
+    SELECT DISTINCT article_key, activity_date, platform
+    FROM events
+    {{ incremental_window('activity_date', 'extracted_at', 'last_extracted_at') }}
+){% endif %}
+
+SELECT
+    e.article_key,
+    e.activity_date,
+    e.platform,
+    SUM(e.mentions) AS mentions,
+    SUM(e.engagement) AS engagement,
+    SUM(e.sessions) AS sessions,
+    SUM(e.users) AS users,
+    SUM(e.pageviews) AS pageviews,
+    MAX(e.extracted_at) AS last_extracted_at
+FROM events e
+{% if is_incremental() -%}
+INNER JOIN changed c
+    ON e.article_key = c.article_key
+    AND e.activity_date = c.activity_date
+    AND e.platform = c.platform
+{% endif -%}
+GROUP BY e.article_key, e.activity_date, e.platform
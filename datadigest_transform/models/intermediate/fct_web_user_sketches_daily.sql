@@ -0,0 +1,32 @@
+{{ config(
+    unique_key=['article_key', 'date', 'hll_register'],
+    tags=['daily_partitions'],
+    pre_hook="{{ backfill_delete('date') }}"
+) }}
+
+-- Daily visitor sketch per article: one row per non-empty HLL register.
+-- Merge any set of days or articles with MAX(hll_rho) per register, then hll_estimate().
+WITH sketches AS (
+    SELECT * FROM {{ ref('stg_web_user_sketches') }}
+    WHERE date IS NOT NULL
+){% if is_incremental() %},
+
+changed AS (
+    SELECT DISTINCT article_key, date
+    FROM sketches
+    {{ incremental_window('date', 'extracted_at', 'last_extracted_at') }}
+){% endif %}
+
+SELECT
+    s.article_key,
+    s.date,
+    s.hll_register,
+    MAX(s.hll_rho) AS hll_rho,
+    MAX(s.extracted_at) AS last_extracted_at
+FROM sketches s
+{% if is_incremental() -%}
+INNER JOIN changed c
+    ON s.article_key = c.article_key
+    AND s.date = c.date
+{% endif -%}
+GROUP BY s.article_key, s.date, s.hll_register
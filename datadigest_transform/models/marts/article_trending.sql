@@ -0,0 +1,98 @@
+{{
+    config(
+        materialized='incremental',
+        unique_key=['article_key', 'as_of_date'],
+        incremental_strategy=('merge' if target.type == 'bigquery' else 'delete+insert'),
+        on_schema_change='append_new_columns',
+        pre_hook="{{ backfill_delete('as_of_date', 28) }}"
+    )
+}}
+
+-- Trending Mart: rolling engagement per article as of each activity date.
+-- Incremental runs rebuild only the as-of dates whose 28-day window contains a changed day
+-- (or a backfilled one).
+{%- set weights = var('engagement_weights') %}
+
+WITH daily AS (
+    SELECT
+        article_key,
+        activity_date,
+        SUM(CASE platform
+            WHEN 'twitter' THEN engagement * {{ weights['twitter_likes'] }}
+            WHEN 'reddit' THEN engagement * {{ weights['reddit_upvotes'] }}
+            ELSE 0
+        END) as engagement_score,
+        SUM(sessions) as sessions,
+        MAX(last_extracted_at) as last_extracted_at
+    FROM {{ ref('fct_article_engagement_daily') }}
+    GROUP BY article_key, activity_date
+),
+
+as_of_dates AS (
+    SELECT DISTINCT activity_date as as_of_date
+    FROM daily
+    {%- if backfill_active() and is_incremental() %}
+    WHERE {{ backfill_predicate('activity_date', 28) }}
+    {%- elif is_incremental() %}
+    WHERE activity_date >= (
+        SELECT MIN(activity_date)
+        FROM daily
+        {{ extracted_since_watermark('last_extracted_at', 'last_extracted_at') }}
+    )
+    {%- endif %}
+),
+
+windowed AS (
+    SELECT
+        s.as_of_date,
+        d.article_key,
+        {{ dbt.datediff('d.activity_date', 's.as_of_date', 'day') }} as days_ago,
+        d.engagement_score,
+        d.sessions,
+        d.last_extracted_at
+    FROM as_of_dates s
+    INNER JOIN daily d
+        ON d.activity_date <= s.as_of_date
+        AND d.activity_date > {{ date_sub_days('s.as_of_date', 28) }}
+),
+
+rolling AS (
+    SELECT
+        article_key,
+        as_of_date,
+        SUM(CASE WHEN days_ago < 1 THEN engagement_score ELSE 0 END) as engagement_1d,
+        SUM(CASE WHEN days_ago < 7 THEN engagement_score ELSE 0 END) as engagement_7d,
+        SUM(engagement_score) as engagement_28d,
+        SUM(CASE WHEN days_ago BETWEEN 7 AND 13 THEN engagement_score ELSE 0 END) as engagement_prev_7d,
+        SUM(CASE WHEN days_ago < 1 THEN sessions ELSE 0 END) as sessions_1d,
+        SUM(CASE WHEN days_ago < 7 THEN sessions ELSE 0 END) as sessions_7d,
+        SUM(sessions) as sessions_28d,
+
+        -- Each day's engagement counts half as much every trending_half_life_days
+        SUM(engagement_score * POWER(0.5, days_ago / {{ var('trending_half_life_days') }})) as decayed_engagement_score,
+
+        MAX(last_extracted_at) as last_extracted_at
+    FROM windowed
+    GROUP BY article_key, as_of_date
+)
+
+SELECT
+    r.article_key,
+    r.as_of_date,
+    a.url,
+    a.title,
+    a.publication,
+    r.engagement_1d,
+    r.engagement_7d,
+    r.engagement_28d,
+    r.sessions_1d,
+    r.sessions_7d,
+    r.sessions_28d,
+
+    -- Week-over-week change in 7-day engagement; NULL when the previous week had none
+    (r.engagement_7d - r.engagement_prev_7d) / NULLIF(r.engagement_prev_7d, 0) as wow_velocity,
+
+    r.decayed_engagement_score,
+    r.last_extracted_at
+FROM rolling r
+LEFT JOIN {{ ref('stg_medium_articles') }} a ON r.article_key = a.article_key
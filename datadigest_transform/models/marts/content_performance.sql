@@ -3,64 +3,72 @@ WITH articles AS (
     SELECT * FROM {{ ref('stg_medium_articles') }}
 ),
 
-twitter AS (
-    SELECT 
-        url,
-        COUNT(*) as twitter_mention_count,
-        SUM(likes) as total_twitter_likes
-    FROM {{ ref('stg_twitter_mentions') }}
-    GROUP BY url
+features AS (
+    SELECT * FROM {{ ref('stg_article_features') }}
 ),
 
-reddit AS (
-    SELECT 
-        url,
-        COUNT(*) as reddit_submission_count,
-        SUM(upvotes) as total_reddit_upvotes
-    FROM {{ ref('stg_reddit_submissions') }}
-    GROUP BY url
+engagement AS (
+    SELECT
+        article_key,
+        SUM(CASE WHEN platform = 'twitter' THEN mentions END) as twitter_mention_count,
+        SUM(CASE WHEN platform = 'twitter' THEN engagement END) as total_twitter_likes,
+        SUM(CASE WHEN platform = 'reddit' THEN mentions END) as reddit_submission_count,
+        SUM(CASE WHEN platform = 'reddit' THEN engagement END) as total_reddit_upvotes,
+        SUM(CASE WHEN platform = 'web' THEN sessions END) as total_sessions,
+        SUM(CASE WHEN platform = 'web' THEN users END) as total_users,
+        SUM(CASE WHEN platform = 'web' THEN pageviews END) as total_pageviews,
+        AVG(CASE WHEN platform = 'web' THEN sessions END) as avg_daily_sessions
+    FROM {{ ref('fct_article_engagement_daily') }}
+    GROUP BY article_key
 ),
 
-web_traffic AS (
-    SELECT 
-        url,
-        SUM(sessions) as total_sessions,
-        SUM(users) as total_users,
-        SUM(pageviews) as total_pageviews,
-        AVG(sessions) as avg_daily_sessions
-    FROM {{ ref('stg_web_analytics') }}
-    GROUP BY url
+-- Distinct visitors over all days: merge the daily sketches instead of summing daily users
+unique_users AS (
+    SELECT
+        article_key,
+        {{ hll_estimate() }} as total_users
+    FROM (
+        SELECT article_key, hll_register, MAX(hll_rho) as hll_rho
+        FROM {{ ref('fct_web_user_sketches_daily') }}
+        GROUP BY article_key, hll_register
+    ) merged
+    GROUP BY article_key
 )
 
-SELECT 
+SELECT
     a.url,
+    a.article_key,
     a.title,
     a.author,
     a.publication,
     a.claps,
     a.word_count,
-    
+    f.topic,
+    f.keyword_hits,
+    f.length_bucket,
+    f.reading_time_minutes,
+
     -- Social engagement metrics
-    COALESCE(t.twitter_mention_count, 0) as twitter_mentions,
-    COALESCE(t.total_twitter_likes, 0) as twitter_likes,
-    COALESCE(r.reddit_submission_count, 0) as reddit_submissions,
-    COALESCE(r.total_reddit_upvotes, 0) as reddit_upvotes,
-    
+    COALESCE(e.twitter_mention_count, 0) as twitter_mentions,
+    COALESCE(e.total_twitter_likes, 0) as twitter_likes,
+    COALESCE(e.reddit_submission_count, 0) as reddit_submissions,
+    COALESCE(e.total_reddit_upvotes, 0) as reddit_upvotes,
+
     -- Web traffic metrics
-    COALESCE(w.total_sessions, 0) as total_sessions,
-    COALESCE(w.total_users, 0) as total_users,
-    COALESCE(w.total_pageviews, 0) as total_pageviews,
-    COALESCE(w.avg_daily_sessions, 0) as avg_daily_sessions,
-    
+    COALESCE(e.total_sessions, 0) as total_sessions,
+    COALESCE(u.total_users, e.total_users, 0) as total_users,
+    COALESCE(e.total_pageviews, 0) as total_pageviews,
+    COALESCE(e.avg_daily_sessions, 0) as avg_daily_sessions,
+
     -- Calculated engagement score (weighted)
     (
-        a.claps + 
-        COALESCE(t.total_twitter_likes, 0) * 2 + 
-        COALESCE(r.total_reddit_upvotes, 0) * 3
+        a.claps * {{ var('engagement_weights')['claps'] }} +
+        COALESCE(e.total_twitter_likes, 0) * {{ var('engagement_weights')['twitter_likes'] }} +
+        COALESCE(e.total_reddit_upvotes, 0) * {{ var('engagement_weights')['reddit_upvotes'] }}
     ) as social_engagement_score,
-    
+
     a.extracted_at
 FROM articles a
-LEFT JOIN twitter t ON a.url = t.url
-LEFT JOIN reddit r ON a.url = r.url
-LEFT JOIN web_traffic w ON a.url = w.url
+LEFT JOIN engagement e ON a.article_key = e.article_key
+LEFT JOIN unique_users u ON a.article_key = u.article_key
+LEFT JOIN features f ON a.article_key = f.article_key
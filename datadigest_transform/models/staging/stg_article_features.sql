@@ -0,0 +1,26 @@
+{{ config(unique_key='article_key') }}
+
+WITH source AS (
+    SELECT * FROM {{ source('raw', 'article_features') }}
+    {{ extracted_since_watermark() }}
+),
+
+cleaned AS (
+    SELECT
+        {{ article_key('url') }} AS article_key,
+        url,
+        topic,
+        keywords,
+        CAST(keyword_hits AS {{ dbt.type_bigint() }}) AS keyword_hits,
+        CAST(word_count AS {{ dbt.type_bigint() }}) AS word_count,
+        CAST(reading_time_minutes AS {{ dbt.type_bigint() }}) AS reading_time_minutes,
+        length_bucket,
+        CAST(publication_multiplier AS {{ dbt.type_float() }}) AS publication_multiplier,
+        _airbyte_extracted_at AS extracted_at
+    FROM source
+    WHERE url IS NOT NULL
+        {{ in_sample('url') }}
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY {{ article_key('url') }} ORDER BY _airbyte_extracted_at DESC) = 1
+)
+
+SELECT * FROM cleaned
@@ -1,19 +1,25 @@
+{{ config(unique_key='article_key') }}
+
 WITH source AS (
     SELECT * FROM {{ source('raw', 'medium_articles') }}
+    {{ extracted_since_watermark() }}
 ),
 
 cleaned AS (
     SELECT
+        {{ article_key('url') }} AS article_key,
         url,
         title,
         author,
         publication,
-        CAST(claps AS INT64) AS claps,
-        CAST(word_count AS INT64) AS word_count,
+        CAST(claps AS {{ dbt.type_bigint() }}) AS claps,
+        CAST(word_count AS {{ dbt.type_bigint() }}) AS word_count,
         description,
         _airbyte_extracted_at AS extracted_at
     FROM source
     WHERE url IS NOT NULL
+        {{ in_sample('url') }}
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY {{ article_key('url') }} ORDER BY _airbyte_extracted_at DESC) = 1
 )
 
 SELECT * FROM cleaned
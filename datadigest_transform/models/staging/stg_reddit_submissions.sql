@@ -1,17 +1,30 @@
+{{ config(
+    unique_key='post_id',
+    tags=['daily_partitions'],
+    pre_hook="{{ backfill_delete('CAST(created_at AS DATE)') }}"
+) }}
+
 WITH source AS (
     SELECT * FROM {{ source('raw', 'reddit_submissions') }}
+    {{ incremental_window('CAST(' ~ unix_seconds_to_timestamp('created_utc') ~ ' AS DATE)') }}
 ),
 
 cleaned AS (
     SELECT
-        permalink AS url,
-        CAST(score AS INT64) AS upvotes,
+        post_id,
+        {{ article_key('article_url') }} AS article_key,
+        article_url AS url,
+        permalink,
+        CAST(score AS {{ dbt.type_bigint() }}) AS upvotes,
         author,
         subreddit,
         selftext,
+        {{ unix_seconds_to_timestamp('created_utc') }} AS created_at,
         _airbyte_extracted_at AS extracted_at
     FROM source
-    WHERE permalink IS NOT NULL
+    WHERE article_url IS NOT NULL
+        {{ in_sample('article_url') }}
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY post_id ORDER BY _airbyte_extracted_at DESC) = 1
 )
 
 SELECT * FROM cleaned
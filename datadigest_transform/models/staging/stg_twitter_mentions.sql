@@ -1,17 +1,28 @@
+{{ config(
+    unique_key='tweet_id',
+    tags=['daily_partitions'],
+    pre_hook="{{ backfill_delete('CAST(created_at AS DATE)') }}"
+) }}
+
 WITH source AS (
     SELECT * FROM {{ source('raw', 'twitter_mentions') }}
+    {{ incremental_window('CAST(created_at AS DATE)') }}
 ),
 
 cleaned AS (
     SELECT
+        tweet_id,
+        {{ article_key('article_url') }} AS article_key,
         article_url AS url,
-        CAST(like_count AS INT64) AS likes,
+        CAST(like_count AS {{ dbt.type_bigint() }}) AS likes,
         tweet_text,
         username,
         created_at,
         _airbyte_extracted_at AS extracted_at
     FROM source
     WHERE article_url IS NOT NULL
+        {{ in_sample('article_url') }}
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY tweet_id ORDER BY _airbyte_extracted_at DESC) = 1
 )
 
 SELECT * FROM cleaned
@@ -1,18 +1,28 @@
+{{ config(
+    unique_key=['article_key', 'date'],
+    tags=['daily_partitions'],
+    pre_hook="{{ backfill_delete('date') }}"
+) }}
+
 WITH source AS (
     SELECT * FROM {{ source('raw', 'web_analytics') }}
+    {{ incremental_window(parse_iso_date('date')) }}
 ),
 
 cleaned AS (
     SELECT
+        {{ article_key('article_url') }} AS article_key,
         article_url AS url,
-        PARSE_DATE('%Y-%m-%d', date) AS date,
-        CAST(sessions AS INT64) AS sessions,
-        CAST(users AS INT64) AS users,
-        CAST(pageviews AS INT64) AS pageviews,
-        CAST(new_users AS INT64) AS new_users,
+        {{ parse_iso_date('date') }} AS date,
+        CAST(sessions AS {{ dbt.type_bigint() }}) AS sessions,
+        CAST(users AS {{ dbt.type_bigint() }}) AS users,
+        CAST(pageviews AS {{ dbt.type_bigint() }}) AS pageviews,
+        CAST(new_users AS {{ dbt.type_bigint() }}) AS new_users,
         _airbyte_extracted_at AS extracted_at
     FROM source
     WHERE article_url IS NOT NULL
+        {{ in_sample('article_url') }}
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY {{ article_key('article_url') }}, source.date ORDER BY _airbyte_extracted_at DESC) = 1
 )
 
 SELECT * FROM cleaned
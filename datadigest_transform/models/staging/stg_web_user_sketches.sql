@@ -0,0 +1,29 @@
+{{ config(
+    unique_key=['article_key', 'date', 'hll_register'],
+    tags=['daily_partitions'],
+    pre_hook="{{ backfill_delete('date') }}"
+) }}
+
+WITH source AS (
+    SELECT * FROM {{ source('raw', 'web_user_sketches') }}
+    {{ incremental_window(parse_iso_date('date')) }}
+),
+
+cleaned AS (
+    SELECT
+        {{ article_key('article_url') }} AS article_key,
+        article_url AS url,
+        {{ parse_iso_date('date') }} AS date,
+        CAST(hll_register AS {{ dbt.type_bigint() }}) AS hll_register,
+        CAST(hll_rho AS {{ dbt.type_bigint() }}) AS hll_rho,
+        _airbyte_extracted_at AS extracted_at
+    FROM source
+    WHERE article_url IS NOT NULL
+        {{ in_sample('article_url') }}
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY {{ article_key('article_url') }}, source.date, source.hll_register
+        ORDER BY _airbyte_extracted_at DESC
+    ) = 1
+)
+
+SELECT * FROM cleaned
@@ -0,0 +1,19 @@
+{% test accepted_range(model, column_name, min_value=none, max_value=none, inclusive=true) %}
+{#- Rows whose value falls outside [min_value, max_value]; NULLs pass (pair with not_null) -#}
+{%- if min_value is none and max_value is none %}
+    {{ exceptions.raise_compiler_error("accepted_range needs min_value and/or max_value") }}
+{%- endif %}
+{%- set bounds = [] %}
+{%- if min_value is not none %}
+    {%- do bounds.append(column_name ~ (' < ' if inclusive else ' <= ') ~ min_value) %}
+{%- endif %}
+{%- if max_value is not none %}
+    {%- do bounds.append(column_name ~ (' > ' if inclusive else ' >= ') ~ max_value) %}
+{%- endif %}
+
+SELECT *
+FROM {{ model }}
+WHERE {{ column_name }} IS NOT NULL
+  AND ({{ bounds | join(' OR ') }})
+
+{% endtest %}
@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASELINE_FILE = 'scripts/benchmarks/cli_startup_baseline.json'
+
+# Commands that should start without loading any heavy dependency. Each one exits before doing
+# real work (--help, or a listing), so the time measured is interpreter start plus imports.
+COMMANDS = {
+    'datadigest --help': ['scripts/datadigest/cli.py', '--help'],
+    'datadigest load --help': ['scripts/datadigest/cli.py', 'load', '--help'],
+    'ingest_source list': ['scripts/ingestion/ingest_source.py', 'list'],
+    'telemetry report --help': ['scripts/datadigest/telemetry.py', 'report', '--help'],
+    'load_metrics --help': ['scripts/ingestion/load_metrics.py', '--help'],
+}
+
+# Top-level packages that cost hundreds of milliseconds or more to import
+HEAVY_MODULES = ('pandas', 'numpy', 'requests', 'google', 'duckdb', 'dbt', 'opentelemetry')
+
+DEFAULT_THRESHOLDS = {
+    'wall_seconds': 0.30,
+    'min_seconds': 0.05
+}
+
+def time_command(command, runs):
+    """Median wall time of `python <command>` over several runs."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *command], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+def heavy_imports(command):
+    """Heavy packages the command imports, with their cumulative import time, from -X importtime."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *command],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    found = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        module = parts[2].strip()
+        if module in HEAVY_MODULES:
+            found[module] = int(parts[1]) / 1e6
+    return found
+
+def benchmark(runs):
+    results = {}
+    for name, command in COMMANDS.items():
+        results[name] = {
+            'wall_seconds': round(time_command(command, runs), 4),
+            'heavy_imports': heavy_imports(command)
+        }
+    return results
+
+def compare_to_baseline(results, baseline, thresholds):
+    flags = []
+    for name, metrics in results.items():
+        # Heavy imports are flagged with or without a baseline
+        for module, seconds in sorted(metrics['heavy_imports'].items()):
+            flags.append((name, f"imports {module} ({seconds:.2f}s)"))
+
+        expected = baseline.get('commands', {}).get(name)
+        if expected is None:
+            continue
+        limit = expected['wall_seconds'] * (1 + thresholds['wall_seconds'])
+        if metrics['wall_seconds'] >= thresholds['min_seconds'] and metrics['wall_seconds'] > limit:
+            flags.append((name, f"startup {metrics['wall_seconds'] * 1000:.0f}ms vs {expected['wall_seconds'] * 1000:.0f}ms"))
+
+    return flags
+
+def main():
+    parser = argparse.ArgumentParser(description='Time command startup and check that no heavy dependency is imported eagerly')
+    parser.add_argument('--runs', type=int, default=10, help='Runs per command; the median is kept')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--update-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--wall-threshold', type=float, help='Relative startup-time increase that counts as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit 1 if anything is flagged')
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    thresholds = dict(DEFAULT_THRESHOLDS, **baseline.get('thresholds', {}))
+    if args.wall_threshold is not None:
+        thresholds['wall_seconds'] = args.wall_threshold
+
+    results = benchmark(args.runs)
+
+    print(f"\n{'command':<28} {'startup ms':>11}  heavy imports")
+    for name, metrics in results.items():
+        heavy = ', '.join(sorted(metrics['heavy_imports'])) or '-'
+        print(f"{name:<28} {metrics['wall_seconds'] * 1000:>11.0f}  {heavy}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'thresholds': thresholds, 'commands': results}, f, indent=2)
+            f.write('\n')
+        print(f"\nBaseline updated: {args.baseline}")
+
+    flags = compare_to_baseline(results, baseline, thresholds)
+    for name, message in flags:
+        print(f"   ! {name}: {message}")
+    print(f"\n{len(flags)} regression(s) flagged")
+
+    if flags and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
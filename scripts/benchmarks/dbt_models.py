@@ -0,0 +1,283 @@
+import argparse
+import csv
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, 'ingestion'))
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, 'data_exploration'))
+
+import numpy as np
+import complete_data_generator
+import enhanced_synthetic_generator
+from load_to_bigquery import BigQueryLoader, TABLE_CONFIGS, load_schema_fields
+from complete_data_generator import WebAnalyticsGenerator
+from enhanced_synthetic_generator import RealisticSyntheticDataGenerator
+from datadigest.article_features import compute_features
+
+DBT_PROJECT_DIR = 'datadigest_transform'
+BENCH_DIR = 'data/benchmarks'
+BASELINE_FILE = 'scripts/benchmarks/dbt_models_baseline.json'
+
+# Scale factor 1 is the size of the current dataset (60 articles)
+ARTICLES_PER_SCALE = 60
+DEFAULT_SCALE_FACTORS = [1, 4, 16]
+
+# Relative increase that counts as a regression; models faster than min_seconds are ignored for timing
+DEFAULT_THRESHOLDS = {
+    'wall_seconds': 0.25,
+    'bytes_scanned': 0.10,
+    'min_seconds': 0.2
+}
+
+# "Today" for the fixtures; the generators' date windows and weekday patterns are relative to it,
+# so with the calendar date the row counts of date-filtered models would drift from the baseline
+REFERENCE_DATE = datetime(2025, 9, 1, 12, 0, 0)
+
+class ReferenceDatetime(datetime):
+    """datetime whose now() is REFERENCE_DATE, swapped into the generator modules."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return REFERENCE_DATE
+
+PUBLICATIONS = ['towardsdatascience', 'freecodecamp', 'hackernoon', 'better-programming']
+TOPICS = ['Python', 'Machine Learning', 'Data Engineering', 'AI', 'Web Development', 'SQL']
+
+def synthetic_articles(count):
+    """Medium articles shaped like the scraper output."""
+    articles = []
+    for i in range(count):
+        publication = random.choice(PUBLICATIONS)
+        topic = random.choice(TOPICS)
+        published = REFERENCE_DATE - timedelta(days=random.randint(1, 60))
+        word_count = random.randint(600, 4000)
+
+        articles.append({
+            'article_id': f'bench_{i}',
+            'title': f'{topic} in practice, part {i}',
+            'url': f'https://medium.com/{publication}/{topic.lower().replace(" ", "-")}-part-{i}-{i:06x}',
+            'publication': publication,
+            'author': f'author_{i % 97}',
+            'published_at': published.isoformat(),
+            'description': f'Notes on {topic}',
+            'claps': int(np.random.exponential(150)),
+            'reading_time_minutes': max(1, word_count // 250),
+            'word_count': word_count,
+            'collected_at': REFERENCE_DATE.isoformat()
+        })
+    return articles
+
+def write_fixtures(scale_factor, fixture_dir):
+    """Write seeded synthetic CSVs for every raw table; returns {table: csv_file}."""
+    random.seed(scale_factor)
+    np.random.seed(scale_factor)
+    complete_data_generator.datetime = ReferenceDatetime
+    enhanced_synthetic_generator.datetime = ReferenceDatetime
+
+    articles = synthetic_articles(ARTICLES_PER_SCALE * scale_factor)
+    social = RealisticSyntheticDataGenerator()
+    web = WebAnalyticsGenerator()
+
+    rows = {
+        'medium_articles': articles,
+        'twitter_mentions': social.generate_realistic_twitter_data(articles),
+        'reddit_submissions': social.generate_realistic_reddit_data(articles),
+        'web_analytics': web.generate_analytics_data(articles),
+        'web_user_sketches': web.user_sketches,
+        'article_features': [compute_features(article) for article in articles]
+    }
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    files = {}
+    for config in TABLE_CONFIGS:
+        columns = [field['name'] for field in load_schema_fields(config['schema'])]
+        files[config['table']] = os.path.join(fixture_dir, f"{config['table']}.csv")
+
+        with open(files[config['table']], 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows[config['table']])
+
+    return files
+
+def run_dbt(db_path, target_path):
+    """Full-refresh build of every model against the benchmark database."""
+    env = dict(os.environ, DATADIGEST_DUCKDB_PATH=os.path.abspath(db_path), DBT_TARGET='local')
+    command = [
+        'dbt', 'run', '--full-refresh',
+        '--project-dir', DBT_PROJECT_DIR, '--profiles-dir', DBT_PROJECT_DIR,
+        '--target-path', os.path.abspath(target_path)
+    ]
+
+    started = time.perf_counter()
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stdout[-4000:])
+        raise RuntimeError(f"dbt run failed with exit code {result.returncode}")
+
+    return time.perf_counter() - started
+
+def collect_results(warehouse, target_path):
+    """Per-model wall time from run_results.json, plus rows built and bytes scanned."""
+    with open(os.path.join(target_path, 'run_results.json'), 'r') as f:
+        run_results = json.load(f)
+    with open(os.path.join(target_path, 'manifest.json'), 'r') as f:
+        manifest = json.load(f)
+
+    table_bytes = {}
+
+    def relation_bytes(unique_id):
+        if unique_id not in table_bytes:
+            node = manifest['nodes'].get(unique_id) or manifest['sources'][unique_id]
+            table = node.get('identifier') or node.get('alias') or node['name']
+            table_bytes[unique_id] = warehouse.table_bytes(node['schema'], table)
+        return table_bytes[unique_id]
+
+    models = {}
+    for result in run_results['results']:
+        if not result['unique_id'].startswith('model.'):
+            continue
+
+        node = manifest['nodes'][result['unique_id']]
+        upstream = [dep for dep in node['depends_on']['nodes'] if dep.split('.')[0] in ('model', 'source')]
+
+        models[node['name']] = {
+            'status': result['status'],
+            'wall_seconds': round(result['execution_time'], 3),
+            'rows': warehouse.query(f"SELECT COUNT(*) FROM {node['relation_name']}")[0][0],
+            # A full refresh reads every upstream relation in full
+            'bytes_scanned': sum(relation_bytes(dep) for dep in upstream)
+        }
+
+    return models
+
+def benchmark_scale_factor(scale_factor, keep=False):
+    work_dir = os.path.join(BENCH_DIR, f'sf{scale_factor}')
+    db_path = os.path.join(work_dir, 'datadigest.duckdb')
+    target_path = os.path.join(work_dir, 'target')
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    os.makedirs(work_dir)
+
+    print(f"\n{'='*50}")
+    print(f"Scale factor {scale_factor}: {ARTICLES_PER_SCALE * scale_factor} articles")
+    print('='*50)
+
+    # Point the loader and dbt at the benchmark database and keep their metrics, spans and raw
+    # file registrations out of the real history
+    os.environ['DATADIGEST_DUCKDB_PATH'] = db_path
+    os.environ['DATADIGEST_LOAD_METRICS'] = os.path.join(work_dir, 'load_metrics.jsonl')
+    os.environ['DATADIGEST_TELEMETRY_FILE'] = os.path.join(work_dir, 'spans.jsonl')
+    os.environ['DATADIGEST_PROM_TEXTFILE'] = os.path.join(work_dir, 'datadigest.prom')
+    os.environ['DATADIGEST_RAW_CATALOG'] = os.path.join(work_dir, 'raw_catalog.sqlite')
+
+    files = write_fixtures(scale_factor, os.path.join(work_dir, 'fixtures'))
+    loader = BigQueryLoader('datadigest-analytics-2025', backend='duckdb')
+
+    for config in TABLE_CONFIGS:
+        if not loader.create_table_from_schema(config['dataset'], config['table'], config['schema']):
+            raise RuntimeError(f"Could not create {config['table']}")
+        if not loader.load_csv_to_table(config['dataset'], config['table'], files[config['table']]):
+            raise RuntimeError(f"Could not load {config['table']}")
+
+    total_seconds = run_dbt(db_path, target_path)
+    models = collect_results(loader.warehouse, target_path)
+
+    if not keep:
+        shutil.rmtree(os.path.join(work_dir, 'fixtures'))
+        os.remove(db_path)
+
+    return {'dbt_seconds': round(total_seconds, 3), 'models': models}
+
+def compare_to_baseline(results, baseline, thresholds):
+    """Flags per scale factor and model where the run is worse than the baseline."""
+    flags = []
+    for scale_factor, run in results.items():
+        baseline_models = baseline.get('scale_factors', {}).get(scale_factor, {}).get('models', {})
+
+        for model, metrics in run['models'].items():
+            expected = baseline_models.get(model)
+            if expected is None:
+                continue
+
+            wall_limit = expected['wall_seconds'] * (1 + thresholds['wall_seconds'])
+            if metrics['wall_seconds'] >= thresholds['min_seconds'] and metrics['wall_seconds'] > wall_limit:
+                flags.append((scale_factor, model, f"wall time {metrics['wall_seconds']:.2f}s vs {expected['wall_seconds']:.2f}s"))
+
+            if metrics['bytes_scanned'] > expected['bytes_scanned'] * (1 + thresholds['bytes_scanned']):
+                flags.append((scale_factor, model, f"bytes scanned {metrics['bytes_scanned']:,} vs {expected['bytes_scanned']:,}"))
+
+            # Fixtures are seeded, so a different row count means the model's logic changed
+            if metrics['rows'] != expected['rows']:
+                flags.append((scale_factor, model, f"rows {metrics['rows']:,} vs {expected['rows']:,}"))
+
+    return flags
+
+def print_results(results):
+    for scale_factor, run in results.items():
+        print(f"\nScale factor {scale_factor} (dbt run {run['dbt_seconds']:.1f}s)")
+        print(f"{'model':<34} {'wall s':>8} {'rows':>10} {'MB scanned':>11}")
+        for model, metrics in sorted(run['models'].items()):
+            print(f"{model:<34} {metrics['wall_seconds']:>8.2f} {metrics['rows']:>10,} {metrics['bytes_scanned'] / 1e6:>11.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Build every dbt model on synthetic data at several sizes and compare with a baseline')
+    parser.add_argument('--scale-factors', type=int, nargs='+', default=DEFAULT_SCALE_FACTORS)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--update-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--wall-threshold', type=float, help='Relative wall-time increase that counts as a regression')
+    parser.add_argument('--bytes-threshold', type=float, help='Relative bytes-scanned increase that counts as a regression')
+    parser.add_argument('--min-seconds', type=float, help='Ignore timing changes of models faster than this')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit 1 if anything is flagged')
+    parser.add_argument('--keep', action='store_true', help='Keep fixtures and benchmark databases')
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+
+    # Command line overrides the thresholds stored with the baseline
+    thresholds = dict(DEFAULT_THRESHOLDS, **baseline.get('thresholds', {}))
+    for key, value in (('wall_seconds', args.wall_threshold), ('bytes_scanned', args.bytes_threshold),
+                       ('min_seconds', args.min_seconds)):
+        if value is not None:
+            thresholds[key] = value
+
+    results = {str(sf): benchmark_scale_factor(sf, args.keep) for sf in args.scale_factors}
+    print_results(results)
+
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    results_file = os.path.join(BENCH_DIR, f"dbt_models_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(results_file, 'w') as f:
+        json.dump({'thresholds': thresholds, 'scale_factors': results}, f, indent=2)
+    print(f"\nResults saved to {results_file}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'thresholds': thresholds, 'scale_factors': results}, f, indent=2)
+            f.write('\n')
+        print(f"Baseline updated: {args.baseline}")
+        return
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    flags = compare_to_baseline(results, baseline, thresholds)
+    for scale_factor, model, message in flags:
+        print(f"   ! sf{scale_factor} {model}: {message}")
+    print(f"\n{len(flags)} regression(s) flagged")
+
+    if flags and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
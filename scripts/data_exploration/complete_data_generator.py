@@ -1,14 +1,23 @@
-import pandas as pd
 import json
 import random
 import time
 from datetime import datetime, timedelta
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import register_raw_file, latest_raw_file
+from datadigest.hll import HyperLogLog
+from datadigest.article_features import feature_store
+from datadigest.telemetry import span
+from datadigest.profiling import hot_section, run_main
 
 class SocialMediaDataGenerator:
     def __init__(self):
         self.twitter_usernames = ['TechGuru2024', 'DataScienceFan', 'DevCommunity', 'AIEnthusiast', 'CodeNewbie', 'MLExpert']
         self.reddit_subreddits = ['programming', 'datascience', 'MachineLearning', 'webdev', 'Python', 'javascript']
     
+    @hot_section()
     def generate_twitter_data(self, articles):
         """Generate realistic Twitter mention data for articles."""
         twitter_mentions = []
@@ -38,6 +47,7 @@ class SocialMediaDataGenerator:
         
         return twitter_mentions
     
+    @hot_section()
     def generate_reddit_data(self, articles):
         """Generate realistic Reddit submission data for articles."""
         reddit_submissions = []
@@ -94,16 +104,20 @@ class WebAnalyticsGenerator:
         self.traffic_sources = ['organic', 'social', 'direct', 'referral', 'email']
         self.devices = ['desktop', 'mobile', 'tablet']
         self.countries = ['US', 'GB', 'CA', 'DE', 'IN', 'AU']
+        self.user_sketches = []
     
+    @hot_section()
     def generate_analytics_data(self, articles):
         """Generate realistic web analytics data for articles."""
         analytics_data = []
+        self.user_sketches = []
         
         print("Generating web analytics data...")
         
         for article in articles:
             # Generate 30 days of traffic data per article
             base_daily_sessions = self.calculate_base_sessions(article)
+            seen_visitors = []
             
             for days_ago in range(30, 0, -1):
                 date = datetime.now() - timedelta(days=days_ago)
@@ -132,23 +146,35 @@ class WebAnalyticsGenerator:
                 analytics_record.update(self.distribute_devices(daily_sessions))
                 
                 analytics_data.append(analytics_record)
+                
+                # Sketch the day's distinct visitors so unique users can be merged across days
+                sketch = HyperLogLog()
+                for visitor in self.simulate_visitors(article, analytics_record, seen_visitors):
+                    sketch.add(visitor)
+                self.user_sketches.extend(
+                    sketch.to_rows(date=analytics_record['date'], article_url=article['url'])
+                )
         
         return analytics_data
     
+    def simulate_visitors(self, article, analytics_record, seen_visitors):
+        """Visitor ids for one day: returning visitors from earlier days plus new ones."""
+        users = analytics_record['users']
+        returning_count = min(max(0, users - analytics_record['new_users']), len(seen_visitors))
+        
+        returning = random.sample(seen_visitors, returning_count)
+        new = [f"{article['url']}#{len(seen_visitors) + i}" for i in range(users - returning_count)]
+        seen_visitors.extend(new)
+        
+        return returning + new
+    
     def calculate_base_sessions(self, article):
         """Calculate base daily sessions based on article engagement."""
         # Base sessions from clap count (engagement indicator)
         base_sessions = max(5, article['claps'] // 3)
         
         # Publication multiplier
-        pub_multipliers = {
-            'towardsdatascience': 2.0,
-            'freecodecamp': 2.5,
-            'hackernoon': 1.5,
-            'better-programming': 1.3
-        }
-        
-        multiplier = pub_multipliers.get(article['publication'], 1.0)
+        multiplier = feature_store().get(article)['publication_multiplier']
         return int(base_sessions * multiplier * random.uniform(0.8, 1.5))
     
     def apply_traffic_patterns(self, base_sessions, days_ago):
@@ -197,6 +223,7 @@ class ComprehensiveDataGenerator:
     
     def generate_complete_dataset(self, articles_file):
         """Generate comprehensive dataset from Medium articles."""
+        import pandas as pd
         # Load Medium articles
         print(f"Loading articles from {articles_file}...")
         
@@ -208,12 +235,21 @@ class ComprehensiveDataGenerator:
             print(f"Error loading articles: {e}")
             return
         
+        # Compute features of new articles once, before any traffic is generated
+        feature_store().ensure(articles)
+        
         # Generate social media data
-        twitter_data = self.social_generator.generate_twitter_data(articles)
-        reddit_data = self.social_generator.generate_reddit_data(articles)
+        with span('generate', 'twitter_mentions') as generate_span:
+            twitter_data = self.social_generator.generate_twitter_data(articles)
+            generate_span.set(rows=len(twitter_data))
+        with span('generate', 'reddit_submissions') as generate_span:
+            reddit_data = self.social_generator.generate_reddit_data(articles)
+            generate_span.set(rows=len(reddit_data))
         
         # Generate web analytics data
-        analytics_data = self.analytics_generator.generate_analytics_data(articles)
+        with span('generate', 'web_analytics') as generate_span:
+            analytics_data = self.analytics_generator.generate_analytics_data(articles)
+            generate_span.set(rows=len(analytics_data), user_sketches=len(self.analytics_generator.user_sketches))
         
         # Save all datasets
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -221,7 +257,8 @@ class ComprehensiveDataGenerator:
         datasets = {
             'twitter_mentions': twitter_data,
             'reddit_submissions': reddit_data,
-            'web_analytics': analytics_data
+            'web_analytics': analytics_data,
+            'web_user_sketches': self.analytics_generator.user_sketches
         }
         
         for dataset_name, data in datasets.items():
@@ -230,10 +267,12 @@ class ComprehensiveDataGenerator:
                 json_file = f'data/raw/{dataset_name}_{timestamp}.json'
                 with open(json_file, 'w', encoding='utf-8') as f:
                     json.dump(data, f, indent=2, ensure_ascii=False)
+                register_raw_file(json_file, len(data))
                 
                 # Save CSV
                 csv_file = f'data/raw/{dataset_name}_{timestamp}.csv'
                 pd.DataFrame(data).to_csv(csv_file, index=False, encoding='utf-8')
+                register_raw_file(csv_file, len(data))
                 
                 print(f"Saved {len(data)} {dataset_name} records")
         
@@ -263,14 +302,11 @@ class ComprehensiveDataGenerator:
 
 def main():
     # Find the most recent enhanced Medium articles file
-    import glob
-    
-    files = glob.glob('data/raw/medium_articles_enhanced_*.json')
-    if not files:
+    latest_file = latest_raw_file('medium_articles_enhanced', 'json')
+    if not latest_file:
         print("No enhanced Medium articles found. Run enhanced_medium_scraper_v2.py first.")
         return
     
-    latest_file = max(files)
     print(f"Using latest articles file: {latest_file}")
     
     # Generate comprehensive dataset
@@ -278,4 +314,4 @@ def main():
     generator.generate_complete_dataset(latest_file)
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
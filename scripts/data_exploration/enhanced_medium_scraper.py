@@ -1,10 +1,14 @@
-import requests
 import xml.etree.ElementTree as ET
-import pandas as pd
 import json
 import re
 from datetime import datetime
 import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import register_raw_file
+from datadigest.profiling import hot_section, run_main
 
 class MediumDataCollector:
     def __init__(self):
@@ -45,8 +49,10 @@ class MediumDataCollector:
         word_count = len(str(description).split())
         return max(3, word_count // 40)  # Assume 200 words per minute
     
+    @hot_section()
     def fetch_publication_articles(self, publication_handle):
         """Fetch articles from a specific Medium publication."""
+        import requests
         url = f"https://medium.com/feed/@{publication_handle}"
         
         try:
@@ -117,6 +123,7 @@ class MediumDataCollector:
     
     def save_data(self, articles):
         """Save collected data in multiple formats."""
+        import pandas as pd
         if not articles:
             print("No articles to save!")
             return None
@@ -127,11 +134,13 @@ class MediumDataCollector:
         json_file = f'data/raw/medium_articles_{timestamp}.json'
         with open(json_file, 'w') as f:
             json.dump(articles, f, indent=2, default=str)
+        register_raw_file(json_file, len(articles))
         
         # Save as CSV for easy viewing
         df = pd.DataFrame(articles)
         csv_file = f'data/raw/medium_articles_{timestamp}.csv'
         df.to_csv(csv_file, index=False)
+        register_raw_file(csv_file, len(df))
         
         print(f"\nData saved:")
         print(f"   JSON: {json_file}")
@@ -187,4 +196,4 @@ def main():
         print("No articles collected. Check your internet connection.")
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
@@ -1,11 +1,17 @@
-import requests
 import xml.etree.ElementTree as ET
-import pandas as pd
 import json
 import re
 from datetime import datetime
 import time
 import random
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import register_raw_file
+from datadigest.telemetry import span
+from datadigest.profiling import hot_section, run_main
+from datadigest.checkpoint import CollectorCheckpoint
 
 class MediumDataCollector:
     def __init__(self):
@@ -17,6 +23,7 @@ class MediumDataCollector:
             'better-programming': 'https://betterprogramming.pub/feed',
             'the-startup': 'https://medium.com/swlh/feed'  # The Startup's actual feed
         }
+        self.checkpoint = None
     
     def clean_description(self, description):
         """Clean and extract meaningful text from description."""
@@ -73,8 +80,10 @@ class MediumDataCollector:
         variation = random.uniform(0.8, 1.2)
         return int(reading_time * variation)
     
+    @hot_section()
     def fetch_publication_articles(self, publication_name, feed_url):
         """Fetch articles from a publication's RSS feed."""
+        import requests
         try:
             print(f"   Fetching from: {feed_url}")
             
@@ -161,25 +170,33 @@ class MediumDataCollector:
     
     def collect_all_articles(self):
         """Collect articles from all publications."""
-        all_articles = []
+        # Publications fetched by an interrupted run are not fetched again
+        self.checkpoint = CollectorCheckpoint('medium_articles', self.publications)
         
         print("Starting enhanced Medium data collection...")
         
         for i, (pub_name, feed_url) in enumerate(self.publications.items(), 1):
+            if self.checkpoint.is_done(pub_name):
+                continue
             print(f"[{i}/{len(self.publications)}] Fetching {pub_name}...")
             
-            articles = self.fetch_publication_articles(pub_name, feed_url)
-            all_articles.extend(articles)
+            with span('collect', f'medium/{pub_name}') as fetch_span:
+                articles = self.fetch_publication_articles(pub_name, feed_url)
+                fetch_span.set(rows=len(articles))
+            # Failed fetches return no articles and are retried by the next run
+            if articles:
+                self.checkpoint.complete(pub_name, articles)
             
             print(f"   Collected {len(articles)} articles")
             
             # Respectful delay between requests
             time.sleep(2)
         
-        return all_articles
+        return list(self.checkpoint.results)
     
     def save_data(self, articles):
         """Save collected data with enhanced metadata."""
+        import pandas as pd
         if not articles:
             print("No articles to save!")
             return None
@@ -190,11 +207,13 @@ class MediumDataCollector:
         json_file = f'data/raw/medium_articles_enhanced_{timestamp}.json'
         with open(json_file, 'w', encoding='utf-8') as f:
             json.dump(articles, f, indent=2, ensure_ascii=False, default=str)
+        register_raw_file(json_file, len(articles))
         
         # Save as CSV
         df = pd.DataFrame(articles)
         csv_file = f'data/raw/medium_articles_enhanced_{timestamp}.csv'
         df.to_csv(csv_file, index=False, encoding='utf-8')
+        register_raw_file(csv_file, len(df))
         
         print(f"\nData saved:")
         print(f"   JSON: {json_file}")
@@ -240,6 +259,8 @@ def main():
         df = collector.save_data(articles)
         
         if df is not None:
+            collector.checkpoint.clear()
+            
             # Generate comprehensive report
             collector.generate_summary_report(df)
             
@@ -247,6 +268,9 @@ def main():
             print(f"Collected {len(articles)} articles from {df['publication'].nunique()} publications")
     else:
         print("No articles collected. Check network connection and feed URLs.")
+        # The run finished, just with nothing to save; a kept checkpoint would have the next
+        # run skip every item as done
+        collector.checkpoint.clear()
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
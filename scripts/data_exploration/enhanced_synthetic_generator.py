@@ -1,9 +1,22 @@
-import pandas as pd
 import json
 import random
 import time
 from datetime import datetime, timedelta
-import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import register_raw_file, latest_raw_file
+from datadigest.article_features import feature_store
+from datadigest.telemetry import span
+from datadigest.profiling import hot_section, run_main
+
+TOPIC_SUBREDDITS = {
+    'Python programming': ['Python', 'programming', 'learnpython'],
+    'machine learning': ['MachineLearning', 'datascience', 'artificial'],
+    'data science': ['datascience', 'analytics', 'statistics'],
+    'tech': ['programming', 'webdev', 'coding']
+}
 
 class RealisticSyntheticDataGenerator:
     def __init__(self):
@@ -22,6 +35,7 @@ class RealisticSyntheticDataGenerator:
             'dev_beginner', 'analytics_pro', 'tech_reader', 'algorithm_lover', 'stats_nerd'
         ]
     
+    @hot_section()
     def generate_realistic_twitter_data(self, articles):
         """Generate realistic Twitter mentions based on article characteristics."""
         twitter_data = []
@@ -47,6 +61,7 @@ class RealisticSyntheticDataGenerator:
     
     def create_realistic_tweet(self, article):
         """Create a realistic tweet based on article content."""
+        import numpy as np
         # Tweet templates based on article type
         templates = [
             "Just read this insightful piece on {topic}: {title} {url}",
@@ -56,16 +71,8 @@ class RealisticSyntheticDataGenerator:
             "Must-read for anyone interested in {topic}: {title} {url}"
         ]
         
-        # Extract topic from title
-        title_lower = article['title'].lower()
-        if 'python' in title_lower:
-            topic = 'Python programming'
-        elif any(word in title_lower for word in ['ml', 'machine learning', 'ai']):
-            topic = 'machine learning'
-        elif 'data' in title_lower:
-            topic = 'data science'
-        else:
-            topic = 'tech'
+        # Topic from the precomputed article features
+        topic = feature_store().get(article)['topic']
         
         template = random.choice(templates)
         tweet_text = template.format(
@@ -92,6 +99,7 @@ class RealisticSyntheticDataGenerator:
             'collected_at': datetime.now().isoformat()
         }
     
+    @hot_section()
     def generate_realistic_reddit_data(self, articles):
         """Generate realistic Reddit submissions based on article characteristics."""
         reddit_data = []
@@ -111,6 +119,7 @@ class RealisticSyntheticDataGenerator:
     
     def create_realistic_reddit_submission(self, article):
         """Create a realistic Reddit submission."""
+        import numpy as np
         # Reddit title patterns
         title_patterns = [
             article['title'],  # Original title
@@ -119,16 +128,8 @@ class RealisticSyntheticDataGenerator:
             f"Good read: {article['title']}"
         ]
         
-        # Choose subreddit based on article content
-        title_lower = article['title'].lower()
-        if 'python' in title_lower:
-            subreddit = random.choice(['Python', 'programming', 'learnpython'])
-        elif any(word in title_lower for word in ['ml', 'machine learning', 'ai']):
-            subreddit = random.choice(['MachineLearning', 'datascience', 'artificial'])
-        elif 'data' in title_lower:
-            subreddit = random.choice(['datascience', 'analytics', 'statistics'])
-        else:
-            subreddit = random.choice(['programming', 'webdev', 'coding'])
+        # Choose subreddit based on the article's topic
+        subreddit = random.choice(TOPIC_SUBREDDITS[feature_store().get(article)['topic']])
         
         # Engagement based on article quality
         base_score = max(1, article['claps'] // 5)
@@ -171,15 +172,23 @@ class RealisticSyntheticDataGenerator:
     
     def generate_comprehensive_dataset(self, articles_file):
         """Generate complete synthetic social media dataset."""
+        import pandas as pd
         # Load articles
         with open(articles_file, 'r') as f:
             articles = json.load(f)
         
         print(f"Generating synthetic data for {len(articles)} articles...")
         
+        # Compute features of new articles once, before any mentions are generated
+        feature_store().ensure(articles)
+        
         # Generate social media data
-        twitter_data = self.generate_realistic_twitter_data(articles)
-        reddit_data = self.generate_realistic_reddit_data(articles)
+        with span('generate', 'twitter_mentions') as generate_span:
+            twitter_data = self.generate_realistic_twitter_data(articles)
+            generate_span.set(rows=len(twitter_data))
+        with span('generate', 'reddit_submissions') as generate_span:
+            reddit_data = self.generate_realistic_reddit_data(articles)
+            generate_span.set(rows=len(reddit_data))
         
         # Save datasets
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -189,8 +198,11 @@ class RealisticSyntheticDataGenerator:
             twitter_json = f'data/raw/twitter_synthetic_{timestamp}.json'
             with open(twitter_json, 'w') as f:
                 json.dump(twitter_data, f, indent=2)
+            register_raw_file(twitter_json, len(twitter_data))
             
-            pd.DataFrame(twitter_data).to_csv(f'data/raw/twitter_synthetic_{timestamp}.csv', index=False)
+            twitter_csv = f'data/raw/twitter_synthetic_{timestamp}.csv'
+            pd.DataFrame(twitter_data).to_csv(twitter_csv, index=False)
+            register_raw_file(twitter_csv, len(twitter_data))
             print(f"Saved Twitter data: {len(twitter_data)} records")
         
         # Save Reddit data
@@ -198,8 +210,11 @@ class RealisticSyntheticDataGenerator:
             reddit_json = f'data/raw/reddit_synthetic_{timestamp}.json'
             with open(reddit_json, 'w') as f:
                 json.dump(reddit_data, f, indent=2)
+            register_raw_file(reddit_json, len(reddit_data))
             
-            pd.DataFrame(reddit_data).to_csv(f'data/raw/reddit_synthetic_{timestamp}.csv', index=False)
+            reddit_csv = f'data/raw/reddit_synthetic_{timestamp}.csv'
+            pd.DataFrame(reddit_data).to_csv(reddit_csv, index=False)
+            register_raw_file(reddit_csv, len(reddit_data))
             print(f"Saved Reddit data: {len(reddit_data)} records")
         
         self.generate_summary_report(articles, twitter_data, reddit_data)
@@ -208,6 +223,7 @@ class RealisticSyntheticDataGenerator:
     
     def generate_summary_report(self, articles, twitter_data, reddit_data):
         """Generate comprehensive summary report."""
+        import pandas as pd
         print(f"\n" + "="*60)
         print("ENHANCED SYNTHETIC DATA GENERATION SUMMARY")
         print("="*60)
@@ -236,14 +252,11 @@ class RealisticSyntheticDataGenerator:
 
 def main():
     # Find latest Medium articles
-    import glob
-    
-    files = glob.glob('data/raw/medium_articles_enhanced_*.json')
-    if not files:
+    latest_file = latest_raw_file('medium_articles_enhanced', 'json')
+    if not latest_file:
         print("No Medium articles found. Run the Medium collector first.")
         return
     
-    latest_file = max(files)
     print(f"Using articles from: {latest_file}")
     
     # Generate synthetic data
@@ -251,4 +264,4 @@ def main():
     generator.generate_comprehensive_dataset(latest_file)
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
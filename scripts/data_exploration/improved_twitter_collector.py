@@ -1,44 +1,77 @@
-import requests
 import json
-import pandas as pd
 from datetime import datetime, timedelta
 import time
 import os
 import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import register_raw_file, latest_raw_file
+from datadigest.article_features import feature_store, search_topics
+from datadigest.profiling import hot_section, run_main
+from datadigest.checkpoint import CollectorCheckpoint
+from datadigest.topic_scheduler import TopicYieldScheduler
 
 class ImprovedTwitterCollector:
-    def __init__(self, bearer_token):
+    def __init__(self, bearer_token, request_budget=10):
         self.bearer_token = bearer_token
         self.base_url = "https://api.twitter.com/2"
         self.headers = {"Authorization": f"Bearer {bearer_token}"}
         self.request_count = 0
         self.max_requests_per_window = 75  # Conservative limit
+        self.request_budget = request_budget  # Search requests per run
+        self.max_results = 10  # Tweets per request
+        self.checkpoint = None
     
+    @hot_section()
     def search_broader_twitter_mentions(self, articles):
         """Search for broader mentions of topics/keywords from articles."""
-        all_tweets = []
+        import requests
+        # Pages fetched by an interrupted run (e.g. killed during a rate-limit wait) are not fetched again
+        self.checkpoint = CollectorCheckpoint('twitter_topics', [article['url'] for article in articles])
         
         print("Searching Twitter with broader topic-based queries...")
         
-        # Extract key topics from articles
-        topics = self.extract_search_topics(articles)
+        # Extract key topics from articles; a resumed run keeps the topics it started with
+        if 'topics' not in self.checkpoint.meta:
+            self.checkpoint.meta['topics'] = self.extract_search_topics(articles)
+            self.checkpoint.meta['run_id'] = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.checkpoint.save()
+        topics = self.checkpoint.meta['topics']
+        
+        # Spend the request budget on the topics with the best historical yield, paging through
+        # a topic's results while it keeps paying off. The run id keeps a resumed run from
+        # decaying the yield history a second time.
+        scheduler = TopicYieldScheduler(self.max_results, run_id=self.checkpoint.meta.get('run_id'))
+        failed = set()
         
-        for i, topic in enumerate(topics[:10], 1):  # Limit to 10 topics
+        while self.checkpoint.meta.get('requests', 0) < self.request_budget:
             if self.request_count >= self.max_requests_per_window:
                 print("Reached API limit, stopping collection")
                 break
-                
-            print(f"[{i}/10] Searching topic: {topic}...")
+            
+            # Topics whose results are exhausted are done; failed ones are retried next run
+            available = [topic for topic in topics if not self.checkpoint.is_done(topic) and topic not in failed]
+            topic = scheduler.choose(available)
+            if topic is None:
+                break
+            
+            request_number = self.checkpoint.meta.get('requests', 0) + 1
+            next_token = self.checkpoint.cursor(topic)
+            print(f"[{request_number}/{self.request_budget}] Searching topic: {topic}"
+                  f"{' (next page)' if next_token else ''}...")
             
             try:
                 # Search for topic mentions
                 params = {
                     'query': f'"{topic}" lang:en -is:retweet',
-                    'max_results': 10,
+                    'max_results': self.max_results,
                     'tweet.fields': 'created_at,author_id,public_metrics',
                     'user.fields': 'username,public_metrics',
                     'expansions': 'author_id'
                 }
+                if next_token:
+                    params['next_token'] = next_token
                 
                 response = requests.get(
                     f"{self.base_url}/tweets/search/recent",
@@ -52,20 +85,39 @@ class ImprovedTwitterCollector:
                 if response.status_code == 200:
                     data = response.json()
                     tweets = self.process_topic_tweets(data, topic, articles)
-                    all_tweets.extend(tweets)
-                    print(f"   Found {len(tweets)} relevant tweets")
+                    
+                    # Checkpoint first: a run killed in between then can't count this request's
+                    # yield twice when it is resumed and the page is fetched again
+                    self.checkpoint.meta['requests'] = request_number
+                    next_token = data.get('meta', {}).get('next_token')
+                    if next_token:
+                        self.checkpoint.advance(topic, tweets, next_token)
+                    else:
+                        self.checkpoint.complete(topic, tweets)
+                    relevant = scheduler.record(topic, [tweet['relevance_score'] for tweet in tweets])
+                    print(f"   Found {len(tweets)} tweets, {relevant} relevant")
                 elif response.status_code == 429:
                     print("   Rate limit hit, waiting 15 minutes...")
+                    # Counts against the budget, so a run can't spend hours waiting on the limit
+                    self.checkpoint.meta['requests'] = request_number
+                    self.checkpoint.save()  # Nothing is lost if the run is killed while waiting
                     time.sleep(900)  # Wait 15 minutes
                 else:
                     print(f"   API error: {response.status_code}")
+                    failed.add(topic)
                 
                 time.sleep(5)  # Conservative delay
                 
             except Exception as e:
                 print(f"   Error: {e}")
+                failed.add(topic)
         
-        return all_tweets
+        print("\nTopic yield (relevant tweets per request):")
+        for topic, mean_yield, requests_made in scheduler.summary(topics):
+            if requests_made:
+                print(f"   {mean_yield:5.2f}  {topic} ({requests_made:.1f} weighted requests)")
+        
+        return list(self.checkpoint.results)
     
     def extract_search_topics(self, articles):
         """Extract searchable topics from article titles."""
@@ -77,22 +129,14 @@ class ImprovedTwitterCollector:
             "artificial intelligence", "deep learning", "data analysis"
         ]
         
-        # Extract key phrases from article titles
+        # Key phrases from the precomputed article features
+        store = feature_store()
         for article in articles[:20]:
-            title = article['title'].lower()
-            
-            # Extract meaningful phrases
-            if 'python' in title:
-                topics.append('python programming')
-            if 'machine learning' in title or 'ml' in title:
-                topics.append('machine learning')
-            if 'data' in title:
-                topics.append('data science')
-            if 'ai' in title or 'artificial intelligence' in title:
-                topics.append('artificial intelligence')
-        
-        # Combine with base topics and remove duplicates
-        all_topics = list(set(topics + base_topics))
+            topics.extend(search_topics(store.get(article)))
+        
+        # Combine with base topics and remove duplicates, in a stable order; the scheduler decides
+        # which of them get searched
+        all_topics = list(dict.fromkeys(base_topics + topics))
         return all_topics[:15]  # Limit topics
     
     def process_topic_tweets(self, data, topic, articles):
@@ -168,18 +212,18 @@ def main():
         return
     
     # Load Medium articles
-    import glob
-    files = glob.glob('data/raw/medium_articles_enhanced_*.json')
-    if not files:
+    latest_file = latest_raw_file('medium_articles_enhanced', 'json')
+    if not latest_file:
         print("No Medium articles found.")
         return
     
-    latest_file = max(files)
     with open(latest_file, 'r') as f:
         articles = json.load(f)
     
     print(f"Loaded {len(articles)} Medium articles")
     
+    feature_store().ensure(articles)
+    
     # Collect Twitter data with improved strategy
     collector = ImprovedTwitterCollector(bearer_token)
     twitter_data = collector.search_broader_twitter_mentions(articles)
@@ -191,10 +235,15 @@ def main():
         json_file = f'data/raw/twitter_topics_{timestamp}.json'
         with open(json_file, 'w') as f:
             json.dump(twitter_data, f, indent=2)
+        register_raw_file(json_file, len(twitter_data))
         
+        import pandas as pd
         df = pd.DataFrame(twitter_data)
         csv_file = f'data/raw/twitter_topics_{timestamp}.csv'
         df.to_csv(csv_file, index=False)
+        register_raw_file(csv_file, len(twitter_data))
+        
+        collector.checkpoint.clear()
         
         print(f"\nTwitter topic data collected:")
         print(f"   Records: {len(twitter_data)}")
@@ -202,6 +251,9 @@ def main():
         print(f"   Files: {json_file}, {csv_file}")
     else:
         print("No Twitter data collected due to API limitations.")
+        # The run finished, just with nothing to save; a kept checkpoint would have the next
+        # run skip every item as done
+        collector.checkpoint.clear()
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
@@ -1,9 +1,14 @@
-import requests
 import json
-import pandas as pd
 from datetime import datetime
 import time
 from urllib.parse import urlparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import register_raw_file, latest_raw_file
+from datadigest.profiling import hot_section, run_main
+from datadigest.checkpoint import CollectorCheckpoint
 
 class RedditAPICollector:
     def __init__(self):
@@ -11,14 +16,22 @@ class RedditAPICollector:
             'User-Agent': 'DataDigest-Analytics/1.0 (Educational Research Project)'
         }
         self.base_url = "https://www.reddit.com"
+        self.checkpoint = None
     
+    @hot_section()
     def search_reddit_for_articles(self, articles):
         """Search Reddit for submissions containing Medium article URLs."""
-        all_submissions = []
+        import requests
+        batch = articles[:30]  # Limit for respectful usage
+        
+        # Articles searched by an interrupted run are not searched again
+        self.checkpoint = CollectorCheckpoint('reddit_real', [article['url'] for article in batch])
         
         print("Searching Reddit for real article submissions...")
         
-        for i, article in enumerate(articles[:30], 1):  # Limit for respectful usage
+        for i, article in enumerate(batch, 1):
+            if self.checkpoint.is_done(article['url']):
+                continue
             print(f"[{i}/30] Searching: {article['title'][:50]}...")
             
             try:
@@ -41,7 +54,7 @@ class RedditAPICollector:
                 if response.status_code == 200:
                     data = response.json()
                     submissions = self.process_reddit_response(data, article)
-                    all_submissions.extend(submissions)
+                    self.checkpoint.complete(article['url'], submissions)
                     print(f"   Found {len(submissions)} submissions")
                 else:
                     print(f"   Error: {response.status_code}")
@@ -52,7 +65,7 @@ class RedditAPICollector:
             except Exception as e:
                 print(f"   Error: {e}")
         
-        return all_submissions
+        return list(self.checkpoint.results)
     
     def process_reddit_response(self, data, article):
         """Process Reddit API response."""
@@ -88,13 +101,11 @@ class RedditAPICollector:
 
 def main():
     # Load Medium articles
-    import glob
-    files = glob.glob('data/raw/medium_articles_enhanced_*.json')
-    if not files:
+    latest_file = latest_raw_file('medium_articles_enhanced', 'json')
+    if not latest_file:
         print("No Medium articles found. Run the Medium collector first.")
         return
     
-    latest_file = max(files)
     with open(latest_file, 'r') as f:
         articles = json.load(f)
     
@@ -111,10 +122,15 @@ def main():
         json_file = f'data/raw/reddit_real_{timestamp}.json'
         with open(json_file, 'w') as f:
             json.dump(reddit_data, f, indent=2)
+        register_raw_file(json_file, len(reddit_data))
         
+        import pandas as pd
         df = pd.DataFrame(reddit_data)
         csv_file = f'data/raw/reddit_real_{timestamp}.csv'
         df.to_csv(csv_file, index=False)
+        register_raw_file(csv_file, len(reddit_data))
+        
+        collector.checkpoint.clear()
         
         print(f"\nReal Reddit data collected:")
         print(f"   Records: {len(reddit_data)}")
@@ -122,6 +138,9 @@ def main():
         print(f"   Files: {json_file}, {csv_file}")
     else:
         print("No Reddit data found for these articles.")
+        # The run finished, just with nothing to save; a kept checkpoint would have the next
+        # run skip every item as done
+        collector.checkpoint.clear()
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
@@ -1,24 +1,36 @@
-import requests
 import json
-import pandas as pd
 from datetime import datetime
 import time
 import os
 from urllib.parse import quote
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import register_raw_file, latest_raw_file
+from datadigest.profiling import hot_section, run_main
+from datadigest.checkpoint import CollectorCheckpoint
 
 class TwitterAPICollector:
     def __init__(self, bearer_token):
         self.bearer_token = bearer_token
         self.base_url = "https://api.twitter.com/2"
         self.headers = {"Authorization": f"Bearer {bearer_token}"}
+        self.checkpoint = None
     
+    @hot_section()
     def search_tweets_for_medium_articles(self, articles, max_results_per_article=10):
         """Search Twitter for mentions of Medium articles."""
-        all_tweets = []
+        import requests
+        batch = articles[:20]  # Limit to 20 for API quota
+        
+        # Articles searched by an interrupted run are not searched again
+        self.checkpoint = CollectorCheckpoint('twitter_real', [article['url'] for article in batch])
         
         print("Searching Twitter for real article mentions...")
         
-        for i, article in enumerate(articles[:20], 1):  # Limit to 20 for API quota
+        for i, article in enumerate(batch, 1):
+            if self.checkpoint.is_done(article['url']):
+                continue
             print(f"[{i}/20] Searching: {article['title'][:50]}...")
             
             # Extract domain from article URL for search
@@ -44,10 +56,11 @@ class TwitterAPICollector:
                 if response.status_code == 200:
                     data = response.json()
                     tweets = self.process_twitter_response(data, article)
-                    all_tweets.extend(tweets)
+                    self.checkpoint.complete(article['url'], tweets)
                     print(f"   Found {len(tweets)} tweets")
                 elif response.status_code == 429:
                     print("   Rate limit hit, waiting...")
+                    self.checkpoint.save()
                     time.sleep(15)
                 else:
                     print(f"   API error: {response.status_code}")
@@ -58,7 +71,7 @@ class TwitterAPICollector:
             except Exception as e:
                 print(f"   Error: {e}")
         
-        return all_tweets
+        return list(self.checkpoint.results)
     
     def process_twitter_response(self, data, article):
         """Process Twitter API response."""
@@ -108,13 +121,11 @@ def main():
         return
     
     # Load Medium articles
-    import glob
-    files = glob.glob('data/raw/medium_articles_enhanced_*.json')
-    if not files:
+    latest_file = latest_raw_file('medium_articles_enhanced', 'json')
+    if not latest_file:
         print("No Medium articles found. Run the Medium collector first.")
         return
     
-    latest_file = max(files)
     with open(latest_file, 'r') as f:
         articles = json.load(f)
     
@@ -131,16 +142,24 @@ def main():
         json_file = f'data/raw/twitter_real_{timestamp}.json'
         with open(json_file, 'w') as f:
             json.dump(twitter_data, f, indent=2)
+        register_raw_file(json_file, len(twitter_data))
         
+        import pandas as pd
         df = pd.DataFrame(twitter_data)
         csv_file = f'data/raw/twitter_real_{timestamp}.csv'
         df.to_csv(csv_file, index=False)
+        register_raw_file(csv_file, len(twitter_data))
+        
+        collector.checkpoint.clear()
         
         print(f"\nReal Twitter data collected:")
         print(f"   Records: {len(twitter_data)}")
         print(f"   Files: {json_file}, {csv_file}")
     else:
         print("No Twitter data collected.")
+        # The run finished, just with nothing to save; a kept checkpoint would have the next
+        # run skip every item as done
+        collector.checkpoint.clear()
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
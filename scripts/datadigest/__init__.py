@@ -0,0 +1 @@
+"""Helpers shared by the DataDigest collection, generation and loading scripts."""
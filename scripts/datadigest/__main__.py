@@ -0,0 +1,3 @@
+from datadigest.cli import main
+
+main()
@@ -0,0 +1,174 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import latest_raw_file, register_raw_file
+
+FEATURES_SOURCE = 'article_features'
+
+# Title keywords, in the priority order used to pick an article's topic
+KEYWORDS = {
+    'python': ['python'],
+    'machine learning': ['machine learning', 'ml'],
+    'ai': ['ai', 'artificial intelligence'],
+    'data': ['data']
+}
+
+# Topic named in generated tweets, by the first keyword hit
+TOPICS = {
+    'python': 'Python programming',
+    'machine learning': 'machine learning',
+    'ai': 'machine learning',
+    'data': 'data science'
+}
+DEFAULT_TOPIC = 'tech'
+
+# Twitter search phrase for each keyword hit
+SEARCH_TOPICS = {
+    'python': 'python programming',
+    'machine learning': 'machine learning',
+    'ai': 'artificial intelligence',
+    'data': 'data science'
+}
+
+# Relative traffic of each publication
+PUBLICATION_MULTIPLIERS = {
+    'towardsdatascience': 2.0,
+    'freecodecamp': 2.5,
+    'hackernoon': 1.5,
+    'better-programming': 1.3
+}
+
+LENGTH_BUCKETS = [(800, 'short'), (2000, 'medium')]
+
+FIELDS = [
+    'url', 'topic', 'keywords', 'keyword_hits', 'word_count', 'reading_time_minutes',
+    'length_bucket', 'publication', 'publication_multiplier', 'computed_at'
+]
+
+def compute_features(article):
+    """Features of one article from its scraped fields."""
+    title = article['title'].lower()
+    keywords = [keyword for keyword, phrases in KEYWORDS.items() if any(phrase in title for phrase in phrases)]
+
+    word_count = int(article.get('word_count') or 0)
+    length_bucket = next((name for limit, name in LENGTH_BUCKETS if word_count < limit), 'long')
+
+    return {
+        'url': article['url'],
+        'topic': TOPICS[keywords[0]] if keywords else DEFAULT_TOPIC,
+        'keywords': ';'.join(keywords),
+        'keyword_hits': len(keywords),
+        'word_count': word_count,
+        'reading_time_minutes': int(article.get('reading_time_minutes') or max(1, word_count // 250)),
+        'length_bucket': length_bucket,
+        'publication': article.get('publication', ''),
+        'publication_multiplier': PUBLICATION_MULTIPLIERS.get(article.get('publication'), 1.0),
+        'computed_at': datetime.now().isoformat()
+    }
+
+def search_topics(features):
+    """Twitter search phrases for an article's keyword hits."""
+    return [SEARCH_TOPICS[keyword] for keyword in features['keywords'].split(';') if keyword]
+
+class ArticleFeatureStore:
+    """Article features keyed by URL, persisted as data/raw/article_features_<timestamp>.csv.
+
+    Features are read from the newest snapshot once and cached; articles not
+    in it are computed on first lookup and written with the next save().
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.features = None
+        self.added = False
+
+    def load(self):
+        if self.features is not None:
+            return self.features
+
+        self.features = {}
+        path = self.path or latest_raw_file(FEATURES_SOURCE)
+        if path and os.path.exists(path):
+            with open(path, 'r', newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    row['keyword_hits'] = int(row['keyword_hits'])
+                    row['word_count'] = int(row['word_count'])
+                    row['reading_time_minutes'] = int(row['reading_time_minutes'])
+                    row['publication_multiplier'] = float(row['publication_multiplier'])
+                    self.features[row['url']] = row
+
+        return self.features
+
+    def get(self, article):
+        features = self.load()
+        if article['url'] not in features:
+            features[article['url']] = compute_features(article)
+            self.added = True
+        return features[article['url']]
+
+    def ensure(self, articles):
+        """Compute features for any new articles and persist them in one snapshot."""
+        for article in articles:
+            self.get(article)
+        if self.added:
+            self.save()
+        return self
+
+    def save(self):
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path = f'data/raw/{FEATURES_SOURCE}_{timestamp}.csv'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(self.features.values())
+        register_raw_file(path, len(self.features))
+
+        self.path = path
+        self.added = False
+        print(f"Saved features for {len(self.features)} articles to {path}")
+        return path
+
+_default_store = None
+
+def feature_store():
+    """Process-wide store so every stage reads the snapshot once."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ArticleFeatureStore()
+    return _default_store
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute article features once and store them for the other stages')
+    parser.add_argument('--articles', help='Articles JSON; defaults to the newest medium_articles_enhanced file')
+    parser.add_argument('--recompute', action='store_true', help='Recompute features of articles already stored')
+    args = parser.parse_args()
+
+    articles_file = args.articles or latest_raw_file('medium_articles_enhanced', 'json')
+    if not articles_file:
+        print("No Medium articles found. Run the Medium collector first.")
+        return
+
+    with open(articles_file, 'r', encoding='utf-8') as f:
+        articles = json.load(f)
+
+    store = feature_store()
+    if args.recompute:
+        store.features = {}
+    store.ensure(articles)
+
+    if not store.added and not args.recompute:
+        print(f"Features already stored for all {len(articles)} articles")
+        # The snapshot is current; touch it so ingest_source.py's freshness check doesn't fail the collect
+        path = store.path or latest_raw_file(FEATURES_SOURCE)
+        if path:
+            os.utime(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import time
+
+CHECKPOINT_DIR = 'data/state/checkpoints'
+
+# A checkpoint older than this belongs to an abandoned run, not one worth resuming
+DEFAULT_MAX_AGE_HOURS = 24
+
+class CollectorCheckpoint:
+    """Progress of one collector run, saved to data/state/checkpoints/<name>.json.
+
+    Tracks which items (articles, topics, publications) are done, the rows
+    collected so far and pagination cursors of items still in progress. A
+    restarted run with the same inputs resumes from it; different inputs, or a
+    checkpoint older than max_age_hours, start over. Call clear() once the
+    collected rows are saved.
+    """
+
+    def __init__(self, name, inputs=None, checkpoint_dir=None, max_age_hours=DEFAULT_MAX_AGE_HOURS):
+        checkpoint_dir = checkpoint_dir or os.getenv('DATADIGEST_CHECKPOINT_DIR', CHECKPOINT_DIR)
+        self.path = os.path.join(checkpoint_dir, f'{name}.json')
+        self.fingerprint = hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        self.state = self.load(max_age_hours)
+        self.done = set(self.state['done'])
+
+    def load(self, max_age_hours):
+        fresh = {'fingerprint': self.fingerprint, 'done': [], 'results': [], 'cursors': {}, 'meta': {}}
+        if not os.path.exists(self.path):
+            return fresh
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+
+        age_hours = (time.time() - state.get('saved_at', 0)) / 3600
+        if state.get('fingerprint') != self.fingerprint:
+            print(f"Inputs changed since {self.path} was saved, starting over")
+            return fresh
+        if age_hours > max_age_hours:
+            print(f"{self.path} is {age_hours:.0f}h old, starting over")
+            return fresh
+
+        print(f"Resuming from {self.path}: {len(state['done'])} item(s) done, {len(state['results'])} row(s) kept")
+        return state
+
+    @property
+    def results(self):
+        return self.state['results']
+
+    @property
+    def meta(self):
+        """Free-form values a collector needs to resume the same way (e.g. the topics it chose)."""
+        return self.state['meta']
+
+    def is_done(self, key):
+        return key in self.done
+
+    def cursor(self, key):
+        """Pagination token to continue `key` from, or None to start at the first page."""
+        return self.state['cursors'].get(key)
+
+    def advance(self, key, rows, cursor):
+        """Keep one page of rows and the token of the next page."""
+        self.results.extend(rows)
+        self.state['cursors'][key] = cursor
+        self.save()
+
+    def complete(self, key, rows=()):
+        """Keep the item's (last) rows and mark it done."""
+        self.results.extend(rows)
+        self.state['cursors'].pop(key, None)
+        self.done.add(key)
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.state['done'] = sorted(self.done)
+        self.state['saved_at'] = time.time()
+
+        # Write then rename, so a crash mid-save leaves the previous checkpoint intact
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(self.path + '.tmp', self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
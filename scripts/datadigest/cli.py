@@ -0,0 +1,93 @@
+import argparse
+import os
+import runpy
+import sys
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Each command runs an existing script in-process. Nothing here imports pandas, numpy, requests
+# or the warehouse clients; the scripts import them inside the code paths that use them.
+COLLECTORS = {
+    'medium': 'data_exploration/enhanced_medium_scraper_v2.py',
+    'twitter': 'data_exploration/improved_twitter_collector.py',
+    'twitter-api': 'data_exploration/real_twitter_collector.py',
+    'reddit': 'data_exploration/real_reddit_collector.py',
+}
+
+GENERATORS = {
+    'complete': 'data_exploration/complete_data_generator.py',
+    'synthetic': 'data_exploration/enhanced_synthetic_generator.py',
+    'features': 'datadigest/article_features.py',
+}
+
+REPORTS = {
+    'loads': 'ingestion/load_metrics.py',
+    'telemetry': 'datadigest/telemetry.py',
+}
+
+def run_script(script, args=()):
+    """Run scripts/<script> as `python scripts/<script> args...` would, without a new interpreter."""
+    path = os.path.normpath(os.path.join(SCRIPTS_DIR, script))
+    sys.argv = [path, *args]
+    # Scripts import their siblings (e.g. `from warehouse import ...`) relative to their own directory
+    sys.path.insert(0, os.path.dirname(path))
+    runpy.run_path(path, run_name='__main__')
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='datadigest',
+        description='DataDigest pipeline commands. Any command accepts --profile (see scripts/datadigest/profiling.py).'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    collect = commands.add_parser('collect', help='Run a collector')
+    collect.add_argument('source', choices=sorted(COLLECTORS))
+
+    generate = commands.add_parser('generate', help='Generate synthetic data or article features')
+    generate.add_argument('dataset', choices=sorted(GENERATORS))
+    generate.add_argument('args', nargs=argparse.REMAINDER, help='Passed on to the generator')
+
+    load = commands.add_parser('load', help='Load the newest raw files into the warehouse')
+    load.add_argument('--table', help='Only this raw table (skipped if its newest file is already loaded)')
+    load.add_argument('--backend', choices=['bigquery', 'duckdb'], help='Defaults to DATADIGEST_WAREHOUSE')
+    load.add_argument('--force', action='store_true', help='With --table: reload even if already loaded')
+
+    commands.add_parser('fix-schema', help='Evolve the raw web_analytics schema, reloading only if it was rebuilt')
+
+    report = commands.add_parser('report', help='Load metrics or stage timings compared with earlier runs')
+    report.add_argument('report', choices=sorted(REPORTS))
+    report.add_argument('args', nargs=argparse.REMAINDER, help='Passed on to the report')
+
+    return parser
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if '--profile' in argv:
+        # Picked up by the script's run_main(), wherever the flag was given
+        argv.remove('--profile')
+        os.environ['DATADIGEST_PROFILE'] = '1'
+
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'collect':
+        run_script(COLLECTORS[args.source])
+    elif args.command == 'generate':
+        run_script(GENERATORS[args.dataset], args.args)
+    elif args.command == 'load':
+        if args.table:
+            extra = ['--backend', args.backend] if args.backend else []
+            run_script('ingestion/ingest_source.py', ['load', '--table', args.table, *extra,
+                                                      *(['--force'] if args.force else [])])
+        else:
+            if args.backend:
+                os.environ['DATADIGEST_WAREHOUSE'] = args.backend
+            run_script('ingestion/load_to_bigquery.py')
+    elif args.command == 'fix-schema':
+        run_script('ingestion/fix_web_analytics.py')
+    elif args.command == 'report':
+        # telemetry.py has subcommands of its own; `report telemetry` means its trend report
+        extra = ['report', *args.args] if args.report == 'telemetry' else args.args
+        run_script(REPORTS[args.report], extra)
+
+if __name__ == "__main__":
+    main()
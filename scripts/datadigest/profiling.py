@@ -0,0 +1,175 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_DIR = 'data/profiles'
+DEFAULT_INTERVAL = 0.005
+
+class Profiler:
+    """Samples the main thread's stack on a background thread and snapshots memory with tracemalloc.
+
+    Writes <name>_<timestamp>.folded (collapsed stacks for flamegraph.pl, speedscope or
+    inferno), .memory.txt (allocation growth by line) and .sections.json (hot section timings).
+    """
+
+    def __init__(self, name, output_dir=None, interval=None, memory=True):
+        self.name = name
+        self.output_dir = output_dir or os.getenv('DATADIGEST_PROFILE_DIR', PROFILE_DIR)
+        self.interval = interval or float(os.getenv('DATADIGEST_PROFILE_INTERVAL', DEFAULT_INTERVAL))
+        self.memory = memory
+        self.stacks = Counter()
+        self.sections = {}
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = None
+        self.target = None
+        self.baseline = None
+        self.started = None
+
+    def start(self):
+        self.target = threading.main_thread().ident
+        if self.memory:
+            tracemalloc.start()
+            self.baseline = tracemalloc.take_snapshot()
+        self.started = time.perf_counter()
+        self.thread = threading.Thread(target=self.sample, name='datadigest-profiler', daemon=True)
+        self.thread.start()
+
+    def sample(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def record_section(self, name, seconds, memory_bytes):
+        entry = self.sections.setdefault(name, {'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+                                                'allocated_bytes': 0})
+        entry['calls'] += 1
+        entry['total_seconds'] += seconds
+        entry['max_seconds'] = max(entry['max_seconds'], seconds)
+        entry['allocated_bytes'] += memory_bytes
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        elapsed = time.perf_counter() - self.started
+
+        if self.memory:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(self.output_dir, f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+        with open(prefix + '.folded', 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(prefix + '.sections.json', 'w') as f:
+            json.dump({'script': self.name, 'wall_seconds': round(elapsed, 3), 'samples': self.samples,
+                       'interval_seconds': self.interval, 'sections': self.sections}, f, indent=2)
+
+        if self.memory:
+            growth = snapshot.compare_to(self.baseline, 'lineno')
+            with open(prefix + '.memory.txt', 'w') as f:
+                f.write(f"current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB\n\n")
+                for stat in growth[:30]:
+                    f.write(f"{stat}\n")
+
+        self.report(prefix, elapsed)
+
+    def report(self, prefix, elapsed):
+        print(f"\n{'='*72}")
+        print(f"PROFILE: {self.name} ({elapsed:.2f}s, {self.samples} samples)")
+        print('='*72)
+
+        if self.sections:
+            print(f"{'section':<34} {'calls':>6} {'total s':>9} {'max s':>8} {'alloc MB':>9}")
+            for name, entry in sorted(self.sections.items(), key=lambda item: -item[1]['total_seconds']):
+                print(f"{name[:34]:<34} {entry['calls']:>6} {entry['total_seconds']:>9.2f} "
+                      f"{entry['max_seconds']:>8.2f} {entry['allocated_bytes'] / 1e6:>9.1f}")
+
+        # Self time: the innermost frame of each sample
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        if leaves:
+            print("\nHottest functions (self time):")
+            for frame, count in leaves.most_common(10):
+                print(f"   {count / self.samples:>6.1%}  {frame}")
+
+        print(f"\nFlamegraph input: {prefix}.folded (e.g. flamegraph.pl {prefix}.folded > profile.svg)")
+        if self.memory:
+            print(f"Memory growth: {prefix}.memory.txt")
+
+_active = None
+
+def profile_mode():
+    """'--profile' on the command line or DATADIGEST_PROFILE=1 (cpu skips tracemalloc); None when off."""
+    if '--profile' in sys.argv:
+        sys.argv.remove('--profile')
+        os.environ.setdefault('DATADIGEST_PROFILE', '1')
+    mode = os.getenv('DATADIGEST_PROFILE', '').lower()
+    return None if mode in ('', '0', 'false', 'no') else mode
+
+def run_main(main, name=None):
+    """Run a script's main(), profiled if asked to; use in place of the `main()` call under __main__."""
+    global _active
+    mode = profile_mode()
+    if mode is None:
+        return main()
+
+    name = name or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    _active = Profiler(name, memory=mode != 'cpu')
+    _active.start()
+    try:
+        return main()
+    finally:
+        _active.stop()
+        _active = None
+
+@contextmanager
+def section(name):
+    """Time a named hot section; free when profiling is off."""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+
+    memory_before = tracemalloc.get_traced_memory()[0] if profiler.memory else 0
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        memory_after = tracemalloc.get_traced_memory()[0] if profiler.memory else 0
+        profiler.record_section(name, time.perf_counter() - started, max(memory_after - memory_before, 0))
+
+def hot_section(name=None):
+    """Decorator form of section(), named after the function by default."""
+    def decorator(func):
+        section_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with section(section_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,172 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+RAW_DIR = 'data/raw'
+CATALOG_PATH = 'data/raw/_catalog.sqlite'
+
+# Writers name files <source>_<YYYYmmdd_HHMMSS>.<format>
+FILENAME_PATTERN = re.compile(r'^(?P<source>.+)_(?P<timestamp>\d{8}_\d{6})\.(?P<format>csv|json)$')
+
+class RawFileCatalog:
+    """SQLite index of the files collectors and generators write to data/raw.
+
+    Lookups by source go through an index on (source, format, file_timestamp)
+    instead of listing the directory, and files carry their row count and hash.
+    """
+
+    def __init__(self, path=None, raw_dir=RAW_DIR):
+        self.path = path or os.getenv('DATADIGEST_RAW_CATALOG', CATALOG_PATH)
+        self.raw_dir = raw_dir
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        with closing(self.connect()) as conn, conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS raw_files (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    path TEXT NOT NULL UNIQUE,
+                    source TEXT NOT NULL,
+                    format TEXT NOT NULL,
+                    file_timestamp TEXT NOT NULL,
+                    row_count INTEGER,
+                    size_bytes INTEGER,
+                    sha256 TEXT,
+                    registered_at TEXT NOT NULL
+                )
+            """)
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_raw_files_lookup ON raw_files (source, format, file_timestamp)'
+            )
+
+    def connect(self):
+        # Parallel writers (e.g. Airflow tasks) wait on the lock instead of failing
+        return sqlite3.connect(self.path, timeout=30)
+
+    def parse_filename(self, path):
+        match = FILENAME_PATTERN.match(os.path.basename(path))
+        if not match:
+            return None, None, None
+
+        timestamp = datetime.strptime(match.group('timestamp'), '%Y%m%d_%H%M%S')
+        return match.group('source'), match.group('format'), timestamp.isoformat()
+
+    def count_rows(self, path, file_format):
+        if file_format == 'json':
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return len(data) if isinstance(data, list) else 1
+
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+    def file_hash(self, path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def register(self, path, source=None, file_format=None, row_count=None, file_timestamp=None):
+        """Add or refresh a file; source, format and timestamp default to the filename."""
+        parsed_source, parsed_format, parsed_timestamp = self.parse_filename(path)
+
+        source = source or parsed_source
+        file_format = file_format or parsed_format or os.path.splitext(path)[1].lstrip('.')
+        file_timestamp = file_timestamp or parsed_timestamp or datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+
+        if source is None:
+            raise ValueError(f"Cannot infer source for {path}; pass source explicitly")
+        if row_count is None:
+            row_count = self.count_rows(path, file_format)
+
+        with closing(self.connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO raw_files (path, source, format, file_timestamp, row_count, size_bytes, sha256, registered_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    source = excluded.source, format = excluded.format,
+                    file_timestamp = excluded.file_timestamp, row_count = excluded.row_count,
+                    size_bytes = excluded.size_bytes, sha256 = excluded.sha256,
+                    registered_at = excluded.registered_at
+                """,
+                (os.path.normpath(path), source, file_format, file_timestamp, row_count,
+                 os.path.getsize(path), self.file_hash(path), datetime.now().isoformat())
+            )
+
+    def forget(self, path):
+        with closing(self.connect()) as conn, conn:
+            conn.execute('DELETE FROM raw_files WHERE path = ?', (os.path.normpath(path),))
+
+    def sync(self):
+        """One-off directory scan registering files written before the catalog existed."""
+        with closing(self.connect()) as conn:
+            known = {row[0] for row in conn.execute('SELECT path FROM raw_files')}
+
+        added = 0
+        if os.path.isdir(self.raw_dir):
+            for name in os.listdir(self.raw_dir):
+                path = os.path.normpath(os.path.join(self.raw_dir, name))
+                source, _, _ = self.parse_filename(path)
+                if source and path not in known:
+                    self.register(path)
+                    added += 1
+
+        return added
+
+    def newest_registered(self, source, file_format):
+        while True:
+            with closing(self.connect()) as conn:
+                row = conn.execute(
+                    """
+                    SELECT path FROM raw_files
+                    WHERE source = ? AND format = ?
+                    ORDER BY file_timestamp DESC LIMIT 1
+                    """,
+                    (source, file_format)
+                ).fetchone()
+
+            if row is None or os.path.exists(row[0]):
+                return row[0] if row else None
+
+            # File was removed from disk; drop the stale entry and look again
+            self.forget(row[0])
+
+    def latest(self, source, file_format='csv'):
+        """Path of the newest file for a source, or None."""
+        path = self.newest_registered(source, file_format)
+
+        # Nothing registered yet: pick up files written before the catalog existed
+        if path is None and self.sync():
+            path = self.newest_registered(source, file_format)
+
+        return path
+
+    def registered_since(self, last_id, sources, file_format='csv'):
+        """(id, path, source) for files registered after catalog id last_id."""
+        placeholders = ', '.join('?' for _ in sources)
+        with closing(self.connect()) as conn:
+            return conn.execute(
+                f"""
+                SELECT id, path, source FROM raw_files
+                WHERE id > ? AND format = ? AND source IN ({placeholders})
+                ORDER BY id
+                """,
+                (last_id, file_format, *sources)
+            ).fetchall()
+
+def register_raw_file(path, row_count=None, source=None):
+    """Record a file a writer just finished in the default catalog."""
+    RawFileCatalog().register(path, source=source, row_count=row_count)
+
+def latest_raw_file(source, file_format='csv'):
+    """Newest file for a source from the default catalog, or None."""
+    return RawFileCatalog().latest(source, file_format)
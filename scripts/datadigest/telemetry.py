@@ -0,0 +1,340 @@
+import argparse
+import atexit
+import fcntl
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+SPANS_FILE = 'data/metrics/spans.jsonl'
+PROM_FILE = 'data/metrics/datadigest.prom'
+
+# Open spans, per thread (backfill partitions run in a thread pool)
+_local = threading.local()
+_otlp_tracer = None
+
+def spans_file():
+    return os.getenv('DATADIGEST_TELEMETRY_FILE', SPANS_FILE)
+
+def run_id():
+    """Airflow tasks share their DAG run's id; standalone scripts get DATADIGEST_RUN_ID or a timestamp."""
+    if not os.getenv('DATADIGEST_RUN_ID'):
+        os.environ['DATADIGEST_RUN_ID'] = os.getenv('AIRFLOW_CTX_DAG_RUN_ID') or datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.environ['DATADIGEST_RUN_ID']
+
+class Span:
+    """One timed pipeline stage; set() attaches row and byte counts and other attributes."""
+
+    def __init__(self, stage, name, parent_id=None):
+        self.run_id = run_id()
+        self.stage = stage
+        self.name = name
+        self.parent_id = parent_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.attributes = {}
+        self.rows = None
+        self.bytes = None
+        self.status = 'ok'
+        self.error = None
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+
+    def set(self, rows=None, bytes_processed=None, **attributes):
+        if rows is not None:
+            self.rows = int(rows)
+        if bytes_processed is not None:
+            self.bytes = int(bytes_processed)
+        self.attributes.update(attributes)
+        return self
+
+    def fail(self, error):
+        self.status = 'error'
+        self.error = str(error)
+
+    def to_record(self, duration=None):
+        return {
+            'run_id': self.run_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'stage': self.stage,
+            'name': self.name,
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(),
+            'duration_seconds': round(duration if duration is not None else time.perf_counter() - self.started, 3),
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'status': self.status,
+            'error': self.error,
+            'origin': 'airflow' if os.getenv('AIRFLOW_CTX_TASK_ID') else 'script',
+            'task': os.getenv('AIRFLOW_CTX_TASK_ID'),
+            'attributes': self.attributes
+        }
+
+def current_parent_id():
+    """The innermost open span, in this process or the script that started it."""
+    stack = getattr(_local, 'stack', [])
+    return stack[-1].span_id if stack else os.getenv('DATADIGEST_PARENT_SPAN_ID')
+
+@contextmanager
+def span(stage, name):
+    """Time a stage of the pipeline, e.g. `with span('load', 'web_analytics') as s: s.set(rows=n)`.
+
+    Exceptions mark the span as failed and are re-raised. Subprocesses started
+    inside the span (e.g. a collector) inherit its run id and nest under it.
+    """
+    current = Span(stage, name, current_parent_id())
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    _local.stack.append(current)
+
+    # The environment is shared by all threads, so only the main thread hands its span down
+    main_thread = threading.current_thread() is threading.main_thread()
+    outer_parent = os.environ.get('DATADIGEST_PARENT_SPAN_ID')
+    if main_thread:
+        os.environ['DATADIGEST_PARENT_SPAN_ID'] = current.span_id
+
+    try:
+        yield current
+    except BaseException as e:
+        current.fail(e)
+        raise
+    finally:
+        _local.stack.pop()
+        if main_thread:
+            if outer_parent is None:
+                os.environ.pop('DATADIGEST_PARENT_SPAN_ID', None)
+            else:
+                os.environ['DATADIGEST_PARENT_SPAN_ID'] = outer_parent
+        emit(current.to_record())
+
+def record_span(stage, name, duration_seconds, rows=None, bytes_processed=None, status='ok', error=None, **attributes):
+    """Record a stage that was timed elsewhere (e.g. a dbt model from run_results.json)."""
+    current = Span(stage, name, current_parent_id())
+    current.started_at -= duration_seconds
+    current.set(rows, bytes_processed, **attributes)
+    current.status = status
+    current.error = error
+    emit(current.to_record(duration_seconds))
+
+def emit(record):
+    """Append to the spans file, refresh the Prometheus textfile and export over OTLP if configured."""
+    path = spans_file()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+    write_prometheus(record)
+    export_otlp(record)
+
+def write_prometheus(record):
+    """Keep the latest value per stage in a node_exporter textfile (DATADIGEST_PROM_TEXTFILE)."""
+    prom_file = os.getenv('DATADIGEST_PROM_TEXTFILE', PROM_FILE)
+    latest_file = prom_file + '.json'
+    os.makedirs(os.path.dirname(prom_file) or '.', exist_ok=True)
+
+    with open(prom_file + '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        latest = {}
+        if os.path.exists(latest_file):
+            with open(latest_file, 'r') as f:
+                latest = json.load(f)
+        latest[f"{record['stage']}/{record['name']}"] = record
+        with open(latest_file, 'w') as f:
+            json.dump(latest, f)
+
+        metrics = [
+            ('datadigest_stage_duration_seconds', 'Duration of the latest run of each pipeline stage', 'duration_seconds'),
+            ('datadigest_stage_rows', 'Rows produced by the latest run of each stage', 'rows'),
+            ('datadigest_stage_bytes', 'Bytes read or written by the latest run of each stage', 'bytes'),
+            ('datadigest_stage_success', '1 if the latest run of each stage succeeded', 'success'),
+            ('datadigest_stage_last_run_timestamp_seconds', 'Start of the latest run of each stage', 'started')
+        ]
+
+        lines = []
+        for metric, help_text, field in metrics:
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} gauge']
+            for key, entry in sorted(latest.items()):
+                if field == 'success':
+                    value = 1 if entry['status'] == 'ok' else 0
+                elif field == 'started':
+                    value = datetime.fromisoformat(entry['started_at']).timestamp()
+                else:
+                    value = entry[field]
+                if value is not None:
+                    lines.append(f'{metric}{{stage="{entry["stage"]}",name="{entry["name"]}"}} {value}')
+
+        # Rename so the collector never reads a half-written file
+        with open(prom_file + '.tmp', 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(prom_file + '.tmp', prom_file)
+
+def export_otlp(record):
+    """Send the span to OTEL_EXPORTER_OTLP_ENDPOINT when the OpenTelemetry SDK is installed."""
+    global _otlp_tracer
+    if not os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT'):
+        return
+
+    if _otlp_tracer is None:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            print("OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-sdk is not installed; skipping OTLP export")
+            _otlp_tracer = False
+            return
+
+        provider = TracerProvider(resource=Resource.create({'service.name': 'datadigest'}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        atexit.register(provider.shutdown)
+        _otlp_tracer = provider.get_tracer('datadigest')
+
+    if not _otlp_tracer:
+        return
+
+    started_ns = int(datetime.fromisoformat(record['started_at']).timestamp() * 1e9)
+    attributes = {
+        'datadigest.run_id': record['run_id'],
+        'datadigest.stage': record['stage'],
+        'datadigest.status': record['status'],
+        **{f'datadigest.{key}': record[key] for key in ('rows', 'bytes', 'task') if record[key] is not None},
+        **{f'datadigest.{key}': value for key, value in record['attributes'].items() if isinstance(value, (str, int, float, bool))}
+    }
+    otel_span = _otlp_tracer.start_span(f"{record['stage']} {record['name']}", start_time=started_ns, attributes=attributes)
+    otel_span.end(end_time=started_ns + int(record['duration_seconds'] * 1e9))
+
+def record_dbt_results(run_results_file):
+    """One 'dbt' span per model (and 'dbt_test' per test) from a dbt run_results.json."""
+    with open(run_results_file, 'r') as f:
+        run_results = json.load(f)
+
+    for result in run_results['results']:
+        # model.<project>.<name>, test.<project>.<name>.<hash>
+        resource_type, _, name = result['unique_id'].split('.')[:3]
+        response = result.get('adapter_response') or {}
+
+        record_span(
+            'dbt_test' if resource_type == 'test' else 'dbt',
+            name,
+            result['execution_time'],
+            rows=response.get('rows_affected'),
+            bytes_processed=response.get('bytes_processed'),
+            status='ok' if result['status'] in ('success', 'pass') else result['status'],
+            error=result.get('message') if result['status'] not in ('success', 'pass') else None
+        )
+
+def read_spans(path=None, since=None):
+    spans = []
+    path = path or spans_file()
+    if not os.path.exists(path):
+        return spans
+
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                if since is None or record['started_at'] >= since.isoformat():
+                    spans.append(record)
+    return spans
+
+def report(spans, days=7, threshold=0.25):
+    """Median duration per stage this period vs the previous one, slowest-growing first."""
+    now = datetime.now()
+    current_start = (now - timedelta(days=days)).isoformat()
+    previous_start = (now - timedelta(days=2 * days)).isoformat()
+
+    stages = {}
+    for record in spans:
+        if record['status'] != 'ok':
+            continue
+        entry = stages.setdefault((record['stage'], record['name']), {'current': [], 'previous': [], 'rows': []})
+        if record['started_at'] >= current_start:
+            entry['current'].append(record['duration_seconds'])
+            if record['rows'] is not None:
+                entry['rows'].append(record['rows'])
+        elif record['started_at'] >= previous_start:
+            entry['previous'].append(record['duration_seconds'])
+
+    failures = {}
+    for record in spans:
+        if record['status'] != 'ok' and record['started_at'] >= current_start:
+            key = (record['stage'], record['name'])
+            failures[key] = failures.get(key, 0) + 1
+
+    rows = []
+    for key, entry in stages.items():
+        if not entry['current']:
+            continue
+        current = statistics.median(entry['current'])
+        previous = statistics.median(entry['previous']) if entry['previous'] else None
+        change = (current - previous) / previous if previous else None
+        rows.append({
+            'stage': key[0],
+            'name': key[1],
+            'runs': len(entry['current']),
+            'median_seconds': current,
+            'previous_median_seconds': previous,
+            'change': change,
+            'median_rows': statistics.median(entry['rows']) if entry['rows'] else None,
+            'failures': failures.get(key, 0),
+            'slower': change is not None and change > threshold
+        })
+
+    return sorted(rows, key=lambda row: row['change'] if row['change'] is not None else float('-inf'), reverse=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Pipeline telemetry: stage trend report, or record dbt results as spans')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    report_parser = subparsers.add_parser('report', help='Which stages got slower this period')
+    report_parser.add_argument('--days', type=int, default=7, help='Compare the last N days with the N before')
+    report_parser.add_argument('--threshold', type=float, default=0.25, help='Relative slowdown that gets flagged')
+    report_parser.add_argument('--stage', help='Only this stage (collect, generate, load, dbt, dbt_test, test, ...)')
+    report_parser.add_argument('--fail-on-regression', action='store_true')
+
+    dbt_parser = subparsers.add_parser('dbt-results', help='Record spans from a dbt run_results.json')
+    dbt_parser.add_argument('run_results')
+
+    args = parser.parse_args()
+
+    if args.command == 'dbt-results':
+        if os.path.exists(args.run_results):
+            record_dbt_results(args.run_results)
+        return
+
+    spans = read_spans(since=datetime.now() - timedelta(days=2 * args.days))
+    if args.stage:
+        spans = [record for record in spans if record['stage'] == args.stage]
+    rows = report(spans, args.days, args.threshold)
+
+    if not rows:
+        print(f"No spans in the last {args.days} days in {spans_file()}")
+        return
+
+    print(f"\n{'='*96}")
+    print(f"STAGE TIMINGS: median of the last {args.days} days vs the {args.days} days before")
+    print('='*96)
+    print(f"{'stage':<10} {'name':<34} {'runs':>5} {'median s':>9} {'before s':>9} {'change':>8} {'rows':>9} {'fails':>6}")
+
+    flagged = 0
+    for row in rows:
+        previous = f"{row['previous_median_seconds']:.2f}" if row['previous_median_seconds'] is not None else '-'
+        change = f"{row['change']:+.0%}" if row['change'] is not None else '-'
+        median_rows = f"{row['median_rows']:.0f}" if row['median_rows'] is not None else '-'
+        marker = '  ! slower' if row['slower'] else ''
+        print(f"{row['stage']:<10} {row['name'][:34]:<34} {row['runs']:>5} {row['median_seconds']:>9.2f} "
+              f"{previous:>9} {change:>8} {median_rows:>9} {row['failures']:>6}{marker}")
+        flagged += row['slower']
+
+    print(f"\n{flagged} stage(s) slower by more than {args.threshold:.0%}")
+    if flagged and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
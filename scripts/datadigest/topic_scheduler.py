@@ -0,0 +1,91 @@
+import json
+import math
+import os
+import time
+
+STATE_FILE = 'data/state/topic_yield.json'
+
+# Tweets scoring at least this with calculate_relevance count as relevant
+RELEVANCE_THRESHOLD = 0.5
+# Weight of older runs' statistics, applied once per run so the schedule follows changing topics
+DEFAULT_DECAY = 0.9
+# UCB exploration weight (sqrt(2) in textbook UCB1). Rewards are scaled to [0, 1]; with a budget of
+# ~10 requests per run, a lower weight moves requests to proven topics within a few runs.
+EXPLORATION = 0.5
+
+class TopicYieldScheduler:
+    """Spends a search request budget on the topics that have returned the most relevant tweets.
+
+    Keeps per topic the requests made and relevant tweets returned, across runs,
+    in data/state/topic_yield.json. Each request goes to the topic with the highest
+    UCB score (mean relevant tweets per request plus an exploration bonus), so
+    topics never tried go first and consistently productive ones get most of the
+    budget without the others being dropped for good.
+
+    Older statistics are decayed once per run_id: a resumed run, or a second
+    scheduler in the same run, passes the same run_id and keeps them as they are.
+    """
+
+    def __init__(self, max_results, run_id=None, state_file=None, decay=DEFAULT_DECAY):
+        self.max_results = max_results
+        self.run_id = run_id
+        self.state_file = state_file or os.getenv('DATADIGEST_TOPIC_YIELD_FILE', STATE_FILE)
+        self.stats = {}
+        decayed_for = None
+        if os.path.exists(self.state_file):
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            # Files written before runs were stamped hold the topic statistics only
+            self.stats = state['topics'] if 'topics' in state else state
+            decayed_for = state.get('run_id') if 'topics' in state else None
+
+        if run_id is None or run_id != decayed_for:
+            for entry in self.stats.values():
+                entry['requests'] *= decay
+                entry['relevant'] *= decay
+            if run_id is not None and self.stats:
+                self.save()
+
+    def mean_yield(self, topic):
+        entry = self.stats.get(topic)
+        if not entry or entry['requests'] <= 0:
+            return None
+        return entry['relevant'] / entry['requests']
+
+    def score(self, topic, total_requests):
+        entry = self.stats.get(topic)
+        if not entry or entry['requests'] <= 0:
+            return math.inf
+        reward = entry['relevant'] / entry['requests'] / self.max_results
+        return reward + EXPLORATION * math.sqrt(math.log(max(total_requests, 1)) / entry['requests'])
+
+    def choose(self, topics):
+        """The topic to spend the next request on, or None if there are none left."""
+        if not topics:
+            return None
+        total_requests = sum(self.stats.get(topic, {}).get('requests', 0) for topic in topics)
+        # Ties (e.g. several untried topics) go to the earliest topic in the list
+        return max(topics, key=lambda topic: (self.score(topic, total_requests), -topics.index(topic)))
+
+    def record(self, topic, relevance_scores):
+        """Count one request for the topic and the relevant tweets it returned."""
+        relevant = sum(1 for score in relevance_scores if score >= RELEVANCE_THRESHOLD)
+        entry = self.stats.setdefault(topic, {'requests': 0, 'relevant': 0, 'tweets': 0})
+        entry['requests'] += 1
+        entry['relevant'] += relevant
+        entry['tweets'] += len(relevance_scores)
+        entry['last_used'] = time.time()
+        self.save()
+        return relevant
+
+    def save(self):
+        if os.path.dirname(self.state_file):
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        with open(self.state_file + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'run_id': self.run_id, 'topics': self.stats}, f, indent=2, sort_keys=True)
+        os.replace(self.state_file + '.tmp', self.state_file)
+
+    def summary(self, topics):
+        """(topic, mean relevant tweets per request, requests) for the given topics, best first."""
+        rows = [(topic, self.mean_yield(topic), self.stats.get(topic, {}).get('requests', 0)) for topic in topics]
+        return sorted(rows, key=lambda row: -1 if row[1] is None else row[1], reverse=True)
@@ -0,0 +1,78 @@
+import os
+import time
+
+# Airflow asset the transform DAG is scheduled on; must match RAW_ASSET in airflow/dags
+RAW_ASSET_NAME = 'datadigest_raw'
+
+class AssetEventPublisher:
+    """Posts raw-data asset events to the Airflow REST API from loaders running outside Airflow.
+
+    Disabled unless DATADIGEST_AIRFLOW_URL is set. Authenticates with
+    DATADIGEST_AIRFLOW_TOKEN, or exchanges DATADIGEST_AIRFLOW_USER / _PASSWORD
+    for a token. Events closer together than min_interval seconds are merged.
+    """
+
+    def __init__(self, url=None, min_interval=0):
+        self.url = (url or os.getenv('DATADIGEST_AIRFLOW_URL', '')).rstrip('/')
+        self.token = os.getenv('DATADIGEST_AIRFLOW_TOKEN')
+        self.min_interval = min_interval
+        self.asset_id = None
+        self.pending = set()
+        self.last_published = 0
+
+    @property
+    def enabled(self):
+        return bool(self.url)
+
+    def headers(self):
+        import requests
+
+        if not self.token and os.getenv('DATADIGEST_AIRFLOW_USER'):
+            response = requests.post(f'{self.url}/auth/token', json={
+                'username': os.getenv('DATADIGEST_AIRFLOW_USER'),
+                'password': os.getenv('DATADIGEST_AIRFLOW_PASSWORD', '')
+            }, timeout=10)
+            response.raise_for_status()
+            self.token = response.json()['access_token']
+        return {'Authorization': f'Bearer {self.token}'} if self.token else {}
+
+    def lookup_asset_id(self):
+        import requests
+
+        if self.asset_id is None:
+            response = requests.get(f'{self.url}/api/v2/assets', params={'name_pattern': RAW_ASSET_NAME},
+                                    headers=self.headers(), timeout=10)
+            response.raise_for_status()
+            assets = [asset for asset in response.json()['assets'] if asset['name'] == RAW_ASSET_NAME]
+            if not assets:
+                raise RuntimeError(f"Airflow has no asset named {RAW_ASSET_NAME}; is the transform DAG deployed?")
+            self.asset_id = assets[0]['id']
+        return self.asset_id
+
+    def publish(self, tables, force=False):
+        """Record that these raw tables received new rows; returns True if an event was sent."""
+        if not self.enabled:
+            return False
+
+        # Imported here: every loader imports this module, most never publish
+        import requests
+
+        self.pending.update(tables)
+        if not self.pending or (not force and time.time() - self.last_published < self.min_interval):
+            return False
+
+        try:
+            response = requests.post(f'{self.url}/api/v2/assets/events', json={
+                'asset_id': self.lookup_asset_id(),
+                'extra': {'tables': sorted(self.pending), 'publisher': 'loader'}
+            }, headers=self.headers(), timeout=10)
+            response.raise_for_status()
+        except Exception as e:
+            # The rows are loaded either way; the event is retried with the next publish
+            print(f"Could not publish asset event to {self.url}: {e}")
+            return False
+
+        print(f"Published {RAW_ASSET_NAME} event for {', '.join(sorted(self.pending))}")
+        self.pending.clear()
+        self.last_published = time.time()
+        return True
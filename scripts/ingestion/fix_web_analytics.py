@@ -1,49 +1,34 @@
-from google.cloud import bigquery
-import json
+import os
+import sys
+
+from load_to_bigquery import BigQueryLoader
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import latest_raw_file
 
 def main():
-    client = bigquery.Client(project='datadigest-analytics-2025')
-    
-    # Load updated schema
-    with open('config/schemas/raw_web_analytics.json', 'r') as f:
-        schema_config = json.load(f)
-    
-    schema = []
-    for field in schema_config:
-        field_type = getattr(bigquery.enums.SqlTypeNames, field['type'])
-        mode = field['mode']
-        schema.append(bigquery.SchemaField(field['name'], field_type, mode=mode))
-    
-    # Create table with correct schema
-    table_ref = client.dataset('datadigest_raw').table('web_analytics')
-    table = bigquery.Table(table_ref, schema=schema)
-    
-    try:
-        table = client.create_table(table)
-        print(f"Created table with {len(schema)} columns")
-        
-        # Load data
-        job_config = bigquery.LoadJobConfig(
-            source_format=bigquery.SourceFormat.CSV,
-            skip_leading_rows=1,
-            autodetect=False,
-            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
-        )
-        
-        import glob
-        files = glob.glob('data/raw/web_analytics_*.csv')
-        latest_file = max(files)
-        
-        with open(latest_file, 'rb') as source_file:
-            job = client.load_table_from_file(source_file, table_ref, job_config=job_config)
-        
-        job.result()
-        
-        table = client.get_table(table_ref)
-        print(f"Successfully loaded {table.num_rows} rows to web_analytics table")
-        
-    except Exception as e:
-        print(f"Error: {e}")
+    loader = BigQueryLoader('datadigest-analytics-2025')
+
+    # Evolve the table in place; only incompatible changes drop and recreate it
+    status = loader.sync_table_schema(
+        'datadigest_raw', 'web_analytics', 'config/schemas/raw_web_analytics.json'
+    )
+
+    if status is None:
+        return
+
+    if status not in ('created', 'rebuilt'):
+        print(f"Schema {status}, existing rows kept - no reload needed")
+        return
+
+    # Table is empty after a create/rebuild, reload it from the latest export
+    latest_file = latest_raw_file('web_analytics')
+    if not latest_file:
+        print("No web analytics files found to reload")
+        return
+
+    if loader.load_csv_to_table('datadigest_raw', 'web_analytics', latest_file):
+        print("Successfully reloaded web_analytics table")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,181 @@
+import argparse
+import csv
+import fcntl
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+from load_to_bigquery import BigQueryLoader, TABLE_CONFIGS, load_schema_fields
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import latest_raw_file
+from datadigest.telemetry import span
+
+LOCK_DIR = 'data/state/locks'
+
+# Exit code Airflow's BashOperator treats as "skipped"; a skipped load emits no asset event
+SKIPPED_EXIT_CODE = 99
+
+# Types checked row by row before a file is loaded
+NUMERIC_TYPES = ('INTEGER', 'FLOAT', 'NUMERIC')
+
+def table_config(table):
+    for config in TABLE_CONFIGS:
+        if config['table'] == table:
+            return config
+    raise ValueError(f"Unknown table {table}; expected one of {', '.join(c['table'] for c in TABLE_CONFIGS)}")
+
+@contextmanager
+def file_lock(name):
+    """Exclusive lock shared by all ingestion tasks on this machine."""
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    with open(os.path.join(LOCK_DIR, f'{name}.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+def is_fresh(source, since):
+    latest = latest_raw_file(source)
+    return latest is not None and os.path.getmtime(latest) >= since
+
+def collect(config, since):
+    """Run the source's collector unless a file newer than `since` already exists.
+
+    Collectors that write several sources (e.g. the synthetic social generator) run
+    once: tasks sharing a collector wait on its lock and then find their file fresh.
+    """
+    collector = config['collector']
+    name = os.path.splitext(os.path.basename(collector))[0]
+
+    with file_lock(f'collect_{name}'), span('collect', config['source']) as collect_span:
+        if is_fresh(config['source'], since):
+            collect_span.set(skipped=True)
+            print(f"{config['source']}: {latest_raw_file(config['source'])} is fresh, not collecting again")
+            return True
+
+        print(f"{config['source']}: running {collector}")
+        returncode = subprocess.run([sys.executable, collector]).returncode
+        collect_span.set(collector=collector, returncode=returncode)
+        if returncode != 0:
+            collect_span.fail(f"{collector} exited with {returncode}")
+            return False
+
+    if not is_fresh(config['source'], since):
+        print(f"{collector} finished without writing a new {config['source']} file")
+        return False
+    return True
+
+def validate(config):
+    """Check the newest file has rows, every schema column and parseable numbers."""
+    path = latest_raw_file(config['source'])
+    if not path:
+        print(f"No data files found for source: {config['source']}")
+        return False
+
+    with span('validate', config['table']) as validate_span:
+        rows, errors = check_file(path, load_schema_fields(config['schema']))
+        validate_span.set(rows=rows, bytes_processed=os.path.getsize(path), errors=len(errors))
+        if errors:
+            validate_span.fail(errors[0])
+
+    for error in errors[:20]:
+        print(f"   {error}")
+    if len(errors) > 20:
+        print(f"   ... and {len(errors) - 20} more")
+
+    print(f"{path}: {rows} rows, {'INVALID' if errors else 'ok'}")
+    return not errors
+
+def check_file(path, fields):
+    """(rows, errors) for one raw CSV against its schema fields."""
+    errors = []
+    rows = 0
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        missing = [field['name'] for field in fields if field['name'] not in (reader.fieldnames or [])]
+        if missing:
+            errors.append(f"missing columns: {', '.join(missing)}")
+
+        numeric = [field['name'] for field in fields
+                   if field['type'] in NUMERIC_TYPES and field['name'] not in missing]
+        for row in reader:
+            rows += 1
+            for column in numeric:
+                value = row[column]
+                try:
+                    if value != '':
+                        float(value)
+                except ValueError:
+                    errors.append(f"line {rows + 1}: {column}={value!r} is not a number")
+
+    if rows == 0:
+        errors.append('no rows')
+    return rows, errors
+
+def load(config, backend=None, force=False):
+    """Load the newest file; returns None if that file was already loaded."""
+    path = latest_raw_file(config['source'])
+    if not path:
+        print(f"No data files found for source: {config['source']}")
+        return False
+
+    loader = BigQueryLoader('datadigest-analytics-2025', backend)
+
+    # DuckDB allows one writer per file, so local loads take turns
+    lock_name = 'duckdb_load' if loader.warehouse.name == 'duckdb' else f"load_{config['table']}"
+    # The batch ledger remembers loaded files, so reruns without new data load nothing
+    batch_id = f"{config['table']}:{os.path.basename(path)}"
+
+    with file_lock(lock_name):
+        if not force and loader.batch_committed(config['dataset'], batch_id):
+            print(f"{path} is already loaded into {config['table']}")
+            return None
+        if not loader.create_table_from_schema(config['dataset'], config['table'], config['schema']):
+            return False
+        return loader.load_csv_to_table(config['dataset'], config['table'], path, batch_id=batch_id)
+
+def main():
+    parser = argparse.ArgumentParser(description='Collect, validate or load one raw source (one Airflow mapped task each)')
+    parser.add_argument('step', choices=['list', 'collect', 'validate', 'load'])
+    parser.add_argument('--table', help='Raw table, as in TABLE_CONFIGS')
+    parser.add_argument('--since', type=float, default=0,
+                        help='Epoch seconds; collect skips sources with a file written after this')
+    parser.add_argument('--backend', choices=['bigquery', 'duckdb'], help='Defaults to DATADIGEST_WAREHOUSE')
+    parser.add_argument('--force', action='store_true', help='load: reload the newest file even if it was loaded before')
+    args = parser.parse_args()
+
+    if args.step == 'list':
+        # Last line is the task's XCom value
+        print(json.dumps([config['table'] for config in TABLE_CONFIGS]))
+        return
+
+    if not args.table:
+        parser.error(f"{args.step} needs --table")
+
+    config = table_config(args.table)
+    started = time.perf_counter()
+
+    if args.step == 'collect':
+        ok = collect(config, args.since)
+    elif args.step == 'validate':
+        ok = validate(config)
+    else:
+        ok = load(config, args.backend, args.force)
+
+    if ok is None:
+        print(f"{args.step} {args.table}: nothing new")
+        sys.exit(SKIPPED_EXIT_CODE)
+
+    print(f"{args.step} {args.table}: {'done' if ok else 'FAILED'} in {time.perf_counter() - started:.1f}s")
+    if not ok:
+        sys.exit(1)
+
+    # Last line is the task's XCom value, collected by the DAG's publish task
+    if args.step == 'load':
+        print(f"loaded {args.table}")
+
+if __name__ == "__main__":
+    main()
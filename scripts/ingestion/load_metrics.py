@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+from datetime import datetime
+
+METRICS_FILE = 'data/metrics/load_metrics.jsonl'
+
+class LoadMetricsRecorder:
+    """Append one JSON line per load job to the local metrics file."""
+
+    def __init__(self, metrics_file=None, run_id=None):
+        self.metrics_file = metrics_file or os.getenv('DATADIGEST_LOAD_METRICS', METRICS_FILE)
+        self.run_id = run_id or os.getenv('DATADIGEST_RUN_ID') or datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    def record(self, backend, dataset_id, table_id, source_file, wall_seconds, stats=None, error=None):
+        stats = stats or {}
+        rows = stats.get('rows', 0)
+        input_bytes = os.path.getsize(source_file) if os.path.exists(source_file) else 0
+
+        record = {
+            'run_id': self.run_id,
+            'recorded_at': datetime.now().isoformat(),
+            'backend': backend,
+            'table': f'{dataset_id}.{table_id}',
+            'source_file': source_file,
+            'status': 'error' if error else 'ok',
+            'error': str(error) if error else None,
+            'input_bytes': input_bytes,
+            'output_rows': rows,
+            'wall_seconds': round(wall_seconds, 3),
+            'upload_seconds': round(stats.get('upload_seconds', 0.0), 3),
+            'queue_seconds': round(stats.get('queue_seconds', 0.0), 3),
+            'server_seconds': round(stats.get('server_seconds', 0.0), 3),
+            'bytes_processed': stats.get('bytes_processed', 0),
+            'rows_per_second': round(rows / wall_seconds, 1) if wall_seconds else 0.0,
+            'mb_per_second': round(input_bytes / 1e6 / wall_seconds, 3) if wall_seconds else 0.0
+        }
+
+        if os.path.dirname(self.metrics_file):
+            os.makedirs(os.path.dirname(self.metrics_file), exist_ok=True)
+        with open(self.metrics_file, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+        return record
+
+def read_metrics(metrics_file=METRICS_FILE):
+    """Return recorded load jobs grouped by run, oldest run first."""
+    runs = {}
+    if not os.path.exists(metrics_file):
+        return runs
+
+    with open(metrics_file, 'r') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                runs.setdefault(record['run_id'], []).append(record)
+
+    return dict(sorted(runs.items(), key=lambda item: item[1][0]['recorded_at']))
+
+def compare_runs(runs, baseline_runs=5, threshold=0.25):
+    """Compare the latest run with the median of the previous runs, per table."""
+    run_ids = list(runs)
+    if not run_ids:
+        return []
+
+    latest = runs[run_ids[-1]]
+    previous = [runs[run_id] for run_id in run_ids[-1 - baseline_runs:-1]]
+
+    results = []
+    for record in latest:
+        history = [
+            r for run in previous for r in run
+            if r['table'] == record['table'] and r['backend'] == record['backend'] and r['status'] == 'ok'
+        ]
+
+        result = {'record': record, 'baseline_wall': None, 'baseline_rate': None, 'flags': []}
+
+        if record['status'] != 'ok':
+            result['flags'].append(f"load failed: {record['error']}")
+
+        if history:
+            result['baseline_wall'] = statistics.median(r['wall_seconds'] for r in history)
+            result['baseline_rate'] = statistics.median(r['rows_per_second'] for r in history)
+
+            if record['status'] == 'ok':
+                if record['wall_seconds'] > result['baseline_wall'] * (1 + threshold):
+                    result['flags'].append('wall time regressed')
+                if record['rows_per_second'] < result['baseline_rate'] * (1 - threshold):
+                    result['flags'].append('throughput regressed')
+
+        results.append(result)
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the latest load run against previous runs')
+    parser.add_argument('--metrics-file', default=os.getenv('DATADIGEST_LOAD_METRICS', METRICS_FILE))
+    parser.add_argument('--baseline-runs', type=int, default=5, help='How many previous runs form the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Relative change that counts as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit 1 if anything is flagged')
+    args = parser.parse_args()
+
+    runs = read_metrics(args.metrics_file)
+    if not runs:
+        print(f"No load metrics found in {args.metrics_file}")
+        return
+
+    results = compare_runs(runs, args.baseline_runs, args.threshold)
+    latest_run = list(runs)[-1]
+
+    print(f"\n{'='*90}")
+    print(f"LOAD METRICS: run {latest_run} vs median of previous {args.baseline_runs} runs")
+    print('='*90)
+    print(f"{'table':<34} {'rows':>8} {'MB':>8} {'wall s':>8} {'upload s':>9} {'server s':>9} {'rows/s':>10}  baseline")
+
+    flagged = 0
+    for result in results:
+        record = result['record']
+        baseline = '-'
+        if result['baseline_wall'] is not None:
+            baseline = f"{result['baseline_wall']:.2f}s, {result['baseline_rate']:.0f} rows/s"
+
+        print(f"{record['table']:<34} {record['output_rows']:>8} {record['input_bytes'] / 1e6:>8.2f} "
+              f"{record['wall_seconds']:>8.2f} {record['upload_seconds']:>9.2f} {record['server_seconds']:>9.2f} "
+              f"{record['rows_per_second']:>10.0f}  {baseline}")
+
+        for flag in result['flags']:
+            print(f"   ! {flag}")
+            flagged += 1
+
+    print(f"\n{flagged} regression(s) flagged")
+
+    if flagged and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
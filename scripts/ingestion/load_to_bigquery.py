@@ -1,122 +1,246 @@
-from google.cloud import bigquery
-import pandas as pd
+from warehouse import create_warehouse, normalize_field, is_metadata_field, METADATA_FIELDS
+from load_metrics import LoadMetricsRecorder
+from asset_events import AssetEventPublisher
 import json
-import glob
 import os
+import sys
+import time
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import latest_raw_file
+from datadigest.telemetry import span
+from datadigest.profiling import hot_section, run_main
+
+def load_schema_fields(schema_file):
+    """Load column definitions from a config/schemas JSON file."""
+    with open(schema_file, 'r') as f:
+        schema_config = json.load(f)
+
+    return [normalize_field(field['name'], field['type'], field.get('mode')) for field in schema_config]
+
+def diff_schema(live_fields, desired_fields):
+    """Compare a live table schema with the desired one.
+
+    Returns the columns that can be added and relaxed in place, plus a list of
+    reasons the table would have to be rebuilt instead.
+    """
+    live_by_name = {field['name']: field for field in live_fields}
+    desired_names = {field['name'] for field in desired_fields}
+
+    diff = {'added': [], 'relaxed': [], 'incompatible': []}
+
+    for field in live_fields:
+        if field['name'] not in desired_names:
+            diff['incompatible'].append(f"column {field['name']} was removed")
+
+    for field in desired_fields:
+        live = live_by_name.get(field['name'])
+
+        if live is None:
+            if field['mode'] == 'REQUIRED':
+                diff['incompatible'].append(f"new column {field['name']} is REQUIRED")
+            else:
+                diff['added'].append(field)
+        elif live['type'] != field['type']:
+            diff['incompatible'].append(
+                f"column {field['name']} changed type {live['type']} -> {field['type']}"
+            )
+        elif live['mode'] != field['mode']:
+            if live['mode'] == 'REQUIRED' and field['mode'] == 'NULLABLE':
+                diff['relaxed'].append(field)
+            else:
+                diff['incompatible'].append(
+                    f"column {field['name']} changed mode {live['mode']} -> {field['mode']}"
+                )
+
+    return diff
+
+# Raw tables, the raw-catalog source whose files feed them and the script that writes those files.
+# partition_column holds each row's event day (ISO string or unix seconds) for date-range backfills.
+TABLE_CONFIGS = [
+    {
+        'dataset': 'datadigest_raw',
+        'table': 'medium_articles',
+        'schema': 'config/schemas/raw_medium_articles.json',
+        'source': 'medium_articles_enhanced',
+        'collector': 'scripts/data_exploration/enhanced_medium_scraper_v2.py'
+    },
+    {
+        'dataset': 'datadigest_raw',
+        'table': 'twitter_mentions',
+        'schema': 'config/schemas/raw_twitter_mentions.json',
+        'source': 'twitter_synthetic',
+        'collector': 'scripts/data_exploration/enhanced_synthetic_generator.py',
+        'partition_column': 'created_at'
+    },
+    {
+        'dataset': 'datadigest_raw',
+        'table': 'reddit_submissions',
+        'schema': 'config/schemas/raw_reddit_submissions.json',
+        'source': 'reddit_synthetic',
+        'collector': 'scripts/data_exploration/enhanced_synthetic_generator.py',
+        'partition_column': 'created_utc'
+    },
+    {
+        'dataset': 'datadigest_raw',
+        'table': 'web_analytics',
+        'schema': 'config/schemas/raw_web_analytics.json',
+        'source': 'web_analytics',
+        'collector': 'scripts/data_exploration/complete_data_generator.py',
+        'partition_column': 'date'
+    },
+    {
+        'dataset': 'datadigest_raw',
+        'table': 'web_user_sketches',
+        'schema': 'config/schemas/raw_web_user_sketches.json',
+        'source': 'web_user_sketches',
+        'collector': 'scripts/data_exploration/complete_data_generator.py',
+        'partition_column': 'date'
+    },
+    {
+        'dataset': 'datadigest_raw',
+        'table': 'article_features',
+        'schema': 'config/schemas/raw_article_features.json',
+        'source': 'article_features',
+        'collector': 'scripts/datadigest/article_features.py'
+    }
+]
+
 class BigQueryLoader:
-    def __init__(self, project_id):
-        self.client = bigquery.Client(project=project_id)
+    def __init__(self, project_id, backend=None):
+        # backend: 'bigquery' (default) or 'duckdb', see DATADIGEST_WAREHOUSE
+        self.warehouse = create_warehouse(project_id, backend)
         self.project_id = project_id
-    
-    def create_table_from_schema(self, dataset_id, table_id, schema_file):
-        """Create BigQuery table from schema file."""
-        with open(schema_file, 'r') as f:
-            schema_config = json.load(f)
-        
-        schema = []
-        for field in schema_config:
-            field_type = getattr(bigquery.enums.SqlTypeNames, field['type'])
-            mode = field['mode']
-            schema.append(bigquery.SchemaField(field['name'], field_type, mode=mode))
-        
-        table_ref = self.client.dataset(dataset_id).table(table_id)
-        table = bigquery.Table(table_ref, schema=schema)
-        
+        self.table_fields = {}
+        self.metrics = LoadMetricsRecorder()
+
+    def sync_table_schema(self, dataset_id, table_id, schema_file):
+        """Bring a table in line with its schema file, evolving it in place when possible.
+
+        Returns 'created', 'unchanged', 'evolved' or 'rebuilt', or None on error.
+        Only 'created' and 'rebuilt' leave the table empty.
+        """
+        desired_fields = load_schema_fields(schema_file)
+        self.table_fields[(dataset_id, table_id)] = desired_fields
+
         try:
-            table = self.client.create_table(table)
-            print(f"Created table {dataset_id}.{table_id}")
-            return True
+            live_fields = self.warehouse.get_table_fields(dataset_id, table_id)
+
+            if live_fields is None:
+                self.warehouse.create_table(dataset_id, table_id, desired_fields + METADATA_FIELDS)
+                print(f"Created table {dataset_id}.{table_id}")
+                return 'created'
+
+            live_names = {field['name'] for field in live_fields}
+            diff = diff_schema([field for field in live_fields if not is_metadata_field(field['name'])], desired_fields)
+
+            if diff['incompatible']:
+                print(f"Schema of {dataset_id}.{table_id} cannot be evolved in place:")
+                for reason in diff['incompatible']:
+                    print(f"   - {reason}")
+
+                self.warehouse.drop_table(dataset_id, table_id)
+                self.warehouse.create_table(dataset_id, table_id, desired_fields + METADATA_FIELDS)
+                print(f"Rebuilt table {dataset_id}.{table_id}")
+                return 'rebuilt'
+
+            # Tables created before the loader stamped metadata get the columns added
+            added = diff['added'] + [field for field in METADATA_FIELDS if field['name'] not in live_names]
+
+            if not added and not diff['relaxed']:
+                print(f"Table {dataset_id}.{table_id} already exists with current schema")
+                return 'unchanged'
+
+            self.warehouse.evolve_table(dataset_id, table_id, added, diff['relaxed'])
+            print(f"Evolved table {dataset_id}.{table_id} in place: "
+                  f"{len(added)} columns added, {len(diff['relaxed'])} columns relaxed")
+            return 'evolved'
+
         except Exception as e:
-            if "already exists" in str(e).lower():
-                print(f"Table {dataset_id}.{table_id} already exists")
+            print(f"Error syncing schema for {dataset_id}.{table_id}: {e}")
+            return None
+
+    def create_table_from_schema(self, dataset_id, table_id, schema_file):
+        """Create table from schema file, evolving an existing table if the schema drifted."""
+        return self.sync_table_schema(dataset_id, table_id, schema_file) is not None
+
+    def batch_committed(self, dataset_id, batch_id):
+        """Whether a micro-batch already landed, according to the warehouse ledger."""
+        self.warehouse.ensure_batch_ledger(dataset_id)
+        return self.warehouse.batch_committed(dataset_id, batch_id)
+
+    @hot_section()
+    def load_csv_to_table(self, dataset_id, table_id, csv_file, write_disposition='WRITE_TRUNCATE', batch_id=None,
+                          replace_where=None):
+        """Load CSV data to a raw table; batch_id records the load in the batch ledger.
+
+        With WRITE_APPEND, replace_where (a SQL predicate) deletes the rows it
+        replaces in the same transaction, for partition reloads.
+        """
+        with span('load', table_id) as load_span:
+            started = time.perf_counter()
+
+            try:
+                # Without a synced schema file, assume the file matches the live column order
+                fields = self.table_fields.get((dataset_id, table_id))
+                if fields is None:
+                    fields = [
+                        field for field in self.warehouse.get_table_fields(dataset_id, table_id)
+                        if not is_metadata_field(field['name'])
+                    ]
+
+                print(f"Loading {csv_file} into {self.warehouse.name}")
+                stats = self.warehouse.load_csv(dataset_id, table_id, csv_file, fields, write_disposition, batch_id,
+                                                replace_where)
+
+                record = self.metrics.record(
+                    self.warehouse.name, dataset_id, table_id, csv_file,
+                    time.perf_counter() - started, stats
+                )
+                load_span.set(rows=stats['rows'], bytes_processed=record['input_bytes'], backend=self.warehouse.name,
+                              source_file=csv_file)
+                print(f"Loaded {stats['rows']} rows to {dataset_id}.{table_id} "
+                      f"in {record['wall_seconds']:.2f}s ({record['rows_per_second']:.0f} rows/s)")
                 return True
-            else:
-                print(f"Error creating table {dataset_id}.{table_id}: {e}")
-                return False
-    
-    def load_csv_to_table(self, dataset_id, table_id, csv_file):
-        """Load CSV data to BigQuery table."""
-        try:
-            df = pd.read_csv(csv_file)
-            print(f"Loading {len(df)} rows from {csv_file}")
-            
-            table_ref = self.client.dataset(dataset_id).table(table_id)
-            job_config = bigquery.LoadJobConfig(
-                source_format=bigquery.SourceFormat.CSV,
-                skip_leading_rows=1,
-                autodetect=False,
-                write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
-            )
-            
-            with open(csv_file, 'rb') as source_file:
-                job = self.client.load_table_from_file(
-                    source_file, table_ref, job_config=job_config
+
+            except Exception as e:
+                self.metrics.record(
+                    self.warehouse.name, dataset_id, table_id, csv_file,
+                    time.perf_counter() - started, error=e
                 )
-            
-            job.result()
-            
-            table = self.client.get_table(table_ref)
-            print(f"Loaded {table.num_rows} rows to {dataset_id}.{table_id}")
-            return True
-            
-        except Exception as e:
-            print(f"Error loading {csv_file}: {e}")
-            return False
+                load_span.fail(e)
+                print(f"Error loading {csv_file}: {e}")
+                return False
 
 def main():
     loader = BigQueryLoader('datadigest-analytics-2025')
     
-    # Define table configurations
-    table_configs = [
-        {
-            'dataset': 'datadigest_raw',
-            'table': 'medium_articles',
-            'schema': 'config/schemas/raw_medium_articles.json',
-            'data_pattern': 'data/raw/medium_articles_enhanced_*.csv'
-        },
-        {
-            'dataset': 'datadigest_raw',
-            'table': 'twitter_mentions',
-            'schema': 'config/schemas/raw_twitter_mentions.json',
-            'data_pattern': 'data/raw/twitter_synthetic_*.csv'
-        },
-        {
-            'dataset': 'datadigest_raw',
-            'table': 'reddit_submissions',
-            'schema': 'config/schemas/raw_reddit_submissions.json',
-            'data_pattern': 'data/raw/reddit_synthetic_*.csv'
-        },
-        {
-            'dataset': 'datadigest_raw',
-            'table': 'web_analytics',
-            'schema': 'config/schemas/raw_web_analytics.json',
-            'data_pattern': 'data/raw/web_analytics_*.csv'
-        }
-    ]
-    
     successful_loads = 0
+    loaded_tables = []
     
-    for config in table_configs:
+    for config in TABLE_CONFIGS:
         print(f"\n{'='*50}")
         print(f"Processing {config['table']}")
         print('='*50)
         
         if loader.create_table_from_schema(config['dataset'], config['table'], config['schema']):
-            files = glob.glob(config['data_pattern'])
-            if files:
-                latest_file = max(files)
+            latest_file = latest_raw_file(config['source'])
+            if latest_file:
                 print(f"Using data file: {latest_file}")
                 
                 if loader.load_csv_to_table(config['dataset'], config['table'], latest_file):
                     successful_loads += 1
+                    loaded_tables.append(config['table'])
             else:
-                print(f"No data files found for pattern: {config['data_pattern']}")
+                print(f"No data files found for source: {config['source']}")
     
     print(f"\n{'='*50}")
-    print(f"LOAD SUMMARY: {successful_loads}/{len(table_configs)} tables loaded successfully")
+    print(f"LOAD SUMMARY: {successful_loads}/{len(TABLE_CONFIGS)} tables loaded successfully")
     print('='*50)
+    
+    # Trigger the transform DAG if DATADIGEST_AIRFLOW_URL is set
+    AssetEventPublisher().publish(loaded_tables)
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
@@ -0,0 +1,285 @@
+from load_to_bigquery import BigQueryLoader, TABLE_CONFIGS, load_schema_fields
+from asset_events import AssetEventPublisher
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import RawFileCatalog
+
+STATE_FILE = 'data/state/stream_loader.json'
+SPOOL_DIR = 'data/stream'
+
+class MicroBatchLoader:
+    """Follow the raw-file catalog and append new rows to the raw tables in small batches.
+
+    A batch is identified by the file row ranges it covers. It is written to
+    the local state before loading and to the warehouse ledger in the same
+    transaction as its rows, so after a crash the same batch is replayed and
+    skipped if it already landed.
+    """
+
+    def __init__(self, loader, table_configs=None, batch_rows=500, flush_seconds=60,
+                 state_file=STATE_FILE, catalog=None, events=None):
+        self.loader = loader
+        self.configs = {config['table']: config for config in (table_configs or TABLE_CONFIGS)}
+        self.batch_rows = batch_rows
+        self.flush_seconds = flush_seconds
+        self.state_file = state_file
+        self.catalog = catalog or RawFileCatalog()
+        # Tells Airflow when rows land so the transform DAG runs (no-op unless configured)
+        self.events = events or AssetEventPublisher()
+
+        self.columns = {}
+        self.buffers = {table: [] for table in self.configs}
+        self.buffer_started = {table: None for table in self.configs}
+        self.queued_files = set()
+        self.state = self.load_state()
+
+    def load_state(self):
+        if os.path.exists(self.state_file):
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            state.setdefault('catalog_id', 0)
+            return state
+        return {'files': {}, 'pending': {}, 'catalog_id': 0}
+
+    def save_state(self):
+        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file, self.state_file)
+
+    def prepare_tables(self):
+        """Create or evolve every raw table before streaming into it."""
+        for table, config in self.configs.items():
+            if not self.loader.create_table_from_schema(config['dataset'], table, config['schema']):
+                raise RuntimeError(f"Could not prepare table {config['dataset']}.{table}")
+            self.columns[table] = [field['name'] for field in load_schema_fields(config['schema'])]
+
+    def read_rows(self, path, start=0, end=None):
+        """Yield (row_index, row) for data rows in [start, end)."""
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            for index, row in enumerate(csv.DictReader(f)):
+                if end is not None and index >= end:
+                    break
+                if index >= start:
+                    yield index, row
+
+    def source_files(self):
+        """(table, path) for files that may still have rows to load."""
+        tables = {config['source']: table for table, config in self.configs.items()}
+
+        # Files seen before a restart, then anything writers registered since the last poll
+        files = [(file_state['table'], path) for path, file_state in self.state['files'].items()]
+        for catalog_id, path, source in self.catalog.registered_since(self.state['catalog_id'], list(tables)):
+            files.append((tables[source], path))
+            self.state['catalog_id'] = catalog_id
+
+        for table in self.configs:
+            files.extend((table, path) for path in sorted(glob.glob(os.path.join(SPOOL_DIR, f'{table}_*.csv'))))
+
+        return files
+
+    def discover(self):
+        """Buffer uncommitted rows from newly registered and spooled files."""
+        last_catalog_id = self.state['catalog_id']
+        changed = False
+
+        for table, path in self.source_files():
+            file_state = self.state['files'].get(path)
+
+            if path in self.queued_files:
+                continue
+            if file_state and file_state['committed'] >= file_state['rows']:
+                continue
+            # Catalog entries can outlive their files
+            if not os.path.exists(path):
+                continue
+
+            committed = file_state['committed'] if file_state else 0
+            rows = 0
+            for index, row in self.read_rows(path, committed):
+                self.buffer(table, path, index, row)
+                rows = index + 1
+
+            self.state['files'][path] = {'table': table, 'rows': max(rows, committed), 'committed': committed}
+            self.queued_files.add(path)
+            changed = True
+
+            print(f"Queued {max(0, rows - committed)} rows from {path}")
+
+        if changed or self.state['catalog_id'] != last_catalog_id:
+            self.save_state()
+
+    def buffer(self, table, path, index, row):
+        if not self.buffers[table]:
+            self.buffer_started[table] = time.time()
+        self.buffers[table].append((path, index, row))
+
+    def submit(self, table, records):
+        """Accept records directly from a collector.
+
+        Records are spooled to disk first so they survive a crash like any
+        other file, then picked up by the next discover().
+        """
+        os.makedirs(SPOOL_DIR, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        path = os.path.join(SPOOL_DIR, f'{table}_{timestamp}.csv')
+
+        with open(f"{path}.tmp", 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.columns[table], extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(records)
+        os.replace(f"{path}.tmp", path)
+
+        return path
+
+    def batch_id(self, table, sources):
+        key = json.dumps([table, sorted(sources.items())])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def commit_batch(self, table, batch_id, rows):
+        """Append one batch unless the ledger says it already landed."""
+        config = self.configs[table]
+
+        if self.loader.batch_committed(config['dataset'], batch_id):
+            print(f"Batch {batch_id[:12]} for {table} already landed, skipping load")
+            return True
+
+        fd, batch_file = tempfile.mkstemp(prefix=f'{table}_', suffix='.csv')
+        try:
+            with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=self.columns[table], extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(rows)
+
+            return self.loader.load_csv_to_table(
+                config['dataset'], table, batch_file,
+                write_disposition='WRITE_APPEND', batch_id=batch_id
+            )
+        finally:
+            os.remove(batch_file)
+
+    def finish_batch(self, table, sources):
+        """Advance committed offsets once a batch has landed."""
+        for path, (start, end) in sources.items():
+            file_state = self.state['files'][path]
+            file_state['committed'] = max(file_state['committed'], end)
+
+            # Spooled records are only kept until they are in the warehouse
+            if path.startswith(SPOOL_DIR) and file_state['committed'] >= file_state['rows']:
+                os.remove(path)
+                del self.state['files'][path]
+                self.queued_files.discard(path)
+
+        self.state['pending'].pop(table, None)
+        self.save_state()
+
+    def flush(self, table, count):
+        batch = self.buffers[table][:count]
+
+        sources = {}
+        for path, index, _ in batch:
+            start, end = sources.get(path, (index, index))
+            sources[path] = (min(start, index), max(end, index + 1))
+
+        batch_id = self.batch_id(table, sources)
+
+        # Write-ahead: record the batch before loading so a restart replays exactly it
+        self.state['pending'][table] = {'batch_id': batch_id, 'rows': count,
+                                        'sources': {p: list(r) for p, r in sources.items()}}
+        self.save_state()
+
+        if not self.commit_batch(table, batch_id, [row for _, _, row in batch]):
+            return False
+
+        del self.buffers[table][:count]
+        self.buffer_started[table] = time.time() if self.buffers[table] else None
+        self.finish_batch(table, sources)
+        self.events.publish([table])
+        return True
+
+    def flush_due(self, force=False):
+        """Flush full batches, plus partial ones older than flush_seconds."""
+        for table, rows in self.buffers.items():
+            # A batch that failed to load is retried as is, so it keeps its batch_id and the
+            # write-ahead record stays valid for recover()
+            pending = self.state['pending'].get(table)
+            if pending and not self.flush(table, pending['rows']):
+                continue
+
+            failed = False
+            while len(rows) >= self.batch_rows:
+                if not self.flush(table, self.batch_rows):
+                    failed = True
+                    break
+            if failed:
+                continue
+
+            if rows and (force or time.time() - self.buffer_started[table] >= self.flush_seconds):
+                self.flush(table, len(rows))
+
+    def recover(self):
+        """Finish batches that were in flight when the previous run stopped."""
+        for table, pending in list(self.state['pending'].items()):
+            sources = {path: tuple(bounds) for path, bounds in pending['sources'].items()}
+
+            rows = []
+            for path, (start, end) in sources.items():
+                rows.extend(row for _, row in self.read_rows(path, start, end))
+
+            print(f"Replaying in-flight batch {pending['batch_id'][:12]} for {table} ({len(rows)} rows)")
+            if not self.commit_batch(table, pending['batch_id'], rows):
+                raise RuntimeError(f"Could not replay batch {pending['batch_id']} for {table}")
+
+            self.finish_batch(table, sources)
+
+    def run(self, poll_seconds=10, once=False):
+        self.prepare_tables()
+        self.recover()
+
+        # Register files written before the catalog existed; later ones are registered by their writers
+        self.catalog.sync()
+
+        try:
+            while True:
+                self.discover()
+                self.flush_due(force=once)
+                # Sends tables merged while the last event was too recent
+                self.events.publish([], force=once)
+
+                if once:
+                    break
+                time.sleep(poll_seconds)
+        except KeyboardInterrupt:
+            print("\nStopping, flushing buffered rows...")
+            self.flush_due(force=True)
+            self.events.publish([], force=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-batch loader that follows the raw-file catalog into the raw tables')
+    parser.add_argument('--batch-rows', type=int, default=500, help='Flush a table once this many rows are buffered')
+    parser.add_argument('--flush-seconds', type=int, default=60, help='Flush partial batches older than this')
+    parser.add_argument('--poll-seconds', type=int, default=10, help='How often to look for new files')
+    parser.add_argument('--backend', choices=['bigquery', 'duckdb'], help='Defaults to DATADIGEST_WAREHOUSE')
+    parser.add_argument('--once', action='store_true', help='Load everything pending and exit')
+    parser.add_argument('--event-seconds', type=int, default=300,
+                        help='Minimum time between Airflow asset events (see DATADIGEST_AIRFLOW_URL)')
+    args = parser.parse_args()
+
+    loader = BigQueryLoader('datadigest-analytics-2025', backend=args.backend)
+    events = AssetEventPublisher(min_interval=args.event_seconds)
+    stream = MicroBatchLoader(loader, batch_rows=args.batch_rows, flush_seconds=args.flush_seconds, events=events)
+    stream.run(poll_seconds=args.poll_seconds, once=args.once)
+
+if __name__ == "__main__":
+    main()
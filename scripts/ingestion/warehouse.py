@@ -0,0 +1,418 @@
+import os
+import time
+from datetime import datetime, timezone
+
+DEFAULT_DUCKDB_PATH = 'data/warehouse/datadigest.duckdb'
+
+# BigQuery reports legacy type names on live tables; normalize config names to match
+LEGACY_TYPE_NAMES = {
+    'INT64': 'INTEGER',
+    'FLOAT64': 'FLOAT',
+    'BOOL': 'BOOLEAN',
+    'STRUCT': 'RECORD'
+}
+
+# Column types supported by the local warehouse, keyed by BigQuery type name
+DUCKDB_TYPES = {
+    'STRING': 'VARCHAR',
+    'INTEGER': 'BIGINT',
+    'FLOAT': 'DOUBLE',
+    'NUMERIC': 'DECIMAL(38,9)',
+    'BOOLEAN': 'BOOLEAN',
+    'TIMESTAMP': 'TIMESTAMP',
+    'DATE': 'DATE',
+    'TIME': 'TIME',
+    'BYTES': 'BLOB',
+    'JSON': 'JSON'
+}
+BIGQUERY_TYPES = {duckdb_type: bq_type for bq_type, duckdb_type in DUCKDB_TYPES.items()}
+
+# Columns stamped on every loaded row, matching what Airbyte writes to raw tables
+METADATA_FIELDS = [
+    {'name': '_airbyte_raw_id', 'type': 'STRING', 'mode': 'NULLABLE'},
+    {'name': '_airbyte_extracted_at', 'type': 'TIMESTAMP', 'mode': 'NULLABLE'}
+]
+
+# Micro-batches committed by the stream loader, written in the same transaction as the rows
+BATCH_LEDGER_TABLE = '_stream_batches'
+
+def normalize_field(name, field_type, mode):
+    """Normalize a column definition so config and live schemas compare equal."""
+    field_type = str(field_type).upper()
+    return {
+        'name': name,
+        'type': LEGACY_TYPE_NAMES.get(field_type, field_type),
+        'mode': (mode or 'NULLABLE').upper()
+    }
+
+def job_seconds(start, end):
+    """Seconds between two BigQuery job timestamps, 0 if either is missing."""
+    if start is None or end is None:
+        return 0.0
+    return (end - start).total_seconds()
+
+def is_metadata_field(name):
+    """Loader-managed metadata columns are not part of config/schemas."""
+    return name.startswith('_airbyte_')
+
+class BigQueryWarehouse:
+    """Raw tables in the datadigest-analytics-2025 BigQuery project."""
+    name = 'bigquery'
+
+    def __init__(self, project_id):
+        from google.cloud import bigquery
+        self.bigquery = bigquery
+        self.client = bigquery.Client(project=project_id)
+        self.project_id = project_id
+
+    def table_ref(self, dataset_id, table_id):
+        return self.client.dataset(dataset_id).table(table_id)
+
+    def qualify(self, dataset_id, table_id):
+        return f"`{self.project_id}.{dataset_id}.{table_id}`"
+
+    def build_schema(self, fields):
+        """Convert normalized column definitions to BigQuery schema fields."""
+        return [
+            self.bigquery.SchemaField(field['name'], field['type'], mode=field['mode'])
+            for field in fields
+        ]
+
+    def get_table_fields(self, dataset_id, table_id):
+        """Return the normalized schema of a live table, or None if it does not exist."""
+        from google.api_core.exceptions import NotFound
+
+        try:
+            table = self.client.get_table(self.table_ref(dataset_id, table_id))
+        except NotFound:
+            return None
+
+        return [normalize_field(field.name, field.field_type, field.mode) for field in table.schema]
+
+    def create_table(self, dataset_id, table_id, fields):
+        table = self.bigquery.Table(self.table_ref(dataset_id, table_id), schema=self.build_schema(fields))
+        self.client.create_table(table)
+
+    def drop_table(self, dataset_id, table_id):
+        self.client.delete_table(self.table_ref(dataset_id, table_id), not_found_ok=True)
+
+    def evolve_table(self, dataset_id, table_id, added, relaxed):
+        """Append nullable columns and relax REQUIRED columns without touching the data."""
+        table = self.client.get_table(self.table_ref(dataset_id, table_id))
+        relaxed_names = {field['name'] for field in relaxed}
+
+        schema = []
+        for field in table.schema:
+            if field.name in relaxed_names:
+                field = self.bigquery.SchemaField(
+                    field.name, field.field_type, mode='NULLABLE',
+                    description=field.description, fields=field.fields
+                )
+            schema.append(field)
+        schema.extend(self.build_schema(added))
+
+        table.schema = schema
+        self.client.update_table(table, ['schema'])
+
+    def ensure_batch_ledger(self, dataset_id):
+        self.client.query(
+            f"CREATE TABLE IF NOT EXISTS {self.qualify(dataset_id, BATCH_LEDGER_TABLE)} "
+            f"(batch_id STRING, table_name STRING, row_count INT64, loaded_at TIMESTAMP)"
+        ).result()
+
+    def batch_committed(self, dataset_id, batch_id):
+        from google.cloud.bigquery import QueryJobConfig, ScalarQueryParameter
+
+        job_config = QueryJobConfig(query_parameters=[ScalarQueryParameter('batch_id', 'STRING', batch_id)])
+        rows = self.client.query(
+            f"SELECT COUNT(*) FROM {self.qualify(dataset_id, BATCH_LEDGER_TABLE)} WHERE batch_id = @batch_id",
+            job_config=job_config
+        ).result()
+        return next(iter(rows))[0] > 0
+
+    def load_csv(self, dataset_id, table_id, csv_file, fields, write_disposition='WRITE_TRUNCATE', batch_id=None,
+                 replace_where=None):
+        """Load a CSV laid out as `fields` and stamp metadata columns.
+
+        The file goes to a scratch table first, so the target table's column
+        order does not have to match the file. With a batch_id the ledger row
+        is written in the same transaction as the data. replace_where deletes
+        the matching rows (e.g. one day's partition) in that transaction too.
+
+        Returns load stats: rows, upload/queue/server seconds and bytes processed.
+        """
+        bigquery = self.bigquery
+        scratch_id = f'_load_{table_id}'
+        scratch_ref = self.table_ref(dataset_id, scratch_id)
+
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.CSV,
+            skip_leading_rows=1,
+            autodetect=False,
+            allow_quoted_newlines=True,
+            schema=self.build_schema(fields),
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
+        )
+
+        upload_started = time.perf_counter()
+        with open(csv_file, 'rb') as source_file:
+            job = self.client.load_table_from_file(source_file, scratch_ref, job_config=job_config)
+        upload_seconds = time.perf_counter() - upload_started
+
+        try:
+            job.result()
+
+            target = self.qualify(dataset_id, table_id)
+            columns = ', '.join(f"`{field['name']}`" for field in fields)
+            statements = []
+
+            if write_disposition == 'WRITE_TRUNCATE':
+                statements.append(f"DELETE FROM {target} WHERE TRUE")
+            elif replace_where:
+                statements.append(f"DELETE FROM {target} WHERE {replace_where}")
+
+            statements.append(
+                f"INSERT INTO {target} ({columns}, _airbyte_raw_id, _airbyte_extracted_at) "
+                f"SELECT {columns}, GENERATE_UUID(), CURRENT_TIMESTAMP() "
+                f"FROM {self.qualify(dataset_id, scratch_id)}"
+            )
+
+            if batch_id:
+                statements.append(
+                    f"INSERT INTO {self.qualify(dataset_id, BATCH_LEDGER_TABLE)} "
+                    f"VALUES ('{batch_id}', '{table_id}', {job.output_rows}, CURRENT_TIMESTAMP())"
+                )
+
+            if len(statements) == 1:
+                sql = statements[0]
+            else:
+                sql = "BEGIN TRANSACTION;\n" + ";\n".join(statements) + ";\nCOMMIT TRANSACTION;"
+
+            query_job = self.client.query(sql)
+            query_job.result()
+        finally:
+            self.client.delete_table(scratch_ref, not_found_ok=True)
+
+        return {
+            'rows': job.output_rows,
+            'upload_seconds': upload_seconds,
+            'queue_seconds': job_seconds(job.created, job.started) + job_seconds(query_job.created, query_job.started),
+            'server_seconds': job_seconds(job.started, job.ended) + job_seconds(query_job.started, query_job.ended),
+            'bytes_processed': query_job.total_bytes_processed or 0
+        }
+
+    def query(self, sql):
+        """Run a query and return its rows as tuples."""
+        return [tuple(row.values()) for row in self.client.query(sql).result()]
+
+    def table_bytes(self, dataset_id, table_id):
+        """Logical bytes a full scan of the table is billed for."""
+        return self.client.get_table(self.table_ref(dataset_id, table_id)).num_bytes or 0
+
+    def estimate_query_bytes(self, sql, inputs=None):
+        """Bytes a query would be billed for, from a dry run (nothing is executed or charged)."""
+        job_config = self.bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+        return self.client.query(sql, job_config=job_config).total_bytes_processed or 0
+
+class DuckDBWarehouse:
+    """Embedded local warehouse; each BigQuery dataset becomes a DuckDB schema.
+
+    A connection is opened per call so dbt and other processes can use the
+    file between loads (DuckDB allows a single writer process).
+    """
+    name = 'duckdb'
+
+    def __init__(self, path=None):
+        import duckdb
+
+        self.duckdb = duckdb
+        self.path = path or os.getenv('DATADIGEST_DUCKDB_PATH', DEFAULT_DUCKDB_PATH)
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def connect(self):
+        return self.duckdb.connect(self.path)
+
+    def qualify(self, dataset_id, table_id):
+        return f'"{dataset_id}"."{table_id}"'
+
+    def column_sql(self, field):
+        if field['type'] not in DUCKDB_TYPES:
+            raise ValueError(f"Column type {field['type']} is not supported by the local warehouse")
+
+        sql = f'"{field["name"]}" {DUCKDB_TYPES[field["type"]]}'
+        if field['mode'] == 'REQUIRED':
+            sql += ' NOT NULL'
+        return sql
+
+    def get_table_fields(self, dataset_id, table_id):
+        """Return the normalized schema of a local table, or None if it does not exist."""
+        with self.connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT column_name, data_type, is_nullable
+                FROM information_schema.columns
+                WHERE table_catalog = current_database() AND table_schema = ? AND table_name = ?
+                ORDER BY ordinal_position
+                """,
+                [dataset_id, table_id]
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        fields = []
+        for name, data_type, is_nullable in rows:
+            field_type = 'NUMERIC' if data_type.startswith('DECIMAL') else BIGQUERY_TYPES.get(data_type, data_type)
+            fields.append(normalize_field(name, field_type, 'NULLABLE' if is_nullable == 'YES' else 'REQUIRED'))
+        return fields
+
+    def create_table(self, dataset_id, table_id, fields):
+        columns = ', '.join(self.column_sql(field) for field in fields)
+
+        with self.connect() as conn:
+            conn.execute(f'CREATE SCHEMA IF NOT EXISTS "{dataset_id}"')
+            conn.execute(f'CREATE TABLE {self.qualify(dataset_id, table_id)} ({columns})')
+
+    def drop_table(self, dataset_id, table_id):
+        with self.connect() as conn:
+            conn.execute(f'DROP TABLE IF EXISTS {self.qualify(dataset_id, table_id)}')
+
+    def evolve_table(self, dataset_id, table_id, added, relaxed):
+        """Append nullable columns and relax NOT NULL columns without touching the data."""
+        target = self.qualify(dataset_id, table_id)
+
+        with self.connect() as conn:
+            for field in added:
+                conn.execute(f'ALTER TABLE {target} ADD COLUMN {self.column_sql(field)}')
+            for field in relaxed:
+                conn.execute(f'ALTER TABLE {target} ALTER COLUMN "{field["name"]}" DROP NOT NULL')
+
+    def ensure_batch_ledger(self, dataset_id):
+        with self.connect() as conn:
+            conn.execute(f'CREATE SCHEMA IF NOT EXISTS "{dataset_id}"')
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.qualify(dataset_id, BATCH_LEDGER_TABLE)} '
+                f'(batch_id VARCHAR, table_name VARCHAR, row_count BIGINT, loaded_at TIMESTAMP)'
+            )
+
+    def batch_committed(self, dataset_id, batch_id):
+        with self.connect() as conn:
+            count = conn.execute(
+                f'SELECT COUNT(*) FROM {self.qualify(dataset_id, BATCH_LEDGER_TABLE)} WHERE batch_id = ?',
+                [batch_id]
+            ).fetchone()[0]
+        return count > 0
+
+    def load_csv(self, dataset_id, table_id, csv_file, fields, write_disposition='WRITE_TRUNCATE', batch_id=None,
+                 replace_where=None):
+        """Load a CSV laid out as `fields` and stamp metadata columns.
+
+        With a batch_id the ledger row is written in the same transaction as the data,
+        and so is the delete of the rows matching replace_where.
+        Returns load stats in the same shape as BigQueryWarehouse.load_csv.
+        """
+        target = self.qualify(dataset_id, table_id)
+        columns = ', '.join(f'"{field["name"]}"' for field in fields)
+        column_types = ', '.join(f"'{field['name']}': '{DUCKDB_TYPES[field['type']]}'" for field in fields)
+        source = "read_csv('{}', header = true, columns = {{{}}})".format(csv_file.replace("'", "''"), column_types)
+        extracted_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        started = time.perf_counter()
+
+        with self.connect() as conn:
+            conn.execute('BEGIN TRANSACTION')
+            try:
+                if write_disposition == 'WRITE_TRUNCATE':
+                    conn.execute(f'DELETE FROM {target}')
+                elif replace_where:
+                    conn.execute(f'DELETE FROM {target} WHERE {replace_where}')
+
+                rows = conn.execute(
+                    f'INSERT INTO {target} ({columns}, _airbyte_raw_id, _airbyte_extracted_at) '
+                    f'SELECT {columns}, CAST(uuid() AS VARCHAR), ? FROM {source}',
+                    [extracted_at]
+                ).fetchone()[0]
+
+                if batch_id:
+                    conn.execute(
+                        f'INSERT INTO {self.qualify(dataset_id, BATCH_LEDGER_TABLE)} VALUES (?, ?, ?, ?)',
+                        [batch_id, table_id, rows, extracted_at]
+                    )
+
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+        # Nothing is uploaded or queued locally; the whole load is engine time
+        return {
+            'rows': rows,
+            'upload_seconds': 0.0,
+            'queue_seconds': 0.0,
+            'server_seconds': time.perf_counter() - started,
+            'bytes_processed': os.path.getsize(csv_file)
+        }
+
+    def query(self, sql):
+        """Run a query and return its rows as tuples."""
+        with self.connect() as conn:
+            return conn.execute(sql).fetchall()
+
+    def table_bytes(self, dataset_id, table_id):
+        """Logical bytes BigQuery would bill to scan every column of the table.
+
+        Uses BigQuery's data type sizes (8 bytes per number/date/timestamp,
+        2 + UTF-8 length per string, nothing for NULLs) so local numbers are
+        comparable with on-demand query costs.
+        """
+        with self.connect() as conn:
+            columns = conn.execute(
+                """
+                SELECT column_name, data_type
+                FROM information_schema.columns
+                WHERE table_catalog = current_database() AND table_schema = ? AND table_name = ?
+                """,
+                [dataset_id, table_id]
+            ).fetchall()
+
+            if not columns:
+                return 0
+
+            sizes = []
+            for name, data_type in columns:
+                if data_type in ('VARCHAR', 'JSON'):
+                    sizes.append(f'COALESCE(SUM(2 + strlen(CAST("{name}" AS VARCHAR))), 0)')
+                elif data_type == 'BLOB':
+                    sizes.append(f'COALESCE(SUM(2 + octet_length("{name}")), 0)')
+                elif data_type == 'BOOLEAN':
+                    sizes.append(f'COUNT("{name}")')
+                elif data_type.startswith('DECIMAL'):
+                    sizes.append(f'COUNT("{name}") * 16')
+                else:
+                    sizes.append(f'COUNT("{name}") * 8')
+
+            return conn.execute(
+                f'SELECT {" + ".join(sizes)} FROM {self.qualify(dataset_id, table_id)}'
+            ).fetchone()[0]
+
+    def estimate_query_bytes(self, sql, inputs=None):
+        """Upper bound of the bytes a query reads: full logical size of its (dataset, table) inputs.
+
+        DuckDB has no dry run, so the query is only planned (EXPLAIN) to catch
+        errors and the estimate assumes every input is scanned in full.
+        """
+        with self.connect() as conn:
+            conn.execute(f'EXPLAIN {sql}')
+        return sum(self.table_bytes(dataset_id, table_id) for dataset_id, table_id in inputs or [])
+
+def create_warehouse(project_id, backend=None):
+    """Pick the warehouse backend from the argument or DATADIGEST_WAREHOUSE."""
+    backend = (backend or os.getenv('DATADIGEST_WAREHOUSE', 'bigquery')).lower()
+
+    if backend == 'bigquery':
+        return BigQueryWarehouse(project_id)
+    if backend == 'duckdb':
+        return DuckDBWarehouse()
+
+    raise ValueError(f"Unknown warehouse backend: {backend}")
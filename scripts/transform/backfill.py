@@ -0,0 +1,244 @@
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ingestion'))
+from load_to_bigquery import BigQueryLoader, TABLE_CONFIGS, load_schema_fields
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.raw_catalog import latest_raw_file
+from datadigest.telemetry import span, record_dbt_results
+
+DBT_PROJECT_DIR = 'datadigest_transform'
+# Absolute, because dbt resolves a relative --target-path against --project-dir
+TARGET_DIR = os.path.abspath(os.path.join(DBT_PROJECT_DIR, 'target', 'backfill'))
+
+# Models with one row per event day, rebuilt partition by partition (dbt tag)
+PARTITION_TAG = 'daily_partitions'
+DEFAULT_CONCURRENCY = 4
+
+def partitions(start, end, days=1):
+    """[(start, end), ...] covering [start, end) in steps of `days`."""
+    ranges = []
+    current = start
+    while current < end:
+        ranges.append((current, min(current + timedelta(days=days), end)))
+        current += timedelta(days=days)
+    return ranges
+
+def partition_tables():
+    return [config for config in TABLE_CONFIGS if config.get('partition_column')]
+
+def partition_column_type(config):
+    fields = {field['name']: field for field in load_schema_fields(config['schema'])}
+    return fields[config['partition_column']]['type']
+
+def is_epoch_column(config):
+    return partition_column_type(config) in ('INTEGER', 'FLOAT', 'NUMERIC')
+
+def row_day(value, epoch):
+    if value in (None, ''):
+        return None
+    if epoch:
+        return datetime.fromtimestamp(float(value), timezone.utc).date()
+    return date.fromisoformat(value[:10])
+
+def raw_predicate(config, start, end):
+    """SQL matching a raw table's rows in [start, end), valid on BigQuery and DuckDB."""
+    column = config['partition_column']
+    if is_epoch_column(config):
+        low = datetime.combine(start, datetime.min.time(), timezone.utc).timestamp()
+        high = datetime.combine(end, datetime.min.time(), timezone.utc).timestamp()
+        return f"{column} >= {low:.0f} AND {column} < {high:.0f}"
+    if partition_column_type(config) in ('TIMESTAMP', 'DATETIME', 'DATE'):
+        return (f"CAST({column} AS DATE) >= CAST('{start.isoformat()}' AS DATE) "
+                f"AND CAST({column} AS DATE) < CAST('{end.isoformat()}' AS DATE)")
+    return f"SUBSTR({column}, 1, 10) >= '{start.isoformat()}' AND SUBSTR({column}, 1, 10) < '{end.isoformat()}'"
+
+def reload_raw_partition(loader, config, source_file, start, end):
+    """Replace one raw table's rows in [start, end) with that range's rows from the source file.
+
+    Only the days the file covers are replaced: generators write a trailing window, so
+    older days in the range keep their raw rows instead of being deleted.
+    """
+    epoch = is_epoch_column(config)
+
+    with open(source_file, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        columns = reader.fieldnames
+        days = [(row_day(row[config['partition_column']], epoch), row) for row in reader]
+    covered = [day for day, _ in days if day]
+
+    if not covered or max(covered) < start or min(covered) >= end:
+        print(f"   {start}: {source_file} has no rows for {start} .. {end}, keeping raw {config['table']}")
+        return True
+
+    # Clamp to the file's first and last day; days in between with no rows really are empty
+    start = max(start, min(covered))
+    end = min(end, max(covered) + timedelta(days=1))
+    rows = [row for day, row in days if day and start <= day < end]
+
+    fd, partition_file = tempfile.mkstemp(prefix=f"{config['table']}_{start}_", suffix='.csv')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+
+        # Delete + insert in one transaction, so readers never see the partition half loaded
+        return loader.load_csv_to_table(
+            config['dataset'], config['table'], partition_file,
+            write_disposition='WRITE_APPEND', replace_where=raw_predicate(config, start, end)
+        )
+    finally:
+        os.remove(partition_file)
+
+def run_dbt(select, exclude, start, end, target_path):
+    command = [
+        'dbt', 'build', '--select', select,
+        '--exclude-resource-type', 'test',
+        '--project-dir', DBT_PROJECT_DIR, '--profiles-dir', DBT_PROJECT_DIR,
+        '--target-path', target_path,
+        '--vars', json.dumps({'backfill_start': start.isoformat(), 'backfill_end': end.isoformat()})
+    ]
+    if exclude:
+        command += ['--exclude', exclude]
+
+    # Removed first, so a dbt run that dies before writing results isn't recorded as the last one
+    run_results = os.path.join(target_path, 'run_results.json')
+    if os.path.exists(run_results):
+        os.remove(run_results)
+
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stdout[-4000:])
+
+    if os.path.exists(run_results):
+        record_dbt_results(run_results)
+    return result.returncode == 0
+
+def backfill_partition(start, end, reload_raw=False, backend=None, source_files=None):
+    """Reload raw (optionally) and rebuild the partitioned models for [start, end)."""
+    with span('backfill', start.isoformat()) as partition_span:
+        partition_span.set(end=end.isoformat(), reload_raw=reload_raw)
+        ok = build_partition(start, end, reload_raw, backend, source_files)
+        if not ok:
+            partition_span.fail('partition failed')
+        return ok
+
+def build_partition(start, end, reload_raw, backend, source_files):
+    started = time.perf_counter()
+
+    if reload_raw:
+        loader = BigQueryLoader('datadigest-analytics-2025', backend)
+        for config in partition_tables():
+            source_file = (source_files or {}).get(config['table']) or latest_raw_file(config['source'])
+            if not source_file:
+                print(f"   {start}: no file for {config['source']}, keeping raw {config['table']}")
+                continue
+            if not reload_raw_partition(loader, config, source_file, start, end):
+                return False
+
+    # Separate target paths keep parallel dbt invocations from overwriting each other
+    target_path = os.path.join(TARGET_DIR, start.isoformat())
+    ok = run_dbt(f'tag:{PARTITION_TAG}', None, start, end, target_path)
+
+    print(f"   {start} .. {end}: {'ok' if ok else 'FAILED'} in {time.perf_counter() - started:.1f}s")
+    return ok
+
+def finalize(start, end):
+    """Rebuild the marts downstream of the partitioned models once, over the whole range."""
+    print(f"Rebuilding marts downstream of {start} .. {end}")
+    return run_dbt(f'tag:{PARTITION_TAG}+', f'tag:{PARTITION_TAG}', start, end, os.path.join(TARGET_DIR, 'final'))
+
+def single_writer(backend):
+    """DuckDB allows one writer per database file, for the loads and for dbt."""
+    backend = (backend or os.getenv('DATADIGEST_WAREHOUSE', 'bigquery')).lower()
+    return backend == 'duckdb' or os.getenv('DBT_TARGET', 'prod').startswith('local')
+
+def run_backfill(start, end, partition_days=1, concurrency=DEFAULT_CONCURRENCY, reload_raw=False, backend=None):
+    ranges = partitions(start, end, partition_days)
+
+    if single_writer(backend) and concurrency > 1:
+        print("DuckDB allows one writer at a time; running partitions one by one")
+        concurrency = 1
+
+    # Resolve the source files once so every partition reloads from the same snapshot
+    source_files = {config['table']: latest_raw_file(config['source']) for config in partition_tables()}
+
+    print(f"Backfilling {start} .. {end}: {len(ranges)} partition(s), {concurrency} at a time")
+    started = time.perf_counter()
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            pool.submit(backfill_partition, low, high, reload_raw, backend, source_files): (low, high)
+            for low, high in ranges
+        }
+        for future in as_completed(futures):
+            low, high = futures[future]
+            try:
+                ok = future.result()
+            except Exception as e:
+                print(f"   {low} .. {high}: ERROR {e}")
+                ok = False
+            if not ok:
+                failed.append((low, high))
+
+    # Retry failures once, one at a time (concurrent DML on one table can conflict)
+    for low, high in sorted(failed):
+        print(f"Retrying {low} .. {high}")
+        if backfill_partition(low, high, reload_raw, backend, source_files):
+            failed.remove((low, high))
+
+    if failed:
+        print(f"{len(failed)} partition(s) failed: {', '.join(str(low) for low, _ in sorted(failed))}")
+        return False
+
+    if not finalize(start, end):
+        return False
+
+    print(f"Backfill of {len(ranges)} partition(s) done in {time.perf_counter() - started:.1f}s")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild a date range partition by partition instead of a full refresh')
+    parser.add_argument('--start', type=date.fromisoformat, required=True, help='First day (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, required=True, help='Day after the last one (exclusive)')
+    parser.add_argument('--partition-days', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Partitions built at once')
+    parser.add_argument('--reload-raw', action='store_true',
+                        help="Also replace the raw tables' rows for each partition from the newest raw files")
+    parser.add_argument('--backend', choices=['bigquery', 'duckdb'], help='Defaults to DATADIGEST_WAREHOUSE')
+    parser.add_argument('--step', choices=['all', 'list', 'partition', 'finalize'], default='all',
+                        help='list: print the partitions as JSON; partition: build [start, end) only; '
+                             'finalize: rebuild the downstream marts only')
+    args = parser.parse_args()
+
+    if args.end <= args.start:
+        parser.error('--end must be after --start')
+
+    if args.step == 'list':
+        # Last line is the task's XCom value
+        print(json.dumps([[low.isoformat(), high.isoformat()] for low, high in partitions(args.start, args.end, args.partition_days)]))
+        return
+
+    if args.step == 'partition':
+        ok = backfill_partition(args.start, args.end, args.reload_raw, args.backend)
+    elif args.step == 'finalize':
+        ok = finalize(args.start, args.end)
+    else:
+        ok = run_backfill(args.start, args.end, args.partition_days, args.concurrency, args.reload_raw, args.backend)
+
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
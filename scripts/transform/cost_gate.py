@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ingestion'))
+from warehouse import create_warehouse
+
+DBT_PROJECT_DIR = 'datadigest_transform'
+TARGET_DIR = 'datadigest_transform/target'
+
+# Budget for models without meta: {cost: {max_gb_scanned: ...}}
+DEFAULT_MAX_GB = 1.0
+
+def compile_models(select=None):
+    """Compile the selected models; returns the manifest and the compiled model ids."""
+    command = ['dbt', 'compile', '--project-dir', DBT_PROJECT_DIR, '--profiles-dir', DBT_PROJECT_DIR]
+    if select:
+        command += ['--select', *select]
+
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stdout[-4000:])
+        raise RuntimeError(f"dbt compile failed with exit code {result.returncode}")
+
+    with open(os.path.join(TARGET_DIR, 'manifest.json'), 'r') as f:
+        manifest = json.load(f)
+    with open(os.path.join(TARGET_DIR, 'run_results.json'), 'r') as f:
+        run_results = json.load(f)
+
+    model_ids = [r['unique_id'] for r in run_results['results'] if r['unique_id'].startswith('model.')]
+    return manifest, model_ids
+
+def model_inputs(manifest, node):
+    """(dataset, table) of every model and source the node reads."""
+    inputs = []
+    for dep in node['depends_on']['nodes']:
+        parent = manifest['nodes'].get(dep) or manifest['sources'].get(dep)
+        # Ephemeral models are inlined into the compiled SQL; there is no relation to look up
+        if parent and parent['resource_type'] in ('model', 'source') \
+                and parent.get('config', {}).get('materialized') != 'ephemeral':
+            inputs.append((parent['schema'], parent.get('identifier') or parent.get('alias') or parent['name']))
+    return inputs
+
+def model_budget(node):
+    return float(node['config'].get('meta', {}).get('cost', {}).get('max_gb_scanned', DEFAULT_MAX_GB))
+
+def main():
+    parser = argparse.ArgumentParser(description='Estimate the bytes each selected dbt model will scan and enforce budgets')
+    parser.add_argument('--select', nargs='+', help='dbt selection, as for dbt run')
+    parser.add_argument('--backend', choices=['bigquery', 'duckdb'], help='Defaults to DATADIGEST_WAREHOUSE')
+    parser.add_argument('--max-total-gb', type=float, help='Budget for all selected models together')
+    parser.add_argument('--allow-over-budget', action='store_true',
+                        help='Report budget overruns without failing (or set DATADIGEST_COST_OVERRIDE=1)')
+    args = parser.parse_args()
+
+    allow_over_budget = args.allow_over_budget or os.getenv('DATADIGEST_COST_OVERRIDE') == '1'
+
+    manifest, model_ids = compile_models(args.select)
+    warehouse = create_warehouse('datadigest-analytics-2025', args.backend)
+
+    print(f"\n{'model':<34} {'estimated GB':>13} {'budget GB':>10}  status")
+
+    total_bytes = 0
+    over_budget = []
+    not_estimated = []
+
+    for model_id in model_ids:
+        node = manifest['nodes'][model_id]
+        budget = model_budget(node)
+        inputs = model_inputs(manifest, node)
+
+        # Inputs built earlier in this same run (e.g. a new staging model) can't be estimated yet
+        missing = [f'{dataset_id}.{table_id}' for dataset_id, table_id in inputs
+                   if warehouse.get_table_fields(dataset_id, table_id) is None]
+        if missing:
+            print(f"{node['name']:<34} {'-':>13} {budget:>10.2f}  SKIPPED: {', '.join(missing)} not built yet")
+            not_estimated.append(node['name'])
+            continue
+
+        try:
+            estimated = warehouse.estimate_query_bytes(node['compiled_code'], inputs)
+        except Exception as e:
+            print(f"{node['name']:<34} {'-':>13} {budget:>10.2f}  ERROR: {e}")
+            not_estimated.append(node['name'])
+            continue
+
+        total_bytes += estimated
+        status = 'ok'
+        if estimated > budget * 1e9:
+            status = 'OVER BUDGET'
+            over_budget.append(node['name'])
+
+        print(f"{node['name']:<34} {estimated / 1e9:>13.3f} {budget:>10.2f}  {status}")
+
+    print(f"\nTotal estimated: {total_bytes / 1e9:.3f} GB across {len(model_ids)} model(s)")
+    if args.max_total_gb is not None and total_bytes > args.max_total_gb * 1e9:
+        print(f"Total is over the {args.max_total_gb:.2f} GB budget")
+        over_budget.append('total')
+
+    # Not a budget failure: dbt itself reports broken SQL, and missing inputs are built by the run
+    if not_estimated:
+        print(f"Not estimated: {', '.join(not_estimated)} (see above; not counted against the budget)")
+
+    if not over_budget:
+        return
+
+    if allow_over_budget:
+        print(f"Over budget: {', '.join(over_budget)} (override set, continuing)")
+        return
+
+    print(f"Over budget: {', '.join(over_budget)}. Raise meta.cost.max_gb_scanned or rerun with --allow-over-budget")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from dbt.cli.main import dbtRunner
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.telemetry import record_dbt_results
+
+DBT_PROJECT_DIR = 'datadigest_transform'
+# Kept between runs so dbt can reuse partial_parse.msgpack and the previous manifest. Absolute,
+# because dbt resolves a relative --target-path against --project-dir, not the working directory.
+TARGET_DIR = os.path.abspath(os.getenv('DATADIGEST_DBT_TARGET_PATH', os.path.join(DBT_PROJECT_DIR, 'target')))
+DOCS_STATE = 'data/state/dbt_docs_manifest.sha256'
+
+# Node fields that change on every parse or compile without changing what the docs show
+VOLATILE_KEYS = {'created_at', 'compiled', 'compiled_code', 'compiled_path', 'extra_ctes', 'extra_ctes_injected'}
+
+def dbt_args(command, *extra):
+    return [*command.split(), '--project-dir', DBT_PROJECT_DIR, '--profiles-dir', DBT_PROJECT_DIR,
+            '--target-path', TARGET_DIR, *extra]
+
+def manifest_hash(manifest_file):
+    """Hash of the project as the docs site sees it, ignoring run metadata and compiled SQL."""
+    with open(manifest_file, 'r') as f:
+        manifest = json.load(f)
+
+    manifest.pop('metadata', None)
+    for section in ('nodes', 'sources', 'exposures', 'metrics', 'semantic_models'):
+        for node in manifest.get(section, {}).values():
+            for key in VOLATILE_KEYS:
+                node.pop(key, None)
+
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode('utf-8')).hexdigest()
+
+def docs_up_to_date(current_hash):
+    if not os.path.exists(os.path.join(TARGET_DIR, 'catalog.json')) or not os.path.exists(DOCS_STATE):
+        return False
+    with open(DOCS_STATE, 'r') as f:
+        return f.read().strip() == current_hash
+
+def save_docs_hash(current_hash):
+    os.makedirs(os.path.dirname(DOCS_STATE), exist_ok=True)
+    with open(DOCS_STATE, 'w') as f:
+        f.write(current_hash + '\n')
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse the dbt project once, build it, and regenerate docs only when the project changed')
+    parser.add_argument('--select', nargs='+', help='dbt selection, as for dbt build')
+    parser.add_argument('--full-refresh', action='store_true')
+    parser.add_argument('--with-tests', action='store_true',
+                        help='Also run dbt tests (normally left to scripts/transform/quality_checks.py)')
+    parser.add_argument('--skip-build', action='store_true', help='Only refresh the manifest and, if it changed, the docs')
+    parser.add_argument('--skip-docs', action='store_true')
+    parser.add_argument('--force-docs', action='store_true', help='Regenerate docs even if the manifest is unchanged')
+    args = parser.parse_args()
+
+    # One parse for the whole run; unchanged files are reused from the partial-parse cache in TARGET_DIR
+    result = dbtRunner().invoke(dbt_args('parse'))
+    if not result.success:
+        print(f"dbt parse failed: {result.exception}")
+        sys.exit(1)
+    runner = dbtRunner(manifest=result.result)
+
+    build_args = []
+    if args.select:
+        build_args += ['--select', *args.select]
+    if args.full_refresh:
+        build_args.append('--full-refresh')
+    if not args.with_tests:
+        build_args += ['--exclude-resource-type', 'test']
+
+    if not args.skip_build:
+        # Removed first, so results left by an earlier run are never recorded as this build's
+        run_results = os.path.join(TARGET_DIR, 'run_results.json')
+        if os.path.exists(run_results):
+            os.remove(run_results)
+        result = runner.invoke(dbt_args('build', *build_args))
+        # One span per model and test, failed ones included
+        if os.path.exists(run_results):
+            record_dbt_results(run_results)
+        if not result.success:
+            print(f"dbt build failed: {result.exception or 'see the log above'}")
+            sys.exit(1)
+
+    if args.skip_docs:
+        return
+
+    current_hash = manifest_hash(os.path.join(TARGET_DIR, 'manifest.json'))
+    if docs_up_to_date(current_hash) and not args.force_docs:
+        print(f"Manifest unchanged ({current_hash[:12]}), skipping dbt docs generate")
+        return
+
+    result = runner.invoke(dbt_args('docs generate'))
+    if not result.success:
+        print(f"dbt docs generate failed: {result.exception or 'see the log above'}")
+        sys.exit(1)
+
+    save_docs_hash(current_hash)
+    print(f"Docs regenerated for manifest {current_hash[:12]}")
+
+if __name__ == "__main__":
+    main()
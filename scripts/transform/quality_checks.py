@@ -0,0 +1,257 @@
+import argparse
+import fcntl
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ingestion'))
+from warehouse import create_warehouse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from datadigest.telemetry import span, record_dbt_results
+
+DBT_PROJECT_DIR = 'datadigest_transform'
+MANIFEST_FILE = 'datadigest_transform/target/manifest.json'
+ROW_COUNT_STATE = 'data/state/quality_row_counts.json'
+
+# Generic tests compiled into the per-model query; anything else still runs through dbt test
+SUPPORTED_TESTS = ('not_null', 'unique', 'accepted_values', 'accepted_range', 'relationships')
+
+# Largest relative drop in a model's row count between runs before it fails (overridable per model
+# with meta: {quality: {max_row_drop: ...}})
+DEFAULT_MAX_ROW_DROP = 0.5
+
+def sql_literal(value, quote=True):
+    if isinstance(value, str) and quote:
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+def load_checks(manifest):
+    """Group the manifest's generic tests by the model they test.
+
+    Returns ({model_id: [check, ...]}, [(test name, model_id) of tests that are not supported here]).
+    """
+    checks = {}
+    unsupported = []
+
+    for node in manifest['nodes'].values():
+        if node['resource_type'] != 'test':
+            continue
+
+        metadata = node.get('test_metadata') or {}
+        model_id = node.get('attached_node')
+        if metadata.get('name') not in SUPPORTED_TESTS or metadata.get('namespace') or not model_id:
+            unsupported.append((node['name'], model_id))
+            continue
+
+        kwargs = metadata.get('kwargs', {})
+        check = {
+            'name': node['name'],
+            'test': metadata['name'],
+            'column': kwargs.get('column_name') or node.get('column_name'),
+            'kwargs': kwargs,
+            'severity': str(node['config'].get('severity', 'error')).lower()
+        }
+
+        if check['test'] == 'relationships':
+            parents = [dep for dep in node['depends_on']['nodes'] if dep != model_id]
+            if len(parents) != 1:
+                unsupported.append((node['name'], model_id))
+                continue
+            parent = manifest['nodes'].get(parents[0]) or manifest['sources'][parents[0]]
+            check['parent'] = parent['relation_name']
+
+        checks.setdefault(model_id, []).append(check)
+
+    return checks, unsupported
+
+def failure_expression(check, alias):
+    """SQL aggregate counting the rows that fail a check, plus any join it needs."""
+    column = f"m.{check['column']}"
+    kwargs = check['kwargs']
+
+    if check['test'] == 'not_null':
+        return f"SUM(CASE WHEN {column} IS NULL THEN 1 ELSE 0 END)", None
+
+    if check['test'] == 'unique':
+        # Rows beyond the first for each duplicated value
+        return f"COUNT({column}) - COUNT(DISTINCT {column})", None
+
+    if check['test'] == 'accepted_values':
+        values = ', '.join(sql_literal(value, kwargs.get('quote', True)) for value in kwargs['values'])
+        return f"SUM(CASE WHEN {column} IS NOT NULL AND {column} NOT IN ({values}) THEN 1 ELSE 0 END)", None
+
+    if check['test'] == 'accepted_range':
+        inclusive = kwargs.get('inclusive', True)
+        bounds = []
+        if kwargs.get('min_value') is not None:
+            bounds.append(f"{column} {'<' if inclusive else '<='} {kwargs['min_value']}")
+        if kwargs.get('max_value') is not None:
+            bounds.append(f"{column} {'>' if inclusive else '>='} {kwargs['max_value']}")
+        return f"SUM(CASE WHEN {column} IS NOT NULL AND ({' OR '.join(bounds)}) THEN 1 ELSE 0 END)", None
+
+    # relationships: one DISTINCT scan of the parent keeps the join from fanning out
+    join = (
+        f"LEFT JOIN (SELECT DISTINCT {kwargs['field']} AS parent_key FROM {check['parent']}) {alias} "
+        f"ON {column} = {alias}.parent_key"
+    )
+    return f"SUM(CASE WHEN {column} IS NOT NULL AND {alias}.parent_key IS NULL THEN 1 ELSE 0 END)", join
+
+def build_query(relation, checks):
+    """One aggregate query over the model returning its row count and a failure count per check."""
+    selects = ['COUNT(*) AS row_count']
+    joins = []
+
+    for index, check in enumerate(checks):
+        expression, join = failure_expression(check, f'parent_{index}')
+        selects.append(f'{expression} AS check_{index}')
+        if join:
+            joins.append(join)
+
+    return f"SELECT\n    " + ",\n    ".join(selects) + f"\nFROM {relation} m\n" + "\n".join(joins)
+
+def load_row_counts(state_file):
+    if os.path.exists(state_file):
+        with open(state_file, 'r') as f:
+            return json.load(f)
+    return {}
+
+def save_row_counts(state_file, row_counts):
+    """Merge this run's counts into the state file.
+
+    Per-model Airflow tasks check models in parallel, so the file is re-read under
+    a lock and only the models checked here are updated.
+    """
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    with open(state_file + '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        merged = load_row_counts(state_file)
+        merged.update(row_counts)
+
+        with open(state_file + '.tmp', 'w') as f:
+            json.dump(merged, f, indent=2)
+        os.replace(state_file + '.tmp', state_file)
+
+def row_count_result(model, row_count, previous, max_drop):
+    failures = 0
+    message = f"{row_count:,} rows"
+
+    if previous:
+        change = (row_count - previous) / previous
+        message += f" ({change:+.0%} vs {previous:,})"
+        if change < -max_drop:
+            failures = 1
+
+    return {'name': f'row_count_delta_{model}', 'severity': 'error', 'failures': failures, 'message': message}
+
+def run_model_checks(warehouse, node, checks, previous_count, max_drop):
+    """Run every check of one model in a single scan; returns per-check results."""
+    values = warehouse.query(build_query(node['relation_name'], checks))[0]
+    row_count = values[0]
+
+    results = [
+        {'name': check['name'], 'severity': check['severity'], 'failures': values[index + 1] or 0, 'message': ''}
+        for index, check in enumerate(checks)
+    ]
+    results.append(row_count_result(node['name'], row_count, previous_count, max_drop))
+
+    return results, row_count
+
+def run_dbt_tests(names, target_path=None):
+    """Fall back to dbt for tests this engine does not compile."""
+    # Absolute, because dbt resolves a relative --target-path against --project-dir
+    target_path = os.path.abspath(target_path or os.path.join(DBT_PROJECT_DIR, 'target'))
+    command = ['dbt', 'test', '--project-dir', DBT_PROJECT_DIR, '--profiles-dir', DBT_PROJECT_DIR,
+               '--target-path', target_path, '--select', *names]
+
+    # The run task's results live in the same target path; don't record them again as this test's
+    run_results = os.path.join(target_path, 'run_results.json')
+    if os.path.exists(run_results):
+        os.remove(run_results)
+    ok = subprocess.run(command).returncode == 0
+
+    if os.path.exists(run_results):
+        record_dbt_results(run_results)
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the dbt column tests as one aggregated query per model')
+    parser.add_argument('--manifest', default=MANIFEST_FILE, help='Manifest from the last dbt run/compile')
+    parser.add_argument('--backend', choices=['bigquery', 'duckdb'], help='Defaults to DATADIGEST_WAREHOUSE')
+    parser.add_argument('--select', nargs='+', help='Only check these models')
+    parser.add_argument('--state-file', default=ROW_COUNT_STATE, help='Row counts from the previous run')
+    parser.add_argument('--skip-dbt-fallback', action='store_true', help='Do not run unsupported tests with dbt test')
+    parser.add_argument('--dbt-target-path', help='Target path for the dbt test fallback (one per concurrent task)')
+    args = parser.parse_args()
+
+    with open(args.manifest, 'r') as f:
+        manifest = json.load(f)
+
+    warehouse = create_warehouse('datadigest-analytics-2025', args.backend)
+    checks_by_model, unsupported = load_checks(manifest)
+    previous_counts = load_row_counts(args.state_file)
+    row_counts = {}
+
+    errors = 0
+    warnings = 0
+
+    for model_id, node in sorted(manifest['nodes'].items()):
+        if node['resource_type'] != 'model' or node['config'].get('materialized') == 'ephemeral':
+            continue
+        if args.select and node['name'] not in args.select:
+            continue
+
+        max_drop = node['config'].get('meta', {}).get('quality', {}).get('max_row_drop', DEFAULT_MAX_ROW_DROP)
+        checks = checks_by_model.get(model_id, [])
+
+        print(f"\n{node['name']} ({len(checks)} checks, 1 query)")
+        with span('test', node['name']) as test_span:
+            try:
+                results, row_count = run_model_checks(warehouse, node, checks, previous_counts.get(node['name']), max_drop)
+            except Exception as e:
+                test_span.fail(e)
+                print(f"   ERROR  could not query {node['relation_name']}: {e}")
+                errors += 1
+                continue
+
+            failed = [result['name'] for result in results if result['failures'] and result['severity'] != 'warn']
+            test_span.set(rows=row_count, checks=len(results), failed_checks=len(failed))
+            if failed:
+                test_span.fail(', '.join(failed))
+
+        # Keep the last good count as the reference so a drop keeps failing until it is explained
+        if not results[-1]['failures']:
+            row_counts[node['name']] = row_count
+
+        for result in results:
+            if not result['failures']:
+                status = 'PASS'
+            elif result['severity'] == 'warn':
+                status = 'WARN'
+                warnings += 1
+            else:
+                status = 'FAIL'
+                errors += 1
+
+            detail = result['message'] or f"{result['failures']} failing rows"
+            print(f"   {status:<5}  {result['name']}: {detail}")
+
+    save_row_counts(args.state_file, row_counts)
+
+    if args.select:
+        unsupported = [(name, model_id) for name, model_id in unsupported
+                       if model_id and manifest['nodes'][model_id]['name'] in args.select]
+    unsupported = [name for name, _ in unsupported]
+
+    if unsupported and not args.skip_dbt_fallback:
+        print(f"\nRunning {len(unsupported)} test(s) not compiled here through dbt test")
+        if not run_dbt_tests(unsupported, args.dbt_target_path):
+            errors += 1
+
+    print(f"\n{errors} failure(s), {warnings} warning(s)")
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
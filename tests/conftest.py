@@ -0,0 +1,8 @@
+import os
+import sys
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+
+# Scripts import the datadigest package and their siblings the way `python scripts/<dir>/<script>.py` would
+for path in ('', 'ingestion', 'transform', 'data_exploration'):
+    sys.path.insert(0, os.path.normpath(os.path.join(SCRIPTS_DIR, path)))
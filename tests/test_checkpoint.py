@@ -0,0 +1,59 @@
+import json
+import os
+import time
+
+from datadigest.checkpoint import CollectorCheckpoint
+
+def test_resumes_with_the_same_inputs(tmp_path):
+    checkpoint = CollectorCheckpoint('medium', ['pub-a', 'pub-b'], checkpoint_dir=str(tmp_path))
+    checkpoint.complete('pub-a', [{'id': 1}])
+    checkpoint.advance('pub-b', [{'id': 2}], 'page-2')
+    checkpoint.meta['requests'] = 3
+    checkpoint.save()
+
+    resumed = CollectorCheckpoint('medium', ['pub-a', 'pub-b'], checkpoint_dir=str(tmp_path))
+    assert resumed.is_done('pub-a')
+    assert not resumed.is_done('pub-b')
+    assert resumed.cursor('pub-b') == 'page-2'
+    assert resumed.results == [{'id': 1}, {'id': 2}]
+    assert resumed.meta == {'requests': 3}
+
+def test_complete_clears_the_cursor(tmp_path):
+    checkpoint = CollectorCheckpoint('medium', ['pub-a'], checkpoint_dir=str(tmp_path))
+    checkpoint.advance('pub-a', [], 'page-2')
+    checkpoint.complete('pub-a')
+
+    assert CollectorCheckpoint('medium', ['pub-a'], checkpoint_dir=str(tmp_path)).cursor('pub-a') is None
+
+def test_changed_inputs_start_over(tmp_path):
+    CollectorCheckpoint('medium', ['pub-a'], checkpoint_dir=str(tmp_path)).complete('pub-a', [{'id': 1}])
+
+    fresh = CollectorCheckpoint('medium', ['pub-a', 'pub-c'], checkpoint_dir=str(tmp_path))
+    assert not fresh.is_done('pub-a')
+    assert fresh.results == []
+
+def test_fingerprint_ignores_key_order(tmp_path):
+    CollectorCheckpoint('reddit', {'a': 1, 'b': 2}, checkpoint_dir=str(tmp_path)).complete('a')
+    assert CollectorCheckpoint('reddit', {'b': 2, 'a': 1}, checkpoint_dir=str(tmp_path)).is_done('a')
+
+def test_expired_checkpoint_starts_over(tmp_path):
+    checkpoint = CollectorCheckpoint('medium', ['pub-a'], checkpoint_dir=str(tmp_path), max_age_hours=24)
+    checkpoint.complete('pub-a', [{'id': 1}])
+
+    with open(checkpoint.path, 'r') as f:
+        state = json.load(f)
+    state['saved_at'] = time.time() - 25 * 3600
+    with open(checkpoint.path, 'w') as f:
+        json.dump(state, f)
+
+    assert not CollectorCheckpoint('medium', ['pub-a'], checkpoint_dir=str(tmp_path), max_age_hours=24).is_done('pub-a')
+    assert CollectorCheckpoint('medium', ['pub-a'], checkpoint_dir=str(tmp_path), max_age_hours=48).is_done('pub-a')
+
+def test_clear_removes_the_file(tmp_path):
+    checkpoint = CollectorCheckpoint('medium', ['pub-a'], checkpoint_dir=str(tmp_path))
+    checkpoint.complete('pub-a')
+    checkpoint.clear()
+
+    assert not os.path.exists(checkpoint.path)
+    assert not CollectorCheckpoint('medium', ['pub-a'], checkpoint_dir=str(tmp_path)).is_done('pub-a')
+    checkpoint.clear()  # nothing to remove
@@ -0,0 +1,47 @@
+import pytest
+
+from datadigest.hll import HyperLogLog
+
+def sketch_of(values, precision=10):
+    sketch = HyperLogLog(precision)
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+def test_empty_sketch_estimates_zero():
+    assert HyperLogLog().estimate() == 0
+
+def test_duplicates_do_not_change_the_sketch():
+    once = sketch_of(range(500))
+    twice = sketch_of(list(range(500)) * 2)
+    assert once.registers == twice.registers
+
+@pytest.mark.parametrize('count', [100, 1000, 20000])
+def test_estimate_is_within_error_bounds(count):
+    # ~3% standard error at precision 10; allow four standard errors
+    estimate = sketch_of(f'visitor_{i}' for i in range(count)).estimate()
+    assert abs(estimate - count) <= 0.13 * count
+
+def test_merge_equals_sketch_of_the_union():
+    monday = sketch_of(f'visitor_{i}' for i in range(0, 3000))
+    tuesday = sketch_of(f'visitor_{i}' for i in range(2000, 5000))
+    union = sketch_of(f'visitor_{i}' for i in range(0, 5000))
+
+    merged = HyperLogLog().merge(monday).merge(tuesday)
+    assert merged.registers == union.registers
+    assert merged.estimate() == union.estimate()
+
+def test_merge_is_order_independent():
+    a, b = sketch_of(range(0, 800)), sketch_of(range(400, 1600))
+    assert HyperLogLog().merge(a).merge(b).registers == HyperLogLog().merge(b).merge(a).registers
+
+def test_merge_rejects_other_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+
+def test_rows_round_trip():
+    sketch = sketch_of(range(300))
+    rows = sketch.to_rows(article_key='a1', activity_date='2025-09-01')
+
+    assert all(row['article_key'] == 'a1' for row in rows)
+    assert HyperLogLog.from_rows(rows).registers == sketch.registers
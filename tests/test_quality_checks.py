@@ -0,0 +1,89 @@
+import sqlite3
+
+import pytest
+
+from quality_checks import build_query, load_checks, row_count_result, run_model_checks
+
+MODEL = 'model.datadigest_transform.stg_posts'
+AUTHORS = 'model.datadigest_transform.dim_authors'
+
+def dbt_test_node(name, test, column, kwargs=None, namespace=None, depends_on=(MODEL,), severity='error'):
+    return {
+        'resource_type': 'test',
+        'name': name,
+        'attached_node': MODEL,
+        'column_name': column,
+        'test_metadata': {'name': test, 'namespace': namespace, 'kwargs': {'column_name': column, **(kwargs or {})}},
+        'depends_on': {'nodes': list(depends_on)},
+        'config': {'severity': severity},
+    }
+
+@pytest.fixture
+def manifest():
+    nodes = {
+        MODEL: {'resource_type': 'model', 'name': 'stg_posts', 'relation_name': 'posts'},
+        AUTHORS: {'resource_type': 'model', 'name': 'dim_authors', 'relation_name': 'authors'},
+        'test.1': dbt_test_node('not_null_post_id', 'not_null', 'post_id'),
+        'test.2': dbt_test_node('unique_post_id', 'unique', 'post_id'),
+        'test.3': dbt_test_node('accepted_values_status', 'accepted_values', 'status', {'values': ['draft', "editor's pick"]}),
+        'test.4': dbt_test_node('accepted_range_claps', 'accepted_range', 'claps', {'min_value': 0, 'max_value': 100},
+                                severity='warn'),
+        'test.5': dbt_test_node('relationships_author', 'relationships', 'author_id', {'to': "ref('dim_authors')", 'field': 'author_id'},
+                                depends_on=(AUTHORS, MODEL)),
+        'test.6': dbt_test_node('expression_is_true_claps', 'expression_is_true', 'claps', namespace='dbt_utils'),
+    }
+    return {'nodes': nodes, 'sources': {}}
+
+def test_load_checks_groups_supported_tests(manifest):
+    checks, unsupported = load_checks(manifest)
+
+    assert [check['test'] for check in checks[MODEL]] == \
+        ['not_null', 'unique', 'accepted_values', 'accepted_range', 'relationships']
+    assert checks[MODEL][3]['severity'] == 'warn'
+    assert checks[MODEL][4]['parent'] == 'authors'
+    assert unsupported == [('expression_is_true_claps', MODEL)]
+
+def test_query_counts_failures_per_check(manifest):
+    conn = sqlite3.connect(':memory:')
+    conn.executescript("""
+        CREATE TABLE authors (author_id INTEGER);
+        INSERT INTO authors VALUES (1), (1), (2);
+        CREATE TABLE posts (post_id INTEGER, status TEXT, claps INTEGER, author_id INTEGER);
+        INSERT INTO posts VALUES
+            (1, 'draft', 10, 1),
+            (2, 'editor''s pick', 100, 2),
+            (2, 'published', 0, 3),
+            (NULL, NULL, 101, NULL),
+            (3, 'draft', -1, 1);
+    """)
+    checks, _ = load_checks(manifest)
+
+    row = conn.execute(build_query('posts', checks[MODEL])).fetchone()
+    # rows, not_null, unique, accepted_values, accepted_range, relationships
+    assert row == (5, 1, 1, 1, 2, 1)
+
+class FakeWarehouse:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def query(self, sql):
+        return self.conn.execute(sql).fetchall()
+
+def test_run_model_checks_adds_row_count_check(manifest):
+    conn = sqlite3.connect(':memory:')
+    conn.executescript("CREATE TABLE posts (post_id INTEGER); INSERT INTO posts VALUES (1), (1);")
+    checks = [check for check in load_checks(manifest)[0][MODEL] if check['test'] == 'unique']
+
+    results, row_count = run_model_checks(FakeWarehouse(conn), manifest['nodes'][MODEL], checks, 10, 0.5)
+    assert row_count == 2
+    assert [(result['name'], result['failures']) for result in results] == \
+        [('unique_post_id', 1), ('row_count_delta_stg_posts', 1)]
+
+@pytest.mark.parametrize('row_count, previous, failures', [
+    (100, None, 0),   # first run
+    (60, 100, 0),     # -40% is within the default 50%
+    (40, 100, 1),     # -60%
+    (300, 100, 0),    # growth never fails
+])
+def test_row_count_drop(row_count, previous, failures):
+    assert row_count_result('stg_posts', row_count, previous, 0.5)['failures'] == failures
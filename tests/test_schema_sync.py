@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+import load_to_bigquery
+from load_to_bigquery import BigQueryLoader, diff_schema
+from warehouse import METADATA_FIELDS
+
+def field(name, field_type='STRING', mode='NULLABLE'):
+    return {'name': name, 'type': field_type, 'mode': mode}
+
+def test_identical_schemas_have_no_changes():
+    fields = [field('id', mode='REQUIRED'), field('claps', 'INTEGER')]
+    assert diff_schema(fields, fields) == {'added': [], 'relaxed': [], 'incompatible': []}
+
+def test_new_nullable_column_is_added():
+    diff = diff_schema([field('id')], [field('id'), field('topic')])
+    assert diff['added'] == [field('topic')]
+    assert diff['incompatible'] == []
+
+def test_required_to_nullable_is_relaxed():
+    diff = diff_schema([field('id', mode='REQUIRED')], [field('id')])
+    assert diff['relaxed'] == [field('id')]
+    assert diff['incompatible'] == []
+
+@pytest.mark.parametrize('live, desired', [
+    ([field('id'), field('gone')], [field('id')]),                           # column removed
+    ([field('id')], [field('id'), field('topic', mode='REQUIRED')]),        # new REQUIRED column
+    ([field('claps', 'STRING')], [field('claps', 'INTEGER')]),               # type change
+    ([field('id')], [field('id', mode='REQUIRED')]),                         # tightened mode
+])
+def test_changes_that_need_a_rebuild_are_incompatible(live, desired):
+    diff = diff_schema(live, desired)
+    assert len(diff['incompatible']) == 1
+    assert diff['added'] == [] and diff['relaxed'] == []
+
+class FakeWarehouse:
+    def __init__(self, live_fields):
+        self.live_fields = live_fields
+        self.calls = []
+
+    def get_table_fields(self, dataset_id, table_id):
+        return self.live_fields
+
+    def create_table(self, dataset_id, table_id, fields):
+        self.calls.append(('create', [f['name'] for f in fields]))
+
+    def drop_table(self, dataset_id, table_id):
+        self.calls.append(('drop',))
+
+    def evolve_table(self, dataset_id, table_id, added, relaxed):
+        self.calls.append(('evolve', [f['name'] for f in added], [f['name'] for f in relaxed]))
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / 'schema.json'
+    path.write_text(json.dumps([{'name': 'id', 'type': 'STRING'}, {'name': 'topic', 'type': 'STRING'}]))
+    return str(path)
+
+def sync(monkeypatch, schema_file, live_fields):
+    warehouse = FakeWarehouse(live_fields)
+    monkeypatch.setattr(load_to_bigquery, 'create_warehouse', lambda project_id, backend=None: warehouse)
+    status = BigQueryLoader('test-project').sync_table_schema('raw', 'articles', schema_file)
+    return status, warehouse.calls
+
+def test_sync_creates_missing_table_with_metadata(monkeypatch, schema_file):
+    status, calls = sync(monkeypatch, schema_file, None)
+    assert status == 'created'
+    assert calls == [('create', ['id', 'topic'] + [f['name'] for f in METADATA_FIELDS])]
+
+def test_sync_leaves_current_table_alone(monkeypatch, schema_file):
+    status, calls = sync(monkeypatch, schema_file, [field('id'), field('topic')] + METADATA_FIELDS)
+    assert (status, calls) == ('unchanged', [])
+
+def test_sync_evolves_in_place(monkeypatch, schema_file):
+    status, calls = sync(monkeypatch, schema_file, [field('id', mode='REQUIRED')] + METADATA_FIELDS)
+    assert status == 'evolved'
+    assert calls == [('evolve', ['topic'], ['id'])]
+
+def test_sync_rebuilds_incompatible_table(monkeypatch, schema_file):
+    status, calls = sync(monkeypatch, schema_file, [field('id', 'INTEGER'), field('topic')] + METADATA_FIELDS)
+    assert status == 'rebuilt'
+    assert [call[0] for call in calls] == ['drop', 'create']
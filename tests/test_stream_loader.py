@@ -0,0 +1,119 @@
+import csv
+import json
+import os
+
+import pytest
+
+import stream_loader
+from stream_loader import MicroBatchLoader
+
+class FakeWarehouseLoader:
+    """Raw tables and the batch ledger in memory; loads can be made to fail."""
+
+    def __init__(self, failures=0):
+        self.rows = []
+        self.ledger = set()
+        self.attempts = []
+        self.failures = failures
+
+    def create_table_from_schema(self, dataset, table, schema_file):
+        return True
+
+    def batch_committed(self, dataset, batch_id):
+        return batch_id in self.ledger
+
+    def load_csv_to_table(self, dataset, table, csv_file, write_disposition='WRITE_TRUNCATE', batch_id=None):
+        self.attempts.append(batch_id)
+        if self.failures:
+            self.failures -= 1
+            return False
+        with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+            self.rows.extend(csv.DictReader(f))
+        self.ledger.add(batch_id)
+        return True
+
+class FakeCatalog:
+    def __init__(self, path):
+        self.path = path
+
+    def registered_since(self, last_id, sources, file_format='csv'):
+        return [(1, self.path, 'events')] if last_id < 1 else []
+
+    def sync(self):
+        return 0
+
+class FakeEvents:
+    def publish(self, tables, force=False):
+        pass
+
+@pytest.fixture
+def raw_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open('schema.json', 'w') as f:
+        json.dump([{'name': 'id', 'type': 'STRING'}, {'name': 'name', 'type': 'STRING'}], f)
+    with open('events.csv', 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'name'])
+        writer.writerows([[str(i), f'event {i}'] for i in range(5)])
+    return 'events.csv'
+
+def make_loader(warehouse, raw_file):
+    config = {'dataset': 'raw', 'table': 'events', 'schema': 'schema.json', 'source': 'events'}
+    stream = MicroBatchLoader(warehouse, [config], batch_rows=2, flush_seconds=3600,
+                              state_file='state/stream_loader.json', catalog=FakeCatalog(raw_file), events=FakeEvents())
+    stream.prepare_tables()
+    return stream
+
+def loaded_ids(warehouse):
+    return sorted(int(row['id']) for row in warehouse.rows)
+
+def test_replay_after_crash_is_idempotent(raw_file, monkeypatch):
+    warehouse = FakeWarehouseLoader()
+    stream = make_loader(warehouse, raw_file)
+    stream.discover()
+
+    # The batch lands, then the process dies before the committed offsets are saved
+    def crash(table, sources):
+        raise RuntimeError('killed')
+    monkeypatch.setattr(stream, 'finish_batch', crash)
+    with pytest.raises(RuntimeError):
+        stream.flush_due()
+    assert loaded_ids(warehouse) == [0, 1]
+
+    restarted = make_loader(warehouse, raw_file)
+    restarted.recover()
+    assert loaded_ids(warehouse) == [0, 1]
+    assert restarted.state['pending'] == {}
+    assert restarted.state['files'][raw_file]['committed'] == 2
+
+    restarted.discover()
+    restarted.flush_due(force=True)
+    assert loaded_ids(warehouse) == [0, 1, 2, 3, 4]
+
+def test_failed_batch_is_retried_with_the_same_batch_id(raw_file):
+    warehouse = FakeWarehouseLoader(failures=1)
+    stream = make_loader(warehouse, raw_file)
+    stream.discover()
+
+    # A failed full batch must not fall through to a time-based flush of everything buffered
+    stream.flush_due(force=True)
+    assert warehouse.attempts == [warehouse.attempts[0]]
+    failed_batch = stream.state['pending']['events']['batch_id']
+    assert warehouse.attempts[0] == failed_batch
+
+    stream.flush_due(force=True)
+    assert warehouse.attempts[1] == failed_batch
+    assert loaded_ids(warehouse) == [0, 1, 2, 3, 4]
+    assert stream.state['pending'] == {}
+
+def test_spooled_file_is_removed_once_committed(raw_file):
+    warehouse = FakeWarehouseLoader()
+    stream = make_loader(warehouse, raw_file)
+    stream.columns['events'] = ['id', 'name']
+    path = stream.submit('events', [{'id': '9', 'name': 'spooled'}])
+    assert path.startswith(stream_loader.SPOOL_DIR)
+
+    stream.discover()
+    stream.flush_due(force=True)
+    assert 9 in loaded_ids(warehouse)
+    assert not os.path.exists(path)
@@ -0,0 +1,107 @@
+import json
+import sys
+import types
+
+import pytest
+
+from datadigest.topic_scheduler import TopicYieldScheduler
+
+@pytest.fixture
+def state_file(tmp_path):
+    return str(tmp_path / 'topic_yield.json')
+
+def write_stats(state_file, stats, run_id=None):
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump({'run_id': run_id, 'topics': stats}, f)
+
+def test_untried_topics_go_first_in_list_order(state_file):
+    write_stats(state_file, {'python': {'requests': 4, 'relevant': 30, 'tweets': 40}})
+    scheduler = TopicYieldScheduler(10, state_file=state_file)
+
+    assert scheduler.choose(['python', 'sql', 'ai']) == 'sql'
+    assert scheduler.choose([]) is None
+
+def test_ucb_prefers_higher_yield_with_equal_requests(state_file):
+    write_stats(state_file, {
+        'python': {'requests': 5, 'relevant': 40, 'tweets': 50},
+        'sql': {'requests': 5, 'relevant': 5, 'tweets': 50},
+    })
+    scheduler = TopicYieldScheduler(10, state_file=state_file)
+
+    assert scheduler.choose(['sql', 'python']) == 'python'
+
+def test_ucb_explores_a_rarely_tried_topic(state_file):
+    # Slightly lower yield, but tried once against fifty times: the exploration bonus wins
+    write_stats(state_file, {
+        'python': {'requests': 50, 'relevant': 300, 'tweets': 500},
+        'sql': {'requests': 1, 'relevant': 5, 'tweets': 10},
+    })
+    scheduler = TopicYieldScheduler(10, state_file=state_file)
+
+    assert scheduler.choose(['python', 'sql']) == 'sql'
+
+def test_record_counts_relevant_tweets_and_persists(state_file):
+    scheduler = TopicYieldScheduler(10, state_file=state_file)
+    assert scheduler.record('python', [0.0, 0.5, 1.0]) == 2
+
+    stats = TopicYieldScheduler(10, state_file=state_file, decay=1.0).stats
+    assert stats['python']['requests'] == 1
+    assert stats['python']['relevant'] == 2
+    assert stats['python']['tweets'] == 3
+
+def test_decay_applies_once_per_run_id(state_file):
+    write_stats(state_file, {'python': {'requests': 10, 'relevant': 20, 'tweets': 100}}, run_id='run-1')
+
+    first = TopicYieldScheduler(10, run_id='run-2', state_file=state_file, decay=0.5)
+    assert first.stats['python']['requests'] == 5
+
+    # Resumed run or a second scheduler in the same run: no further decay
+    again = TopicYieldScheduler(10, run_id='run-2', state_file=state_file, decay=0.5)
+    assert again.stats['python']['requests'] == 5
+    assert again.stats['python']['relevant'] == 10
+
+    later = TopicYieldScheduler(10, run_id='run-3', state_file=state_file, decay=0.5)
+    assert later.stats['python']['requests'] == 2.5
+
+def test_reads_unstamped_state_files(state_file):
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump({'python': {'requests': 10, 'relevant': 20, 'tweets': 100}}, f)
+
+    scheduler = TopicYieldScheduler(10, run_id='run-1', state_file=state_file, decay=0.5)
+    assert scheduler.stats['python']['requests'] == 5
+
+class RateLimited:
+    status_code = 429
+
+def test_run_spent_on_rate_limits_does_not_block_the_next(tmp_path, monkeypatch):
+    """A run whose budget goes to 429s clears its checkpoint, so the next run searches again."""
+    import improved_twitter_collector as collector_module
+    from datadigest.article_features import ArticleFeatureStore
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('TWITTER_BEARER_TOKEN', 'token')
+    monkeypatch.setenv('DATADIGEST_CHECKPOINT_DIR', str(tmp_path / 'checkpoints'))
+    monkeypatch.setenv('DATADIGEST_TOPIC_YIELD_FILE', str(tmp_path / 'topic_yield.json'))
+    monkeypatch.setenv('DATADIGEST_RAW_CATALOG', str(tmp_path / 'catalog.sqlite'))
+    monkeypatch.setenv('DATADIGEST_TELEMETRY_FILE', str(tmp_path / 'spans.jsonl'))
+
+    articles_file = tmp_path / 'articles.json'
+    articles_file.write_text(json.dumps([
+        {'url': 'https://medium.com/a', 'title': 'Python for data science', 'claps': 10, 'word_count': 900}
+    ]))
+    store = ArticleFeatureStore()
+    monkeypatch.setattr(collector_module, 'latest_raw_file', lambda *args: str(articles_file))
+    monkeypatch.setattr(collector_module, 'feature_store', lambda: store)
+    monkeypatch.setattr(collector_module.time, 'sleep', lambda seconds: None)
+
+    calls = []
+    requests = types.ModuleType('requests')
+    requests.get = lambda *args, **kwargs: calls.append(kwargs['params']['query']) or RateLimited()
+    monkeypatch.setitem(sys.modules, 'requests', requests)
+
+    collector_module.main()
+    assert len(calls) == 10
+    assert not (tmp_path / 'checkpoints' / 'twitter_topics.json').exists()
+
+    collector_module.main()
+    assert len(calls) == 20